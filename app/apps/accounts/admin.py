@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 
 from apps.accounts import models as accounts_models
+from apps.accounts.services import org_requests
 
 
 @admin.register(accounts_models.User)
@@ -67,9 +68,29 @@ class OrganizationRequestAdmin(admin.ModelAdmin):
     list_filter = ("status", "created_at")
     search_fields = ("org_name", "full_name", "phone", "email")
     readonly_fields = ("created_at", "updated_at")
+    actions = ("approve_selected",)
     fieldsets = (
         ("Контактное лицо", {"fields": ("full_name", "phone", "email")}),
         ("Организация", {"fields": ("org_name",)}),
         ("Статус", {"fields": ("status", "admin_comment", "created_user")}),
         ("Даты", {"fields": ("created_at", "updated_at")}),
     )
+
+    def has_approve_permission(self, request):
+        # Одобрение создаёт пользователей и организации — нужны и их права
+        return self.has_change_permission(request) and all(
+            request.user.has_perm(f"accounts.add_{model._meta.model_name}")
+            for model in (accounts_models.User, accounts_models.Organization)
+        )
+
+    @admin.action(
+        description="Одобрить выбранные заявки (создать организации)",
+        permissions=["approve"],
+    )
+    def approve_selected(self, request, queryset):
+        result = org_requests.approve_requests(list(queryset.values_list("id", flat=True)))
+        self.message_user(
+            request,
+            f"Одобрено: {result['approved']}, пропущено: {result['skipped']}. "
+            "Пароли будут отправлены в WhatsApp.",
+        )
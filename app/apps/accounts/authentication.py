@@ -0,0 +1,30 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.accounts import tokens
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication без чтения пользователя из БД: role, org_id и is_active
+    берутся из claims токена (их кладёт tokens.issue_tokens). Отзыв токенов —
+    одна проверка в кэше (tokens.revoke_user_tokens).
+
+    Без общего кэша (tokens.stateless_enabled) и для токенов, выданных до
+    появления claims, пользователь читается из БД, как раньше.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is not None and tokens.is_revoked(user_id, validated_token):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        if tokens.CLAIM_ROLE not in validated_token or not tokens.stateless_enabled():
+            return super().get_user(validated_token)
+
+        if not validated_token.get(tokens.CLAIM_IS_ACTIVE):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return tokens.user_from_claims(validated_token)
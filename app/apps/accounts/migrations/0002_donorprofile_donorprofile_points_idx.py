@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 14:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donorprofile',
+            index=models.Index(fields=['-impact_points', 'id'], name='donorprofile_points_idx'),
+        ),
+    ]
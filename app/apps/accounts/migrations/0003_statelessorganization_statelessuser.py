@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-19 14:24
+
+import apps.accounts.models
+import django.contrib.auth.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_donorprofile_donorprofile_points_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatelessOrganization',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=(apps.accounts.models.LoadDeferredTogetherMixin, 'accounts.organization'),
+        ),
+        migrations.CreateModel(
+            name='StatelessUser',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=(apps.accounts.models.LoadDeferredTogetherMixin, 'accounts.user'),
+            managers=[
+                ('objects', django.contrib.auth.models.UserManager()),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 14:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_statelessorganization_statelessuser'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='organizationrequest',
+            index=models.Index(fields=['phone', '-created_at'], name='orgrequest_phone_created_idx'),
+        ),
+    ]
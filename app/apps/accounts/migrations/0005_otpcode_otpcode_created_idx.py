@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 14:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_organizationrequest_orgrequest_phone_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='otpcode',
+            index=models.Index(fields=['created_at', 'id'], name='otpcode_created_idx'),
+        ),
+    ]
@@ -1,10 +1,41 @@
-from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
+from django.db import models, transaction
 from django.utils import timezone
 from datetime import timedelta
 from django.db.models import Q
 
 
+# Поля пользователя, от которых зависят claims токена (или смена доступа)
+TOKEN_FIELDS = ("role", "is_active", "password")
+
+
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        update() не вызывает сигналы (signals.py), поэтому при смене полей
+        доступа токены пользователей отзываются здесь, после коммита.
+        Активация доступ только даёт — её не отзываем, как и в сигналах.
+        """
+        fields = set(kwargs) & set(TOKEN_FIELDS)
+        if kwargs.get("is_active") is True:
+            fields.discard("is_active")
+        if not fields:
+            return super().update(**kwargs)
+
+        user_ids = list(self.values_list("pk", flat=True))
+        rows = super().update(**kwargs)
+        if user_ids:
+            # tokens импортирует модели
+            from apps.accounts import tokens
+
+            transaction.on_commit(lambda: tokens.revoke_user_tokens(*user_ids))
+        return rows
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    pass
+
+
 class User(AbstractUser):
     class Roles(models.TextChoices):
         DONOR = "donor", "Донор"
@@ -21,6 +52,8 @@ class User(AbstractUser):
 
     full_name = models.CharField(max_length=255, blank=True, default="")
 
+    objects = UserManager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -37,6 +70,26 @@ class User(AbstractUser):
         return self.role == self.Roles.ORG
 
 
+class LoadDeferredTogetherMixin:
+    """
+    Обращение к любому отложенному полю загружает сразу все отложенные поля
+    одним запросом (по умолчанию Django делает запрос на каждое поле).
+    """
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = deferred
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
+
+class StatelessUser(LoadDeferredTogetherMixin, User):
+    """Пользователь, собранный из claims JWT (см. apps.accounts.authentication)."""
+
+    class Meta:
+        proxy = True
+
+
 class DonorProfile(models.Model):
     user = models.OneToOneField(
         User,
@@ -48,6 +101,14 @@ class DonorProfile(models.Model):
     rank = models.CharField(max_length=50, blank=True, default="")
     impact_points = models.PositiveIntegerField(default=0)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["-impact_points", "id"],
+                name="donorprofile_points_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"Профиль донора: {self.user.username}"
 
@@ -89,6 +150,13 @@ class Organization(models.Model):
         return self.name
 
 
+class StatelessOrganization(LoadDeferredTogetherMixin, Organization):
+    """Организация пользователя из claim org_id (см. apps.accounts.authentication)."""
+
+    class Meta:
+        proxy = True
+
+
 class OTPCode(models.Model):
     class Purpose(models.TextChoices):
         REGISTER = "register", "Register"
@@ -100,6 +168,12 @@ class OTPCode(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Очистка старых кодов (apps.base.services.retention)
+            models.Index(fields=["created_at", "id"], name="otpcode_created_idx"),
+        ]
+
     def is_expired(self, ttl_minutes: int = 5) -> bool:
         return timezone.now() - self.created_at > timedelta(minutes=ttl_minutes)
 
@@ -148,6 +222,10 @@ class OrganizationRequest(models.Model):
         verbose_name = "Заявка организации"
         verbose_name_plural = "Заявки организаций"
         ordering = ["-created_at"]
+        indexes = [
+            # Опрос статуса по телефону: последняя заявка
+            models.Index(fields=["phone", "-created_at"], name="orgrequest_phone_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.org_name} ({self.full_name}) - {self.get_status_display()}"
@@ -0,0 +1,13 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    target_class = "apps.accounts.authentication.StatelessJWTAuthentication"
+
+
+def register_extensions(endpoints, **kwargs):
+    """
+    PREPROCESSING_HOOK: расширения drf_spectacular регистрируются при импорте
+    этого модуля, т.е. только при генерации схемы, а не при старте воркера.
+    """
+    return endpoints
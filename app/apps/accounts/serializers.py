@@ -1,10 +1,15 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema_field
 
 from apps.accounts import models as accounts_models
+from apps.accounts import tokens
+from apps.base.serializers import UploadKeyField
 
 
 User = get_user_model()
@@ -29,6 +34,34 @@ class OrgLoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
 
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Обновление access-токена с проверкой пользователя в БД: claims role/org_id/
+    is_active пересчитываются, удалённые, неактивные и отозванные — отказ.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh.get(api_settings.USER_ID_CLAIM)
+
+        user = User.objects.filter(id=user_id).first()
+        if user is None or not user.is_active:
+            raise AuthenticationFailed("User not found or inactive", code="user_inactive")
+        if tokens.is_revoked(user_id, refresh):
+            raise AuthenticationFailed("Token has been revoked", code="token_revoked")
+
+        tokens.set_user_claims(refresh, user, tokens.organization_id_for(user))
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            tokens.reset_issued_at(refresh)
+            data["refresh"] = str(refresh)
+
+        return data
+
+
 class DonorProfileSerializer(serializers.ModelSerializer):
     user = serializers.SerializerMethodField()
 
@@ -69,6 +102,12 @@ class DonorProfileEditSerializer(serializers.ModelSerializer):
         required=False,
         allow_null=True,
     )
+    avatar_key = UploadKeyField(
+        purpose="avatar",
+        source="donor_profile.avatar",
+        write_only=True,
+        required=False,
+    )
     notifications_enabled = serializers.BooleanField(
         source="donor_profile.notifications_enabled",
         required=False,
@@ -92,6 +131,7 @@ class DonorProfileEditSerializer(serializers.ModelSerializer):
             "phone",
             "role",
             "avatar",
+            "avatar_key",
             "notifications_enabled",
             "rank",
             "impact_points",
@@ -132,9 +172,16 @@ class DonorProfileEditSerializer(serializers.ModelSerializer):
 
 
 class OrganizationProfileEditSerializer(serializers.ModelSerializer):
+    logo_key = UploadKeyField(
+        purpose="logo",
+        source="logo",
+        write_only=True,
+        required=False,
+    )
+
     class Meta:
         model = accounts_models.Organization
-        fields = ("name", "description", "city", "website", "logo", "email", "phone")
+        fields = ("name", "description", "city", "website", "logo", "logo_key", "email", "phone")
 
 
 class OrganizationRequestCreateSerializer(serializers.ModelSerializer):
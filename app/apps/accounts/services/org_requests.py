@@ -0,0 +1,159 @@
+import logging
+import secrets
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from apps.accounts.models import Organization, OrganizationRequest, User
+from apps.accounts.services.whatsapp import WhatsAppService
+from apps.base.services.tasks import enqueue_many
+
+logger = logging.getLogger(__name__)
+
+_STATUS_KEY = "org_request:status:{}"
+_TASK_NAME = "apps.accounts.services.org_requests.send_credentials"
+
+# Маркер «заявки нет»: опрос по чужому номеру тоже не должен ходить в БД
+_MISSING = "missing"
+
+
+def _status_key(phone):
+    return _STATUS_KEY.format(phone.strip())
+
+
+def invalidate_status(*phones):
+    cache.delete_many([_status_key(phone) for phone in phones])
+
+
+def get_status(phone, serialize):
+    """
+    Последняя заявка по телефону для MyOrganizationRequestView: из кэша
+    или одним запросом по индексу (phone, -created_at). Возвращает данные
+    serialize(заявка) или None, если заявки нет.
+    """
+    key = _status_key(phone)
+    data = cache.get(key)
+    if data is None:
+        org_request = (
+            OrganizationRequest.objects.filter(phone=phone.strip()).order_by("-created_at").first()
+        )
+        data = serialize(org_request) if org_request is not None else _MISSING
+        cache.set(key, data, timeout=settings.ORG_REQUEST_STATUS_TTL)
+    return None if data == _MISSING else data
+
+
+def approve_requests(request_ids, admin_comment="") -> dict:
+    """
+    Одобряет заявки одной транзакцией: пользователи и организации создаются
+    через bulk_create, заявкам проставляется created_user. Пароль не
+    хешируется в запросе — его задаёт и отправляет в WhatsApp фоновая задача
+    send_credentials (по одной на заявку).
+
+    Пропускаются заявки не в статусе pending, повторы телефона в выборке и
+    телефоны, на которые уже зарегистрирован пользователь.
+    """
+    with transaction.atomic():
+        pending = list(
+            OrganizationRequest.objects.select_for_update()
+            .filter(id__in=request_ids, status=OrganizationRequest.Status.PENDING)
+            .order_by("-created_at")
+        )
+
+        by_phone = {}
+        for org_request in pending:
+            # Из нескольких заявок с одного номера одобряется последняя
+            by_phone.setdefault(org_request.phone.strip(), org_request)
+
+        taken = set(User.objects.filter(phone__in=by_phone).values_list("phone", flat=True))
+        taken_usernames = set(
+            User.objects.filter(
+                username__in=[f"org_{phone}" for phone in by_phone]
+            ).values_list("username", flat=True)
+        )
+        approved = [
+            org_request
+            for phone, org_request in by_phone.items()
+            if phone not in taken and f"org_{phone}" not in taken_usernames
+        ]
+        if not approved:
+            return {"approved": 0, "skipped": len(request_ids)}
+
+        users = []
+        for org_request in approved:
+            phone = org_request.phone.strip()
+            user = User(
+                username=f"org_{phone}",
+                phone=phone,
+                email=org_request.email,
+                full_name=org_request.full_name,
+                role=User.Roles.ORG,
+                is_active=True,
+            )
+            user.set_unusable_password()
+            users.append(user)
+        User.objects.bulk_create(users, batch_size=500)
+
+        Organization.objects.bulk_create(
+            [
+                Organization(
+                    user=user,
+                    name=org_request.org_name,
+                    email=org_request.email,
+                    phone=user.phone,
+                )
+                for user, org_request in zip(users, approved)
+            ],
+            batch_size=500,
+        )
+
+        # bulk_update не заполняет auto_now — updated_at проставляется явно
+        now = timezone.now()
+        for user, org_request in zip(users, approved):
+            org_request.status = OrganizationRequest.Status.APPROVED
+            org_request.created_user = user
+            org_request.updated_at = now
+            if admin_comment:
+                org_request.admin_comment = admin_comment
+        OrganizationRequest.objects.bulk_update(
+            approved,
+            ["status", "created_user", "updated_at", "admin_comment"],
+            batch_size=500,
+        )
+
+        enqueue_many(_TASK_NAME, [{"request_id": org_request.id} for org_request in approved])
+
+        phones = [org_request.phone for org_request in approved]
+        transaction.on_commit(lambda: invalidate_status(*phones))
+
+    logger.info("Organization requests approved: %s", len(approved))
+    return {"approved": len(approved), "skipped": len(request_ids) - len(approved)}
+
+
+def send_credentials(request_id):
+    """
+    Фоновая задача: временный пароль для одобренной заявки и сообщение в
+    WhatsApp. Пароль сохраняется только вместе с успешной отправкой — при
+    ошибке задача повторится, а пользователь останется без пароля.
+    """
+    org_request = (
+        OrganizationRequest.objects.select_related("created_user").filter(id=request_id).first()
+    )
+    user = org_request.created_user if org_request else None
+    if user is None or user.has_usable_password():
+        # Пользователь удалён или пароль уже отправлен
+        return
+
+    password = secrets.token_urlsafe(9)
+    message = settings.ORG_CREDENTIALS_MESSAGE_TEMPLATE.format(
+        org_name=org_request.org_name,
+        phone=user.phone,
+        password=password,
+    )
+
+    with transaction.atomic():
+        user.set_password(password)
+        user.save(update_fields=["password"])
+        if not WhatsAppService.send_message(user.phone, message):
+            raise RuntimeError(f"WhatsApp message to organization request #{request_id} failed")
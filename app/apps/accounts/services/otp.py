@@ -3,6 +3,7 @@ from django.conf import settings
 
 from apps.accounts.models import OTPCode
 from apps.accounts.services.whatsapp import WhatsAppService
+from apps.base.utils import metrics
 
 
 # Тестовый номер для App Store review
@@ -34,8 +35,10 @@ def send_otp(phone: str, purpose: str) -> bool:
     message = template.format(code=code)
 
     # Пока используем только WhatsApp через Green API
+    sent = False
     provider = getattr(settings, "WHATSAPP_PROVIDER", "green_api")
     if provider == "green_api":
-        return WhatsAppService.send_message(phone, message)
+        sent = WhatsAppService.send_message(phone, message)
 
-    return False
+    metrics.record_otp(purpose, sent)
+    return sent
@@ -1,4 +1,3 @@
-import requests
 from django.conf import settings
 
 
@@ -30,6 +29,9 @@ class WhatsAppService:
             "message": message,
         }
 
+        # requests грузится только при реальной отправке
+        import requests
+
         try:
             response = requests.post(url, json=payload, timeout=10)
             return response.status_code == 200
@@ -0,0 +1,75 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.accounts import tokens
+from apps.accounts.models import (
+    TOKEN_FIELDS,
+    Organization,
+    OrganizationRequest,
+    StatelessOrganization,
+    StatelessUser,
+    User,
+)
+from apps.accounts.services import org_requests
+
+def _revoke_on_commit(user_id):
+    transaction.on_commit(lambda: tokens.revoke_user_tokens(user_id))
+
+
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=StatelessUser)
+def remember_token_fields(sender, instance, update_fields=None, **kwargs):
+    instance._token_fields_changed = False
+    if instance._state.adding or instance.pk is None:
+        return
+
+    fields = [f for f in TOKEN_FIELDS if f in instance.__dict__]
+    if update_fields is not None:
+        fields = [f for f in fields if f in update_fields]
+    if not fields:
+        return
+
+    old = User.objects.filter(pk=instance.pk).values(*fields).first()
+    if old is None:
+        return
+    changed = {f for f in fields if old[f] != getattr(instance, f)}
+    # Активация (верификация OTP) доступ только даёт: токены с is_active=False
+    # и так не принимаются, а отзыв задел бы токены, выданные сразу после неё
+    if changed == {"is_active"} and instance.is_active:
+        return
+    instance._token_fields_changed = bool(changed)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=StatelessUser)
+def revoke_tokens_on_change(sender, instance, created, **kwargs):
+    if getattr(instance, "_token_fields_changed", False):
+        _revoke_on_commit(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=StatelessUser)
+def revoke_tokens_on_delete(sender, instance, **kwargs):
+    _revoke_on_commit(instance.pk)
+
+
+# claim org_id: у пользователя появилась или пропала организация
+@receiver(post_save, sender=Organization)
+@receiver(post_save, sender=StatelessOrganization)
+def revoke_tokens_on_organization_created(sender, instance, created, **kwargs):
+    if created:
+        _revoke_on_commit(instance.user_id)
+
+
+@receiver(post_delete, sender=Organization)
+@receiver(post_delete, sender=StatelessOrganization)
+def revoke_tokens_on_organization_deleted(sender, instance, **kwargs):
+    _revoke_on_commit(instance.user_id)
+
+
+@receiver(post_save, sender=OrganizationRequest)
+@receiver(post_delete, sender=OrganizationRequest)
+def invalidate_org_request_status(sender, instance, **kwargs):
+    phone = instance.phone
+    transaction.on_commit(lambda: org_requests.invalidate_status(phone))
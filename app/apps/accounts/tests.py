@@ -0,0 +1,203 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts import serializers, tokens
+from apps.accounts.models import OTPCode, Organization, OrganizationRequest, User
+from apps.accounts.services import org_requests
+from apps.base.services import tasks
+
+
+class TokenRevocationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.donor = User.objects.create(username="donor", role="donor", phone="+996700000001")
+
+    def _get(self, access, url="/api/notifications/"):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        return client.get(url)
+
+    def _refresh(self, refresh):
+        return APIClient().post("/api/auth/refresh/", {"refresh": refresh}, format="json")
+
+    def test_verify_then_refresh(self):
+        # Регрессия: активация отзывала токены, выданные в ту же секунду
+        self.donor.is_active = False
+        self.donor.save()
+        OTPCode.objects.create(phone=self.donor.phone, code="482931", purpose=OTPCode.Purpose.REGISTER)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = APIClient().post(
+                "/api/auth/donor/verify/",
+                {"phone": self.donor.phone, "code": "482931"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+
+        self.assertEqual(self._get(response.json()["access"]).status_code, 200)
+        refreshed = self._refresh(response.json()["refresh"])
+        self.assertEqual(refreshed.status_code, 200, refreshed.content)
+        self.assertEqual(self._get(refreshed.json()["access"]).status_code, 200)
+
+    def test_tokens_issued_right_after_revocation_are_valid(self):
+        # Обычно всё в пределах одной секунды iat — различает только iat_ms
+        old = tokens.issue_tokens(self.donor)
+        time.sleep(0.005)
+        tokens.revoke_user_tokens(self.donor.id)
+        new = tokens.issue_tokens(self.donor)
+
+        self.assertEqual(self._get(old["access"]).status_code, 401)
+        self.assertEqual(self._refresh(old["refresh"]).status_code, 401)
+        self.assertEqual(self._get(new["access"]).status_code, 200)
+
+    def test_access_changes_revoke_tokens(self):
+        issued = tokens.issue_tokens(self.donor)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.donor.full_name = "New name"
+            self.donor.save()
+        self.assertEqual(self._get(issued["access"]).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.donor.is_active = False
+            self.donor.save()
+        self.assertEqual(self._get(issued["access"]).status_code, 401)
+        self.assertEqual(self._refresh(issued["refresh"]).status_code, 401)
+
+    def test_without_shared_cache_user_is_checked_in_db(self):
+        self.assertFalse(tokens.stateless_enabled())
+        issued = tokens.issue_tokens(self.donor)
+
+        # Отзыв не дошёл до кэша (другой процесс, вытеснение) — решает БД
+        User.objects.filter(pk=self.donor.pk).update(is_active=False)
+        self.assertEqual(self._get(issued["access"]).status_code, 401)
+
+    def test_queryset_update_revokes_tokens(self):
+        issued = tokens.issue_tokens(self.donor)
+
+        with mock.patch.object(tokens, "stateless_enabled", return_value=True):
+            with self.captureOnCommitCallbacks(execute=True):
+                User.objects.filter(pk=self.donor.pk).update(full_name="Renamed", is_active=True)
+            self.assertEqual(self._get(issued["access"]).status_code, 200)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                User.objects.filter(pk=self.donor.pk).update(role="org")
+            self.assertEqual(self._get(issued["access"]).status_code, 401)
+
+    def test_rotated_refresh_token_gets_new_issue_time(self):
+        issued = tokens.issue_tokens(self.donor)
+        time.sleep(0.005)
+
+        with mock.patch.object(serializers.api_settings, "ROTATE_REFRESH_TOKENS", True):
+            response = self._refresh(issued["refresh"])
+        self.assertEqual(response.status_code, 200, response.content)
+
+        old, rotated = RefreshToken(issued["refresh"]), RefreshToken(response.json()["refresh"])
+        self.assertGreater(tokens.issued_at_ms(rotated), tokens.issued_at_ms(old))
+        self.assertGreaterEqual(tokens.issued_at_ms(rotated), rotated["iat"] * 1000)
+
+
+class OrganizationRequestApprovalTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client_api = APIClient()
+        for i in range(3):
+            response = self.client_api.post(
+                "/api/auth/org/request/",
+                {"full_name": f"F{i}", "phone": f"+99655500{i}", "email": f"o{i}@example.com", "org_name": f"Org {i}"},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 201, response.content)
+
+    def _status(self, phone):
+        return self.client_api.get("/api/auth/org/request/status/", {"phone": phone})
+
+    def _approve(self, request_ids):
+        admin = User.objects.create(username="admin", is_staff=True, is_superuser=True, phone="+996999")
+        self.client.force_login(admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                "/admin/accounts/organizationrequest/",
+                {"action": "approve_selected", "_selected_action": list(request_ids)},
+            )
+
+    def test_status_is_cached_including_missing(self):
+        self.assertEqual(self._status("+996555001").json()["status"], "pending")
+        with self.assertNumQueries(0):
+            self.assertEqual(self._status("+996555001").json()["status"], "pending")
+
+        self.assertEqual(self._status("+1").status_code, 404)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._status("+1").status_code, 404)
+
+    @override_settings(ORG_CREDENTIALS_MESSAGE_TEMPLATE="{phone} {password}")
+    def test_bulk_approval_creates_organizations_and_sends_credentials(self):
+        old = OrganizationRequest.objects.create(full_name="old", phone="+996555000", email="x@example.com", org_name="Old")
+        OrganizationRequest.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=1))
+        User.objects.create(username="taken", phone="+996555002")
+        self.assertEqual(self._status("+996555001").json()["status"], "pending")
+
+        response = self._approve(OrganizationRequest.objects.values_list("id", flat=True))
+        self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(
+            sorted(Organization.objects.values_list("name", flat=True)),
+            ["Org 0", "Org 1"],
+        )
+        approved = OrganizationRequest.objects.get(org_name="Org 1")
+        self.assertEqual(approved.status, OrganizationRequest.Status.APPROVED)
+        self.assertEqual(approved.created_user.organization.name, "Org 1")
+        self.assertFalse(approved.created_user.has_usable_password())
+        self.assertEqual(OrganizationRequest.objects.get(org_name="Old").status, "pending")
+        self.assertEqual(OrganizationRequest.objects.get(org_name="Org 2").status, "pending")
+        self.assertEqual(self._status("+996555001").json()["status"], "approved")
+
+        sent = []
+        with mock.patch(
+            "apps.accounts.services.whatsapp.WhatsAppService.send_message",
+            side_effect=lambda phone, message: sent.append(message) or True,
+        ):
+            tasks.run_pending(10)
+        self.assertEqual(len(sent), 2)
+
+        phone, password = sent[0].split()
+        login = self.client_api.post("/api/auth/org/login/", {"phone": phone, "password": password}, format="json")
+        self.assertEqual(login.status_code, 200, login.content)
+
+    def test_view_only_staff_cannot_approve(self):
+        staff = User.objects.create(username="viewer", is_staff=True, phone="+996998")
+        staff.user_permissions.add(Permission.objects.get(codename="view_organizationrequest"))
+        model_admin = admin.site._registry[OrganizationRequest]
+
+        def actions():
+            request = RequestFactory().get("/admin/accounts/organizationrequest/")
+            request.user = User.objects.get(pk=staff.pk)  # без кэша прав
+            return model_admin.get_actions(request)
+
+        self.assertNotIn("approve_selected", actions())
+
+        staff.user_permissions.add(
+            *Permission.objects.filter(
+                codename__in=["change_organizationrequest", "add_user", "add_organization"]
+            )
+        )
+        self.assertIn("approve_selected", actions())
+
+    def test_failed_send_keeps_password_unusable(self):
+        self._approve(OrganizationRequest.objects.filter(org_name="Org 0").values_list("id", flat=True))
+        org_request = OrganizationRequest.objects.get(org_name="Org 0")
+
+        with mock.patch("apps.accounts.services.whatsapp.WhatsAppService.send_message", return_value=False):
+            with self.assertRaises(RuntimeError):
+                org_requests.send_credentials(org_request.id)
+        org_request.created_user.refresh_from_db()
+        self.assertFalse(org_request.created_user.has_usable_password())
@@ -0,0 +1,123 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.redis import RedisCache
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.models import Organization, StatelessOrganization, StatelessUser, User
+
+# Claims, по которым StatelessJWTAuthentication собирает пользователя без запроса в БД
+CLAIM_ROLE = "role"
+CLAIM_ORG_ID = "org_id"
+CLAIM_IS_ACTIVE = "is_active"
+# Время выдачи в миллисекундах: iat — целые секунды, и токен, выданный в ту же
+# секунду, что и отзыв (верификация → выдача), от отозванного не отличить
+CLAIM_ISSUED_AT_MS = "iat_ms"
+
+# Отметка отзыва живёт в кэше, поэтому кэш должен быть общим для всех
+# процессов (REDIS_URL): с LocMem отзыв виден только процессу, где он случился
+_REVOKED_BEFORE_KEY = "auth:revoked_before_ms:{}"
+
+
+def stateless_enabled() -> bool:
+    """
+    Claims вместо БД — только при общем кэше (Redis): с кэшем в памяти
+    процесса отзыв не виден другим воркерам, и токены проверяются по БД.
+    """
+    return settings.JWT_STATELESS and isinstance(caches["default"], RedisCache)
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def set_user_claims(token, user, org_id=None):
+    token[CLAIM_ROLE] = user.role
+    token[CLAIM_ORG_ID] = org_id
+    token[CLAIM_IS_ACTIVE] = user.is_active
+    token[CLAIM_ISSUED_AT_MS] = _now_ms()
+
+
+def reset_issued_at(token):
+    """set_iat() вместе с iat_ms: иначе новый токен сравнивался бы по старому времени."""
+    token.set_iat()
+    token[CLAIM_ISSUED_AT_MS] = _now_ms()
+
+
+def organization_id_for(user):
+    if user.role != User.Roles.ORG:
+        return None
+    return Organization.objects.filter(user_id=user.pk).values_list("id", flat=True).first()
+
+
+def issue_tokens(user) -> dict:
+    refresh = RefreshToken.for_user(user)
+    # access_token копирует claims из refresh
+    set_user_claims(refresh, user, organization_id_for(user))
+    return {
+        "refresh": str(refresh),
+        "access": str(refresh.access_token),
+    }
+
+
+def revoke_user_tokens(*user_ids):
+    """
+    Все токены пользователей, выданные до этого момента, перестают приниматься.
+    Ключ живёт столько же, сколько refresh-токен: позже старых токенов уже нет.
+    Redis не должен вытеснять ключи (maxmemory-policy noeviction): вытесненная
+    отметка молча возвращает доступ.
+    """
+    now = _now_ms()
+    cache.set_many(
+        {_REVOKED_BEFORE_KEY.format(user_id): now for user_id in user_ids},
+        timeout=int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()),
+    )
+
+
+def issued_at_ms(token):
+    """Время выдачи токена в мс; у токенов без iat_ms — начало секунды iat."""
+    if CLAIM_ISSUED_AT_MS in token:
+        return token[CLAIM_ISSUED_AT_MS]
+    iat = token.get("iat")
+    return None if iat is None else iat * 1000
+
+
+def is_revoked(user_id, token) -> bool:
+    revoked_before = cache.get(_REVOKED_BEFORE_KEY.format(user_id))
+    if revoked_before is None:
+        return False
+    issued_at = issued_at_ms(token)
+    return issued_at is None or issued_at < revoked_before
+
+
+def _from_values(model, values: dict):
+    # from_db ждёт значения в порядке полей модели
+    field_names = [f.attname for f in model._meta.concrete_fields if f.attname in values]
+    return model.from_db(None, field_names, [values[name] for name in field_names])
+
+
+def user_from_claims(token):
+    """
+    Пользователь по claims токена без запроса в БД. Остальные поля (phone,
+    full_name, ...) отложены и загрузятся одним запросом при первом обращении.
+    request.user.organization для организаций тоже отдаётся без запроса.
+    """
+    user_id = token[api_settings.USER_ID_CLAIM]
+    user = _from_values(StatelessUser, {
+        "id": user_id,
+        "role": token[CLAIM_ROLE],
+        "is_active": token[CLAIM_IS_ACTIVE],
+    })
+
+    org_id = token.get(CLAIM_ORG_ID)
+    if org_id is not None:
+        organization = _from_values(StatelessOrganization, {"id": org_id, "user_id": user_id})
+        organization._state.fields_cache["user"] = user
+        user._state.fields_cache["organization"] = organization
+    elif user.role == User.Roles.ORG:
+        # Как у обычного пользователя без организации: обращение бросит DoesNotExist
+        user._state.fields_cache["organization"] = None
+
+    return user
@@ -7,16 +7,18 @@ from rest_framework.mixins import CreateModelMixin, RetrieveModelMixin
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
-from rest_framework.parsers import FormParser, MultiPartParser
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 
 from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
 
 from apps.accounts import models as accounts_models
 from apps.accounts import serializers as accounts_serializers
+from apps.accounts import tokens
 from apps.accounts.permissions import IsDonor, IsOrganization
+from apps.accounts.services import org_requests
 from apps.accounts.services.otp import send_otp, TEST_PHONE_NUMBER, TEST_OTP_CODE
 from apps.accounts.throttles import ScopedRateThrottleWithPeriods
+from apps.base.services import account_deletion
 
 
 User = get_user_model()
@@ -30,14 +32,6 @@ def _generate_otp_code() -> str:
     return f"{random.randint(0, 999999):06d}"
 
 
-def _issue_tokens(user: User) -> dict:
-    refresh = RefreshToken.for_user(user)
-    return {
-        "refresh": str(refresh),
-        "access": str(refresh.access_token),
-    }
-
-
 class DonorRegisterView(GenericAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = accounts_serializers.DonorRegisterSerializer
@@ -147,7 +141,7 @@ class DonorVerifyView(GenericAPIView):
         user.save(update_fields=["is_active"])
         otp.delete()
 
-        return Response(_issue_tokens(user))
+        return Response(tokens.issue_tokens(user))
 
 
 class DonorLoginView(GenericAPIView):
@@ -237,7 +231,7 @@ class DonorLoginVerifyView(GenericAPIView):
             return Response({"detail": "User is not active."}, status=400)
 
         otp.delete()
-        return Response(_issue_tokens(user))
+        return Response(tokens.issue_tokens(user))
 
 
 class DonorProfileView(RetrieveModelMixin, GenericAPIView):
@@ -291,14 +285,14 @@ class OrgLoginView(GenericAPIView):
         if not user.is_active:
             return Response({"detail": "User is not active."}, status=400)
 
-        return Response(_issue_tokens(user))
+        return Response(tokens.issue_tokens(user))
 
 
 class DonorProfileEditView(GenericAPIView):
     permission_classes = [IsAuthenticated, IsDonor]
 
     serializer_class = accounts_serializers.DonorProfileEditSerializer
-    parser_classes = [MultiPartParser, FormParser]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def _ensure_profile(self):
         accounts_models.DonorProfile.objects.get_or_create(user=self.request.user)
@@ -344,18 +338,21 @@ class AccountDeleteView(GenericAPIView):
     @extend_schema(
         tags=["Profile"],
         summary="Delete account",
-        description="Удаляет аккаунт текущего пользователя. Требуется JWT access token.",
+        description=(
+            "Удаляет аккаунт текущего пользователя. Требуется JWT access token. "
+            "Аккаунт деактивируется сразу (токены больше не принимаются), данные "
+            "удаляются в фоне."
+        ),
     )
     def delete(self, request, *args, **kwargs):
-        user = request.user
-        user.delete()
+        account_deletion.request_account_deletion(request.user.id)
         return Response({"status": "deleted"}, status=204)
 
 
 class OrganizationProfileEditView(GenericAPIView):
     permission_classes = [IsAuthenticated, IsOrganization]
     serializer_class = accounts_serializers.OrganizationProfileEditSerializer
-    parser_classes = [MultiPartParser, FormParser]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def get_organization(self):
         try:
@@ -436,14 +433,11 @@ class MyOrganizationRequestView(GenericAPIView):
         if not phone:
             return Response({"detail": "Phone parameter is required."}, status=400)
 
-        phone = _normalize_phone(phone)
-
-        try:
-            org_request = accounts_models.OrganizationRequest.objects.filter(
-                phone=phone
-            ).latest("created_at")
-        except accounts_models.OrganizationRequest.DoesNotExist:
+        data = org_requests.get_status(
+            _normalize_phone(phone),
+            lambda org_request: self.get_serializer(org_request).data,
+        )
+        if data is None:
             return Response({"detail": "Request not found."}, status=404)
 
-        serializer = self.get_serializer(org_request)
-        return Response(serializer.data)
+        return Response(data)
@@ -1,4 +1,8 @@
 from django.contrib import admin
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
 
 from apps.base import models as base_models
 
@@ -119,3 +123,147 @@ class ContentReportAdmin(admin.ModelAdmin):
     def reason_preview(self, obj):
         return obj.reason[:100] + "..." if len(obj.reason) > 100 else obj.reason
     reason_preview.short_description = "Причина"
+
+
+@admin.register(base_models.ModerationQueueItem)
+class ModerationQueueItemAdmin(admin.ModelAdmin):
+    """Очередь модерации: счётчики из ModerationQueueItem, без агрегации по жалобам."""
+
+    list_display = (
+        "content_type",
+        "content_id",
+        "status",
+        "reports_count",
+        "pending_count",
+        "last_reported_at",
+        "reports_link",
+    )
+    list_filter = ("status", "content_type")
+    ordering = ("status", "-reports_count")
+    readonly_fields = (
+        "content_type",
+        "content_id",
+        "reports_count",
+        "pending_count",
+        "first_reported_at",
+        "last_reported_at",
+        "notified_at",
+    )
+    actions = ("mark_resolved",)
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.display(description="Жалобы")
+    def reports_link(self, obj):
+        url = reverse("admin:base_contentreport_changelist")
+        return format_html(
+            '<a href="{}?content_type={}&content_id={}">Открыть</a>',
+            url,
+            obj.content_type,
+            obj.content_id,
+        )
+
+    @admin.action(description="Отметить как рассмотренные")
+    def mark_resolved(self, request, queryset):
+        updated = queryset.update(status=base_models.ModerationQueueItem.Status.RESOLVED)
+        self.message_user(request, f"Рассмотрено: {updated}")
+
+
+@admin.register(base_models.OrganizationDonorImpact)
+class OrganizationDonorImpactAdmin(admin.ModelAdmin):
+    list_display = ("id", "organization", "donor", "impact_points", "updated_at")
+    search_fields = ("organization__name", "donor__phone", "donor__full_name")
+    ordering = ("organization", "-impact_points")
+
+
+@admin.register(base_models.OrganizationFollower)
+class OrganizationFollowerAdmin(admin.ModelAdmin):
+    list_display = ("id", "organization", "user", "created_at")
+    search_fields = ("organization__name", "user__phone", "user__full_name")
+    raw_id_fields = ("organization", "user")
+
+
+@admin.register(base_models.BackgroundTask)
+class BackgroundTaskAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "status", "attempts", "run_after", "updated_at")
+    list_filter = ("status", "name")
+    search_fields = ("name",)
+    readonly_fields = ("created_at", "updated_at")
+
+
+@admin.register(base_models.DonationExport)
+class DonationExportAdmin(admin.ModelAdmin):
+    list_display = ("id", "organization", "file_format", "status", "rows_count", "created_at", "finished_at")
+    list_filter = ("status", "file_format")
+    search_fields = ("organization__name",)
+    readonly_fields = ("created_at", "finished_at")
+
+
+@admin.register(base_models.RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """Профили запросов: свёрнутые стеки скачиваются для flamegraph.pl / speedscope."""
+
+    list_display = (
+        "id",
+        "created_at",
+        "method",
+        "path",
+        "status_code",
+        "duration_ms",
+        "cpu_ms",
+        "query_count",
+        "query_ms",
+        "trigger",
+        "downloads",
+    )
+    list_filter = ("trigger", "view_name")
+    search_fields = ("path", "view_name")
+    ordering = ("-created_at",)
+    exclude = ("cpu_stacks", "sql_stacks")
+    readonly_fields = (
+        "user",
+        "trigger",
+        "method",
+        "path",
+        "view_name",
+        "status_code",
+        "duration_ms",
+        "cpu_ms",
+        "samples",
+        "query_count",
+        "query_ms",
+        "queries",
+        "created_at",
+        "downloads",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_urls(self):
+        urls = [
+            path(
+                "<int:pk>/download/<str:kind>/",
+                self.admin_site.admin_view(self.download),
+                name="base_requestprofile_download",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    @admin.display(description="Скачать")
+    def downloads(self, obj):
+        return format_html(
+            '<a href="{}">стеки</a> / <a href="{}">SQL</a>',
+            reverse("admin:base_requestprofile_download", args=[obj.pk, "cpu"]),
+            reverse("admin:base_requestprofile_download", args=[obj.pk, "sql"]),
+        )
+
+    def download(self, request, pk, kind):
+        if kind not in ("cpu", "sql") or not self.has_view_permission(request):
+            raise Http404
+        profile = get_object_or_404(base_models.RequestProfile, pk=pk)
+        body = profile.cpu_stacks if kind == "cpu" else profile.sql_stacks
+        response = HttpResponse(body, content_type="text/plain; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="profile-{pk}-{kind}.folded"'
+        return response
@@ -0,0 +1,74 @@
+import pickle
+
+from django.core.cache.backends import locmem, redis
+
+from apps.base.utils import metrics
+
+_MISSING = object()
+
+# DEL только если в ключе всё ещё наше значение — GET и DEL одной командой
+_DELETE_IF_EQUAL_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class CacheMetricsMixin:
+    """Считает попадания и промахи get (метрика finic_cache_requests)."""
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+        if value is _MISSING:
+            metrics.record_cache(0, 1)
+            return default
+        metrics.record_cache(1, 0)
+        return value
+
+
+class RedisCache(CacheMetricsMixin, redis.RedisCache):
+    def get_many(self, keys, version=None):
+        # Redis читает пачку одним MGET, мимо get(); у базового get_many — через get()
+        keys = list(keys)
+        values = super().get_many(keys, version=version)
+        metrics.record_cache(len(values), len(keys) - len(values))
+        return values
+
+    def delete_if_equal(self, key, value, version=None):
+        """Атомарно удаляет key, если в нём лежит value (снятие своей блокировки)."""
+        key = self.make_and_validate_key(key, version=version)
+        client = self._cache.get_client(key, write=True)
+        serialized = self._cache._serializer.dumps(value)
+        return bool(client.eval(_DELETE_IF_EQUAL_SCRIPT, 1, key, serialized))
+
+    # Sorted set (ZSET): индекс позиций лидерборда, см. services.leaderboard
+
+    def sorted_set_add(self, key, mapping, version=None):
+        """ZADD: {member: score}, существующим членам score перезаписывается."""
+        if not mapping:
+            return
+        key = self.make_and_validate_key(key, version=version)
+        self._cache.get_client(key, write=True).zadd(key, mapping)
+
+    def sorted_set_remove(self, key, members, version=None):
+        members = list(members)
+        if not members:
+            return
+        key = self.make_and_validate_key(key, version=version)
+        self._cache.get_client(key, write=True).zrem(key, *members)
+
+    def sorted_set_count_above(self, key, score, version=None) -> int:
+        """ZCOUNT (score +inf: сколько членов со score строго больше, O(log N))."""
+        key = self.make_and_validate_key(key, version=version)
+        return self._cache.get_client(key).zcount(key, f"({score}", "+inf")
+
+
+class LocMemCache(CacheMetricsMixin, locmem.LocMemCache):
+    def delete_if_equal(self, key, value, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            if self._has_expired(key) or pickle.loads(self._cache[key]) != value:
+                return False
+            self._delete(key)
+            return True
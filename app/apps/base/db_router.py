@@ -0,0 +1,165 @@
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+# Чтения текущего запроса можно отправлять на реплику (ReplicaReadMixin, use_replica)
+_replica_reads = ContextVar("replica_reads", default=False)
+# В текущем запросе уже была запись — дальше читаем только с primary
+_wrote = ContextVar("replica_wrote", default=False)
+
+_PIN_KEY = "db:primary_pin:{}"
+
+# Задержка реплики на процесс: {alias: (lag_seconds, checked_at)}
+_lag_cache = {}
+
+_LAG_SQL = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+def _replica_lag(alias) -> float:
+    """Отставание реплики в секундах (недоступная реплика — бесконечное)."""
+    lag, checked_at = _lag_cache.get(alias, (None, 0))
+    now = time.monotonic()
+    if lag is not None and now - checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+        return lag
+
+    connection = connections[alias]
+    try:
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(_LAG_SQL)
+                lag = float(cursor.fetchone()[0] or 0)
+        else:
+            lag = 0.0
+    except Exception as e:
+        logger.warning("Replica %s is unavailable: %s", alias, e)
+        lag = float("inf")
+
+    _lag_cache[alias] = (lag, now)
+    return lag
+
+
+def replica_alias():
+    """Случайная реплика с допустимым отставанием или None (читать с primary)."""
+    replicas = [
+        alias
+        for alias in settings.DATABASE_REPLICAS
+        if _replica_lag(alias) <= settings.REPLICA_MAX_LAG_SECONDS
+    ]
+    return random.choice(replicas) if replicas else None
+
+
+def read_alias():
+    """Алиас для отчётных чтений вне запроса (выгрузки, фоновые задачи)."""
+    return replica_alias() or DEFAULT_DB_ALIAS
+
+
+def enable_replica_reads():
+    return _replica_reads.set(True)
+
+
+def disable_replica_reads(token):
+    _replica_reads.reset(token)
+
+
+@contextmanager
+def use_replica():
+    """Чтения блока — с реплики (для задач и команд вне HTTP-запроса)."""
+    token = enable_replica_reads()
+    # Записи до блока не в счёт: внутри блока после записи снова читаем с primary
+    wrote_token = _wrote.set(False)
+    try:
+        yield
+    finally:
+        _wrote.reset(wrote_token)
+        disable_replica_reads(token)
+
+
+def _client_key(request):
+    """
+    Ключ закрепления: пользователь или IP из заголовка доверенного прокси
+    (REPLICA_PIN_IP_HEADER). REMOTE_ADDR за nginx — адрес прокси, общий для
+    всех клиентов, поэтому без заголовка анонимный запрос не закрепляется (None).
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+    header = settings.REPLICA_PIN_IP_HEADER
+    if not header:
+        return None
+    # X-Forwarded-For: последний адрес добавил сам доверенный прокси
+    ip = request.META.get(header, "").rsplit(",", 1)[-1].strip()
+    return f"ip:{ip}" if ip else None
+
+
+def pin_to_primary(request):
+    """После записи клиент REPLICA_PIN_SECONDS читает с primary (свои записи)."""
+    key = _client_key(request)
+    if key is not None:
+        cache.set(_PIN_KEY.format(key), 1, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(request) -> bool:
+    key = _client_key(request)
+    return key is not None and bool(cache.get(_PIN_KEY.format(key)))
+
+
+class ReplicaRouter:
+    """
+    Записи и всё по умолчанию — в primary. На реплику уходят только чтения
+    внутри use_replica (ReplicaReadMixin у безопасных публичных и отчётных
+    view), если в запросе ещё не было записи, нет открытой транзакции
+    на primary и реплика отстаёт не больше REPLICA_MAX_LAG_SECONDS.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or _wrote.get():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return replica_alias() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики — копии primary: связи между объектами из разных алиасов допустимы
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaPinMiddleware:
+    """
+    Отмечает запросы с записью: после них клиент (пользователь или IP)
+    закрепляется за primary на REPLICA_PIN_SECONDS, чтобы сразу видеть
+    свои изменения, даже если реплика отстаёт.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # Поток обслуживает много запросов: флаг записи сбрасывается на каждый
+        token = _wrote.set(False)
+        try:
+            response = self.get_response(request)
+            if _wrote.get() and settings.DATABASE_REPLICAS:
+                pin_to_primary(request)
+        finally:
+            _wrote.reset(token)
+        return response
@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.base.services import retention
+
+
+class Command(BaseCommand):
+    help = (
+        "Archive (gzip JSONL) and delete expired rows: read notifications, "
+        "OTP codes, stale FCM device tokens and request profiles"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--policy",
+            action="append",
+            choices=sorted(retention.POLICIES),
+            help="Apply only this policy (repeatable). Default: all policies.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count rows that would be deleted.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Rows per transaction (default RETENTION_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=None,
+            help="Seconds to sleep between batches (default RETENTION_BATCH_PAUSE).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Repeat every N seconds (0 = run once and exit, e.g. from cron).",
+        )
+
+    def handle(self, *args, **options):
+        names = options["policy"] or list(retention.POLICIES)
+        while True:
+            close_old_connections()
+            for name in names:
+                if options["dry_run"]:
+                    self.stdout.write(f"{name}: {retention.count_expired(name)} rows expired")
+                    continue
+                deleted = retention.apply_policy(
+                    name,
+                    batch_size=options["batch_size"],
+                    pause=options["pause"],
+                )
+                self.stdout.write(f"{name}: deleted {deleted} rows")
+
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,137 @@
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.accounts import models as accounts_models
+from apps.base import models as base_models
+from apps.base import serializers as base_serializers
+from apps.base.renderers import FastJSONRenderer
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Microbenchmark: ModelSerializer + JSONRenderer vs values-based serializers + "
+        "FastJSONRenderer for campaign and donation lists. Demo rows are created in a "
+        "transaction and rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500, help="Campaigns / donations per list.")
+        parser.add_argument("--images", type=int, default=3, help="Images per campaign.")
+        parser.add_argument("--iterations", type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._seed(options["rows"], options["images"])
+                self._run(options["iterations"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _seed(self, rows, images):
+        org_user = accounts_models.User.objects.create(
+            username="bench_org", role="org", phone="+000bench1"
+        )
+        organization = accounts_models.Organization.objects.create(user=org_user, name="Bench org")
+        donor = accounts_models.User.objects.create(
+            username="bench_donor", role="donor", phone="+000bench2"
+        )
+        category = base_models.Category.objects.create(name="Bench", slug="bench-category")
+
+        campaigns = base_models.Campaign.objects.bulk_create([
+            base_models.Campaign(
+                organization=organization,
+                category=category if i % 2 else None,
+                title=f"Кампания {i}",
+                description="Описание кампании " * 20,
+                goal_amount=Decimal("100000.00"),
+                raised_amount=Decimal(i * 10),
+                donors_count=i,
+                image=f"campaigns/cover_{i}.jpg" if i % 3 else "",
+            )
+            for i in range(rows)
+        ])
+        base_models.CampaignImage.objects.bulk_create([
+            base_models.CampaignImage(campaign=campaign, image=f"campaigns/img_{campaign.id}_{n}.jpg")
+            for campaign in campaigns
+            for n in range(images)
+        ])
+        base_models.Donation.objects.bulk_create([
+            base_models.Donation(
+                donor=donor,
+                organization=organization,
+                campaign=campaigns[i] if i % 4 else None,
+                amount=Decimal("500.00") + i,
+            )
+            for i in range(rows)
+        ])
+
+        self.donor = donor
+        self.request = Request(APIRequestFactory().get("/api/campaigns/"))
+
+    def _measure(self, func, iterations):
+        best = None
+        for _ in range(iterations):
+            started = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def _compare(self, label, slow, fast, iterations):
+        slow_time, slow_bytes = self._measure(slow, iterations)
+        fast_time, fast_bytes = self._measure(fast, iterations)
+
+        if slow_bytes != fast_bytes:
+            raise CommandError(f"{label}: fast path output differs from ModelSerializer output")
+
+        self.stdout.write(
+            f"{label:<10} model+json: {slow_time * 1000:8.2f} ms   "
+            f"values+orjson: {fast_time * 1000:8.2f} ms   "
+            f"speedup: x{slow_time / fast_time:.1f}   ({len(fast_bytes)} bytes, identical)"
+        )
+
+    def _run(self, iterations):
+        context = {"request": self.request}
+        json_renderer = JSONRenderer()
+        fast_renderer = FastJSONRenderer()
+
+        campaigns = base_models.Campaign.objects.order_by("-created_at", "-id")
+
+        def campaigns_slow():
+            qs = campaigns.select_related("organization", "category").prefetch_related(
+                Prefetch("images", queryset=base_models.CampaignImage.objects.order_by("id"))
+            )
+            data = base_serializers.CampaignSerializer(qs, many=True, context=context).data
+            return json_renderer.render(data)
+
+        def campaigns_fast():
+            rows = campaigns.values(*base_serializers.CampaignValuesSerializer.columns_for())
+            data = base_serializers.CampaignValuesSerializer(rows, context=context).data
+            return fast_renderer.render(data)
+
+        donations = base_models.Donation.objects.filter(donor=self.donor).order_by("-created_at", "-id")
+
+        def donations_slow():
+            qs = donations.select_related("organization", "campaign")
+            data = base_serializers.DonationSerializer(qs, many=True, context=context).data
+            return json_renderer.render(data)
+
+        def donations_fast():
+            rows = donations.values(*base_serializers.DonationValuesSerializer.columns_for())
+            data = base_serializers.DonationValuesSerializer(rows, context=context).data
+            return fast_renderer.render(data)
+
+        self._compare("campaigns", campaigns_slow, campaigns_fast, iterations)
+        self._compare("donations", donations_slow, donations_fast, iterations)
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.base.services import openapi
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema artifact served by /api/schema/, "
+        "or with --check verify that the artifact matches the code."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.OPENAPI_SCHEMA_PATH,
+            help="Artifact path (default: OPENAPI_SCHEMA_PATH).",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Do not write: exit with an error if the artifact is missing or differs from a fresh schema.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["output"]
+        if not path:
+            raise CommandError("Set OPENAPI_SCHEMA_PATH or pass --output")
+
+        content = openapi.generate_schema()
+
+        if options["check"]:
+            if openapi.read_artifact(path) != content:
+                raise CommandError(
+                    f"OpenAPI schema artifact {path} is missing or stale, "
+                    "run manage.py build_openapi_schema"
+                )
+            self.stdout.write(self.style.SUCCESS("OpenAPI schema artifact is up to date"))
+            return
+
+        openapi.write_artifact(path, content)
+        self.stdout.write(self.style.SUCCESS(f"OpenAPI schema written to {path} ({len(content)} bytes)"))
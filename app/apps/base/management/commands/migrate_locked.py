@@ -0,0 +1,67 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from apps.base.utils.migrations import pending_migrations
+
+# Ключ pg_advisory_lock: общий для всех контейнеров, которые запускают миграции
+MIGRATION_LOCK_ID = 724_310_001
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply migrations under a PostgreSQL advisory lock (one runner at a time), "
+        "or with --check wait until another runner has applied them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Do not migrate: exit 0 when there are no unapplied migrations.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=0,
+            help="With --check: how many seconds to wait for migrations to be applied.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            return self._wait_applied(options["database"], options["timeout"])
+
+        connection = connections[options["database"]]
+        lock = connection.vendor == "postgresql"
+
+        if lock:
+            self.stdout.write("Waiting for migration lock...")
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_lock(%s)", [MIGRATION_LOCK_ID])
+        try:
+            call_command(
+                "migrate",
+                interactive=False,
+                database=options["database"],
+                verbosity=options["verbosity"],
+            )
+        finally:
+            if lock:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", [MIGRATION_LOCK_ID])
+
+    def _wait_applied(self, database, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            plan = pending_migrations(database)
+            if not plan:
+                self.stdout.write(self.style.SUCCESS("No unapplied migrations"))
+                return
+            if time.monotonic() >= deadline:
+                raise CommandError(
+                    f"{len(plan)} unapplied migration(s), e.g. {plan[0][0].app_label}.{plan[0][0].name}"
+                )
+            time.sleep(1)
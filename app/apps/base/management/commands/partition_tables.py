@@ -0,0 +1,98 @@
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+
+from apps.base.management.commands.migrate_locked import MIGRATION_LOCK_ID
+from apps.base.services import partitions
+
+
+def _month(value):
+    try:
+        parsed = datetime.strptime(value, "%Y-%m")
+    except ValueError:
+        raise CommandError(f"Expected YYYY-MM, got {value!r}")
+    return parsed.replace(tzinfo=dt_timezone.utc)
+
+
+class Command(BaseCommand):
+    help = (
+        "Maintain monthly partitions of Donation and Notification: create them ahead, "
+        "convert the tables once (--convert) or detach old months (--detach-before)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="One-time: turn the plain tables into partitioned ones (locks them briefly).",
+        )
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=partitions.DEFAULT_AHEAD_MONTHS,
+            help="How many months ahead to keep partitions ready.",
+        )
+        parser.add_argument(
+            "--detach-before",
+            type=_month,
+            help="Detach partitions that end on or before this month (YYYY-MM).",
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="With --detach-before: drop detached partitions instead of keeping them.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Repeat every N seconds (0 = run once and exit, e.g. from cron).",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            self.stdout.write("Partitioning requires PostgreSQL, nothing to do")
+            return
+
+        if options["convert"] or options["detach_before"]:
+            # Не пересекается с migrate_locked: DDL над теми же таблицами
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_lock(%s)", [MIGRATION_LOCK_ID])
+            try:
+                self._maintain(options)
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", [MIGRATION_LOCK_ID])
+
+        while True:
+            close_old_connections()
+            for model in partitions.PARTITIONED_MODELS:
+                for name in partitions.ensure_partitions(model, ahead=options["ahead"]):
+                    self.stdout.write(f"Created partition {name}")
+
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+
+    def _maintain(self, options):
+        for model in partitions.PARTITIONED_MODELS:
+            table = model._meta.db_table
+            if options["convert"]:
+                try:
+                    legacy = partitions.convert_table(model, ahead=options["ahead"])
+                except partitions.PartitionError as e:
+                    raise CommandError(str(e))
+                if legacy:
+                    self.stdout.write(f"Converted {table}; existing rows are in {legacy}")
+                else:
+                    self.stdout.write(f"{table} is already partitioned")
+
+            if options["detach_before"]:
+                names = partitions.detach_partitions(
+                    model, options["detach_before"], drop=options["drop"]
+                )
+                action = "Dropped" if options["drop"] else "Detached"
+                for name in names:
+                    self.stdout.write(f"{action} partition {name}")
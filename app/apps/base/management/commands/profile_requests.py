@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.base.services import profiling
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile a sample of production requests to one view (ProfilingMiddleware). "
+        "Without arguments shows the current target."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "view",
+            nargs="?",
+            help="View name as in resolver_match, e.g. apps.base.views.OrganizationStatsView.",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=0.1,
+            help="Fraction of the view's requests to profile (0..1).",
+        )
+        parser.add_argument(
+            "--minutes",
+            type=float,
+            default=15,
+            help="Stop sampling after this many minutes.",
+        )
+        parser.add_argument(
+            "--stop",
+            action="store_true",
+            help="Stop sampling now.",
+        )
+
+    def handle(self, *args, **options):
+        if options["stop"]:
+            profiling.clear_target()
+            self.stdout.write("Request sampling stopped")
+            return
+
+        if not options["view"]:
+            target = profiling.get_target()
+            if target is None:
+                self.stdout.write("Request sampling is off")
+            else:
+                self.stdout.write(f"Sampling {target['view']} at rate {target['rate']}")
+            return
+
+        if not 0 < options["rate"] <= 1:
+            raise CommandError("--rate must be in (0, 1]")
+        if options["minutes"] <= 0:
+            raise CommandError("--minutes must be positive")
+
+        profiling.set_target(options["view"], options["rate"], options["minutes"] * 60)
+        self.stdout.write(
+            f"Sampling {options['view']} at rate {options['rate']} for {options['minutes']:g} min; "
+            "profiles appear in admin (Профили запросов)"
+        )
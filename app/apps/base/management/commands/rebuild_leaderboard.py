@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.base.services.leaderboard import rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the Redis leaderboard position index from impact points "
+        "(first fill, after losing Redis data or editing points in the admin)"
+    )
+
+    def handle(self, *args, **options):
+        count = rebuild_index()
+        if count is None:
+            self.stdout.write("No Redis cache (REDIS_URL): positions are counted in the database")
+            return
+        self.stdout.write(
+            self.style.SUCCESS(f"Leaderboard index rebuilt: {count} organization leaderboards")
+        )
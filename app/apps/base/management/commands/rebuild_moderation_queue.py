@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.base.services.moderation import rebuild_queue
+
+
+class Command(BaseCommand):
+    help = "Recount the moderation queue (reports per content item) from ContentReport"
+
+    def handle(self, *args, **options):
+        count = rebuild_queue()
+        self.stdout.write(self.style.SUCCESS(f"Moderation queue rebuilt: {count} items"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.base.services.trending import rebuild_scores
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Campaign.trending_score from completed donations "
+        "(first fill or after changing TRENDING_HALF_LIFE_HOURS)"
+    )
+
+    def handle(self, *args, **options):
+        count = rebuild_scores()
+        self.stdout.write(self.style.SUCCESS(f"Trending scores rebuilt: {count} campaigns with donations"))
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from apps.base.services import tasks
+from apps.base.utils import metrics
+
+
+class Command(BaseCommand):
+    help = "Run background tasks worker (BackgroundTask queue)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process available tasks and exit.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10,
+            help="How many tasks to claim at once.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue is empty.",
+        )
+        parser.add_argument(
+            "--metrics-port",
+            type=int,
+            default=0,
+            help="Serve Prometheus metrics of this worker on the port (0 = off).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if options["metrics_port"]:
+            if not metrics.enabled():
+                raise CommandError("prometheus_client is not installed")
+            metrics.start_http_server(options["metrics_port"])
+        self.stdout.write(self.style.SUCCESS("Background worker started"))
+
+        while True:
+            close_old_connections()
+            processed = tasks.run_pending(batch_size=batch_size)
+
+            if options["once"]:
+                if not processed:
+                    break
+                continue
+
+            if not processed:
+                time.sleep(options["sleep"])
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.base.services import campaigns
+
+
+class Command(BaseCommand):
+    help = "Complete active campaigns that are past end_date or fully funded"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=campaigns.SWEEP_CHUNK_SIZE,
+            help="How many campaigns to update per transaction.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Repeat every N seconds (0 = run once and exit, e.g. from cron).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            completed = campaigns.sweep_campaigns(chunk_size=options["chunk_size"])
+            self.stdout.write(f"Completed campaigns: {completed}")
+
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
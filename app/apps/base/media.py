@@ -0,0 +1,131 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_etags
+from django.views.decorators.http import require_safe
+
+from apps.base.storage import IMMUTABLE_NAME_RE
+
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def _cache_control(path):
+    if IMMUTABLE_NAME_RE.search("/" + path):
+        return settings.MEDIA_IMMUTABLE_CACHE_CONTROL
+    return settings.MEDIA_CACHE_CONTROL
+
+
+def _parse_range(header, size):
+    """
+    (start, end) для одного диапазона bytes=, None — отдать файл целиком,
+    False — диапазон вне файла (416). Несколько диапазонов не поддерживаются:
+    RFC 9110 разрешает ответить на них всем файлом.
+    """
+    match = _RANGE_RE.fullmatch(header.strip())
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+
+    if not start:
+        # bytes=-N — последние N байт
+        length = int(end)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _read_range(path, start, length, block_size=FileResponse.block_size * 8):
+    # Генератор, а не файл: иначе WSGI-сервер отдаст через sendfile весь файл
+    with open(path, "rb") as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(block_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    /media/<path> для файлов на диске (MEDIA_SERVE_MODE, см.
+    core/project_settings/storage.py). В режимах accel/sendfile Django только
+    проверяет путь и ставит заголовки — байты и Range отдаёт прокси.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {
+        "Cache-Control": _cache_control(path),
+        "ETag": etag,
+        "Last-Modified": http_date(stat.st_mtime),
+    }
+
+    if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+        return HttpResponseNotModified(headers=headers)
+
+    content_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+    mode = settings.MEDIA_SERVE_MODE
+
+    if mode in ("accel", "sendfile"):
+        response = HttpResponse(content_type=content_type, headers=headers)
+        if mode == "accel":
+            response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX + quote(path)
+        else:
+            response["X-Sendfile"] = full_path
+        return response
+
+    byte_range = None
+    range_header = request.META.get("HTTP_RANGE")
+    if_range = request.META.get("HTTP_IF_RANGE")
+    # If-Range с другим ETag — файл изменился, отдаём целиком
+    if range_header and (not if_range or if_range == etag):
+        byte_range = _parse_range(range_header, stat.st_size)
+
+    headers["Accept-Ranges"] = "bytes"
+    if byte_range is False:
+        headers["Content-Range"] = f"bytes */{stat.st_size}"
+        return HttpResponse(status=416, headers=headers)
+
+    if byte_range is None:
+        return FileResponse(open(full_path, "rb"), content_type=content_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingHttpResponse(
+        _read_range(full_path, start, end - start + 1),
+        status=206,
+        content_type=content_type,
+        headers=headers,
+    )
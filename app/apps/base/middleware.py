@@ -0,0 +1,244 @@
+import gzip
+import hmac
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_vary_headers
+
+from apps.base.models import RequestProfile
+from apps.base.services import profiling
+from apps.base.utils import metrics
+from apps.base.utils.compression import brotli, choose_encoding
+from apps.base.utils.migrations import pending_migrations
+
+logger = logging.getLogger(__name__)
+
+# Уровни подобраны под динамические ответы: почти вся выгода при малой цене CPU
+BROTLI_QUALITY = 4
+GZIP_LEVEL = 6
+
+
+class CompressedJSONMiddleware:
+    """
+    Сжимает JSON-ответы API (br или gzip по Accept-Encoding), если тело
+    больше JSON_COMPRESSION_MIN_SIZE байт. Потоковые ответы (выгрузки) и уже
+    сжатые ответы не трогаются.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, "JSON_COMPRESSION_MIN_SIZE", 1024)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        if not response.get("Content-Type", "").startswith("application/json"):
+            return response
+
+        # Vary ставится и для маленьких ответов: кэш не должен отдать их не тому клиенту
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if len(response.content) < self.min_size:
+            return response
+
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if encoding == "br":
+            compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        else:
+            compressed = gzip.compress(response.content, compresslevel=GZIP_LEVEL, mtime=0)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+
+        # Сжатое тело отличается от исходного побайтно — ETag становится слабым
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+
+        return response
+
+
+class HealthCheckMiddleware:
+    """
+    /healthz — процесс жив; /readyz — есть БД, кэш и применены миграции.
+
+    Стоит первым в MIDDLEWARE: пробы балансировщика не проходят проверку Host,
+    аутентификацию и throttling и не попадают в логи запросов.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Миграции проверяются до первого успеха: дальше они не «откатятся»
+        self.migrations_applied = False
+
+    def __call__(self, request):
+        if request.path == "/healthz":
+            return JsonResponse({"status": "ok"})
+        if request.path == "/readyz":
+            return self.readiness()
+        return self.get_response(request)
+
+    def readiness(self):
+        checks = {}
+        for name, check in (
+            ("database", self._check_database),
+            ("cache", self._check_cache),
+            ("migrations", self._check_migrations),
+        ):
+            try:
+                check()
+                checks[name] = "ok"
+            except Exception as e:
+                logger.warning("Readiness check %s failed: %s", name, e)
+                checks[name] = "error"
+
+        ready = all(value == "ok" for value in checks.values())
+        return JsonResponse(
+            {"status": "ok" if ready else "unavailable", "checks": checks},
+            status=200 if ready else 503,
+        )
+
+    def _check_database(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+    def _check_cache(self):
+        cache.get("readyz")
+
+    def _check_migrations(self):
+        if self.migrations_applied:
+            return
+        plan = pending_migrations()
+        if plan:
+            raise RuntimeError(f"{len(plan)} unapplied migration(s)")
+        self.migrations_applied = True
+
+
+class _QueryCounter:
+    """execute_wrapper: считает запросы к БД за время HTTP-запроса."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    # Имя маршрута или путь к view: набор значений ограничен urls.py
+    return match.view_name if match is not None else "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Метрики Prometheus: время ответа по view и статусу, число запросов к БД,
+    отказы throttling (429). По METRICS_PATH отдаёт сами метрики (с
+    METRICS_TOKEN — только с заголовком Authorization: Bearer <token>).
+
+    Стоит сразу после HealthCheckMiddleware: пробы в метрики не попадают.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.path = settings.METRICS_PATH
+        self.token = settings.METRICS_TOKEN
+
+    def __call__(self, request):
+        if not metrics.enabled():
+            return self.get_response(request)
+        if request.path == self.path:
+            return self.metrics(request)
+
+        counter = _QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in settings.DATABASES:
+                stack.enter_context(connections[alias].execute_wrapper(counter))
+            response = self.get_response(request)
+
+        metrics.observe_request(
+            request.method,
+            _view_name(request),
+            response.status_code,
+            time.perf_counter() - start,
+            counter.count,
+        )
+        return response
+
+    def metrics(self, request):
+        if self.token:
+            provided = request.META.get("HTTP_AUTHORIZATION", "").encode()
+            if not hmac.compare_digest(provided, f"Bearer {self.token}".encode()):
+                return HttpResponse(status=401)
+
+        body, content_type = metrics.render()
+        return HttpResponse(body, content_type=content_type)
+
+
+class ProfilingMiddleware:
+    """
+    Профилирование отдельных запросов в проде. Запрос профилируется, если:
+    - сотрудник (is_staff) прислал заголовок X-Profile или ?_profile=1;
+    - для его view включена выборка (manage.py profile_requests) и выпал
+      случай с заданной вероятностью — так видны медленные запросы клиентов.
+
+    Профиль сохраняется в RequestProfile (скачать — в админке), его id
+    возвращается в заголовке X-Profile-Id. Остальные запросы не платят ничего,
+    кроме проверки заголовка и закэшированной в процессе цели.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler = getattr(request, "_profiler", None)
+            if profiler is not None:
+                profiler.stop()
+
+        if profiler is None:
+            return response
+        try:
+            profile = profiler.save(request, _view_name(request), response.status_code)
+        except Exception:
+            logger.exception("Failed to save request profile")
+        else:
+            response["X-Profile-Id"] = str(profile.id)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        trigger = self._trigger(request)
+        if trigger is not None:
+            request._profiler = profiling.Profiler(trigger)
+            request._profiler.start()
+        return None
+
+    def _trigger(self, request):
+        if "HTTP_X_PROFILE" in request.META or "_profile" in request.GET:
+            if profiling.is_staff(request):
+                return RequestProfile.Trigger.HEADER
+            return None
+
+        target = profiling.current_target()
+        if target is not None and target["view"] == _view_name(request):
+            if random.random() < target["rate"]:
+                return RequestProfile.Trigger.SAMPLED
+        return None
@@ -1,29 +1,224 @@
-# Manual migration for FCMDeviceToken table only
+# Generated by Django 5.2 on 2026-10-19 14:23
 
-from django.db import migrations
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
 
 
 class Migration(migrations.Migration):
 
+    initial = True
+
     dependencies = [
+        ('accounts', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
     ]
 
     operations = [
-        migrations.RunSQL(
-            sql="""
-                CREATE TABLE IF NOT EXISTS base_fcmdevicetoken (
-                    id SERIAL PRIMARY KEY,
-                    token VARCHAR(255) UNIQUE NOT NULL,
-                    device_type VARCHAR(10) DEFAULT 'android' NOT NULL,
-                    is_active BOOLEAN DEFAULT TRUE NOT NULL,
-                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
-                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
-                    user_id INTEGER NOT NULL REFERENCES accounts_user(id) ON DELETE CASCADE
-                );
-                CREATE INDEX IF NOT EXISTS base_fcmdevicetoken_user_id_idx ON base_fcmdevicetoken(user_id);
-                CREATE INDEX IF NOT EXISTS base_fcmdevicetoken_token_idx ON base_fcmdevicetoken(token);
-            """,
-            reverse_sql="DROP TABLE IF EXISTS base_fcmdevicetoken;",
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('slug', models.SlugField(max_length=120, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Категория',
+                'verbose_name_plural': 'Категории',
+            },
+        ),
+        migrations.CreateModel(
+            name='Hadith',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(verbose_name='Текст хадиса')),
+                ('source', models.CharField(max_length=255, verbose_name='Книга-источник')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Хадис',
+                'verbose_name_plural': 'Хадисы',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Campaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('goal_amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('raised_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('donors_count', models.PositiveIntegerField(default=0)),
+                ('status', models.CharField(choices=[('active', 'Активна'), ('completed', 'Завершена'), ('paused', 'На паузе')], default='active', max_length=20)),
+                ('start_date', models.DateField(auto_now_add=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('image', models.ImageField(blank=True, null=True, upload_to='campaigns/')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='campaigns', to='accounts.organization')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='campaigns', to='base.category')),
+            ],
+            options={
+                'verbose_name': 'Кампания',
+                'verbose_name_plural': 'Кампании',
+            },
+        ),
+        migrations.CreateModel(
+            name='CampaignImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image', models.ImageField(upload_to='campaigns/')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='base.campaign')),
+            ],
+            options={
+                'verbose_name': 'Картинка кампании',
+                'verbose_name_plural': 'Картинки кампании',
+            },
+        ),
+        migrations.CreateModel(
+            name='ContentReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_type', models.CharField(choices=[('campaign', 'Кампания'), ('organization', 'Организация')], max_length=20, verbose_name='Тип контента')),
+                ('content_id', models.PositiveIntegerField(verbose_name='ID контента')),
+                ('reason', models.TextField(verbose_name='Причина жалобы')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='content_reports', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Жалоба на контент',
+                'verbose_name_plural': 'Жалобы на контент',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Donation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('status', models.CharField(choices=[('completed', 'Завершено'), ('pending', 'Ожидает'), ('failed', 'Ошибка')], default='completed', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('campaign', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='donations', to='base.campaign')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='donations', to='base.category')),
+                ('donor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='donations', to=settings.AUTH_USER_MODEL)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='donations', to='accounts.organization')),
+            ],
+            options={
+                'verbose_name': 'Пожертвование',
+                'verbose_name_plural': 'Пожертвования',
+            },
+        ),
+        migrations.CreateModel(
+            name='DonorBankDetails',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bank_name', models.CharField(blank=True, default='', max_length=255)),
+                ('account_number', models.CharField(blank=True, default='', max_length=255)),
+                ('account_holder', models.CharField(blank=True, default='', max_length=255)),
+                ('extra_info', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('donor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='bank_details', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Банковские реквизиты донора',
+                'verbose_name_plural': 'Банковские реквизиты доноров',
+            },
+        ),
+        migrations.CreateModel(
+            name='FCMDeviceToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=255, unique=True)),
+                ('device_type', models.CharField(choices=[('ios', 'iOS'), ('android', 'Android')], default='android', max_length=10)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fcm_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'FCM токен устройства',
+                'verbose_name_plural': 'FCM токены устройств',
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('message', models.TextField()),
+                ('is_read', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Уведомление',
+                'verbose_name_plural': 'Уведомления',
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.CreateModel(
+            name='Payment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('provider', models.CharField(default='stub', max_length=50)),
+                ('status', models.CharField(choices=[('pending', 'Ожидает'), ('completed', 'Завершён'), ('failed', 'Ошибка')], default='pending', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('donation', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='payment', to='base.donation')),
+                ('donor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payments', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Платёж',
+                'verbose_name_plural': 'Платежи',
+            },
+        ),
+        migrations.CreateModel(
+            name='RecurringDonation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('interval', models.CharField(choices=[('daily', 'Ежедневно')], default='daily', max_length=20)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('donor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurring_donations', to=settings.AUTH_USER_MODEL)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurring_donations', to='accounts.organization')),
+            ],
+            options={
+                'verbose_name': 'Регулярный донат',
+                'verbose_name_plural': 'Регулярные донаты',
+            },
+        ),
+        migrations.CreateModel(
+            name='Report',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('amount_spent', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('file', models.FileField(blank=True, null=True, upload_to='reports/')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('campaign', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reports', to='base.campaign')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reports', to='accounts.organization')),
+            ],
+            options={
+                'verbose_name': 'Отчёт',
+                'verbose_name_plural': 'Отчёты',
+            },
+        ),
+        migrations.CreateModel(
+            name='ReportMedia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(upload_to='reports/media/')),
+                ('media_type', models.CharField(choices=[('image', 'Фото'), ('video', 'Видео')], default='image', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='media_files', to='base.report')),
+            ],
+            options={
+                'verbose_name': 'Медиа файл отчёта',
+                'verbose_name_plural': 'Медиа файлы отчётов',
+            },
         ),
     ]
-
@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-19 14:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_donorprofile_donorprofile_points_idx'),
+        ('base', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizationDonorImpact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('impact_points', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('donor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='organization_impacts', to=settings.AUTH_USER_MODEL)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='donor_impacts', to='accounts.organization')),
+            ],
+            options={
+                'verbose_name': 'Вклад донора в организацию',
+                'verbose_name_plural': 'Вклады доноров в организации',
+                'indexes': [models.Index(fields=['organization', '-impact_points', 'id'], name='org_donor_impact_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('organization', 'donor'), name='uniq_org_donor_impact')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 14:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_donorprofile_donorprofile_points_idx'),
+        ('base', '0004_donationexport'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(fields=['status', 'end_date'], name='campaign_status_end_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-19 14:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_statelessorganization_statelessuser'),
+        ('base', '0005_campaign_campaign_status_end_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizationFollower',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='followers', to='accounts.organization')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='followed_organizations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Подписчик организации',
+                'verbose_name_plural': 'Подписчики организаций',
+                'indexes': [models.Index(fields=['organization', 'id'], name='org_follower_broadcast_idx')],
+                'constraints': [models.UniqueConstraint(fields=('organization', 'user'), name='uniq_org_follower')],
+            },
+        ),
+    ]
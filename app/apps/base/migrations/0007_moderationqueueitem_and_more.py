@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-19 14:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0006_organizationfollower'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModerationQueueItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_type', models.CharField(choices=[('campaign', 'Кампания'), ('organization', 'Организация')], max_length=20, verbose_name='Тип контента')),
+                ('content_id', models.PositiveIntegerField(verbose_name='ID контента')),
+                ('status', models.CharField(choices=[('open', 'Открыта'), ('resolved', 'Рассмотрена')], default='open', max_length=20, verbose_name='Статус')),
+                ('reports_count', models.PositiveIntegerField(default=0, verbose_name='Всего жалоб')),
+                ('pending_count', models.PositiveIntegerField(default=0, verbose_name='Новых жалоб')),
+                ('first_reported_at', models.DateTimeField(verbose_name='Первая жалоба')),
+                ('last_reported_at', models.DateTimeField(verbose_name='Последняя жалоба')),
+                ('notified_at', models.DateTimeField(blank=True, null=True, verbose_name='Дайджест отправлен')),
+            ],
+            options={
+                'verbose_name': 'Объект на модерации',
+                'verbose_name_plural': 'Очередь модерации',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='contentreport',
+            index=models.Index(fields=['content_type', 'content_id', '-created_at'], name='content_report_target_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='moderationqueueitem',
+            index=models.Index(fields=['status', '-reports_count'], name='moderation_status_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='moderationqueueitem',
+            index=models.Index(condition=models.Q(('pending_count__gt', 0)), fields=['pending_count'], name='moderation_pending_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='moderationqueueitem',
+            constraint=models.UniqueConstraint(fields=('content_type', 'content_id'), name='uniq_moderation_target'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-19 14:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Индексы на больших таблицах строятся без блокировки записи
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0004_organizationrequest_orgrequest_phone_created_idx'),
+        ('base', '0007_moderationqueueitem_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='payment',
+            name='donation',
+            field=models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='payment', to='base.donation'),
+        ),
+        AddIndexConcurrently(
+            model_name='donation',
+            index=models.Index(fields=['donor', '-created_at'], name='donation_donor_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='donation',
+            index=models.Index(fields=['organization', '-created_at'], name='donation_org_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at'], name='notification_user_created_idx'),
+        ),
+    ]
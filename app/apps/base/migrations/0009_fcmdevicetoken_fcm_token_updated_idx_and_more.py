@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-19 14:24
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Индексы на больших таблицах строятся без блокировки записи
+    atomic = False
+
+    dependencies = [
+        ('base', '0008_alter_payment_donation_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='fcmdevicetoken',
+            index=models.Index(fields=['updated_at', 'id'], name='fcm_token_updated_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', True)), fields=['created_at', 'id'], name='notification_read_created_idx'),
+        ),
+    ]
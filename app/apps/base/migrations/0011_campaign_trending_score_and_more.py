@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-19 14:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_otpcode_otpcode_created_idx'),
+        ('base', '0010_requestprofile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaign',
+            name='trending_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(fields=['-trending_score', '-id'], name='campaign_trending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(fields=['status', '-trending_score', '-id'], name='campaign_status_trending_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 14:28
+
+import apps.base.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0011_campaign_trending_score_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='donationexport',
+            name='file',
+            field=models.FileField(blank=True, null=True, storage=apps.base.storage.private_storage, upload_to='exports/'),
+        ),
+    ]
@@ -0,0 +1,105 @@
+from django.conf import settings
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from apps.base import db_router
+
+SPARSE_FIELDS_PARAMETERS = [
+    OpenApiParameter(
+        name="fields",
+        required=False,
+        type=str,
+        description="Только перечисленные поля через запятую (например id,title,image,raised_amount).",
+    ),
+    OpenApiParameter(
+        name="omit",
+        required=False,
+        type=str,
+        description="Исключить поля через запятую (например description,images).",
+    ),
+]
+
+
+def _split(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+class SparseValuesListMixin:
+    """
+    Список через values-сериализатор с поддержкой ?fields= и ?omit=.
+
+    Из базы читаются только колонки выбранных полей, а связанные данные
+    (например картинки кампаний) не запрашиваются, если поле не выбрано.
+    """
+
+    values_serializer_class = None
+
+    def get_sparse_fields(self):
+        serializer_class = self.values_serializer_class
+        available = serializer_class.field_names()
+        params = self.request.query_params
+
+        fields = available
+        if params.get("fields"):
+            requested = _split(params["fields"])
+            unknown = [name for name in requested if name not in available]
+            if unknown:
+                raise ValidationError({"fields": f"Неизвестные поля: {', '.join(unknown)}"})
+            fields = [name for name in available if name in requested]
+
+        if params.get("omit"):
+            omitted = _split(params["omit"])
+            unknown = [name for name in omitted if name not in available]
+            if unknown:
+                raise ValidationError({"omit": f"Неизвестные поля: {', '.join(unknown)}"})
+            fields = [name for name in fields if name not in omitted]
+
+        if not fields:
+            raise ValidationError({"fields": "Не выбрано ни одного поля"})
+        return fields
+
+    def values_queryset(self, queryset, fields):
+        return queryset.values(*self.values_serializer_class.columns_for(fields))
+
+    def get_values_data(self, rows, fields):
+        return self.values_serializer_class(
+            rows, context=self.get_serializer_context(), fields=fields
+        ).data
+
+    def list(self, request, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        queryset = self.values_queryset(self.filter_queryset(self.get_queryset()), fields)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_values_data(page, fields))
+
+        return Response(self.get_values_data(queryset, fields))
+
+
+
+class ReplicaReadMixin:
+    """
+    GET/HEAD view читают с реплики (apps.base.db_router), если они настроены
+    и клиент недавно ничего не записывал. Только для view без записей в БД.
+    """
+
+    _replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # После аутентификации: закрепление за primary проверяется по пользователю
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in SAFE_METHODS
+            and not db_router.is_pinned(request)
+        ):
+            self._replica_token = db_router.enable_replica_reads()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self._replica_token is not None:
+            db_router.disable_replica_reads(self._replica_token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -1,5 +1,8 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
+
+from apps.base.storage import private_storage
 
 User = settings.AUTH_USER_MODEL
 
@@ -41,6 +44,8 @@ class Campaign(models.Model):
     raised_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
 
     donors_count = models.PositiveIntegerField(default=0)
+    # log2 затухающего числа донатов (services/trending.py), для ?ordering=trending
+    trending_score = models.FloatField(default=0)
 
     status = models.CharField(
         max_length=20,
@@ -62,6 +67,16 @@ class Campaign(models.Model):
     class Meta:
         verbose_name = "Кампания"
         verbose_name_plural = "Кампании"
+        indexes = [
+            # sweep_campaigns: активные кампании с истёкшим end_date
+            models.Index(fields=["status", "end_date"], name="campaign_status_end_idx"),
+            # Лента ?ordering=trending: все кампании и с фильтром по статусу
+            models.Index(fields=["-trending_score", "-id"], name="campaign_trending_idx"),
+            models.Index(
+                fields=["status", "-trending_score", "-id"],
+                name="campaign_status_trending_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title}"
@@ -129,6 +144,12 @@ class Donation(models.Model):
     class Meta:
         verbose_name = "Пожертвование"
         verbose_name_plural = "Пожертвования"
+        # Таблица секционируется по месяцам created_at (services.partitions):
+        # списки по донору и организации идут по свежим секциям по порядку
+        indexes = [
+            models.Index(fields=["donor", "-created_at"], name="donation_donor_created_idx"),
+            models.Index(fields=["organization", "-created_at"], name="donation_org_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.donor} -> {self.organization}: {self.amount}"
@@ -210,6 +231,8 @@ class Payment(models.Model):
         Donation,
         on_delete=models.CASCADE,
         related_name="payment",
+        # Ключ секционированной Donation — (id, created_at): FK в БД на id невозможен
+        db_constraint=False,
     )
 
     amount = models.DecimalField(max_digits=12, decimal_places=2)
@@ -253,6 +276,16 @@ class Notification(models.Model):
         verbose_name = "Уведомление"
         verbose_name_plural = "Уведомления"
         ordering = ("-created_at",)
+        # Секционируется по месяцам created_at, как Donation
+        indexes = [
+            models.Index(fields=["user", "-created_at"], name="notification_user_created_idx"),
+            # Очистка прочитанных уведомлений (services.retention)
+            models.Index(
+                fields=["created_at", "id"],
+                condition=models.Q(is_read=True),
+                name="notification_read_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} — {self.user}"
@@ -278,6 +311,10 @@ class FCMDeviceToken(models.Model):
         verbose_name = "FCM токен устройства"
         verbose_name_plural = "FCM токены устройств"
         ordering = ("-created_at",)
+        indexes = [
+            # Очистка давно не обновлявшихся токенов (services.retention)
+            models.Index(fields=["updated_at", "id"], name="fcm_token_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user} — {self.device_type}"
@@ -374,6 +411,270 @@ class ContentReport(models.Model):
         verbose_name = "Жалоба на контент"
         verbose_name_plural = "Жалобы на контент"
         ordering = ["-created_at"]
+        indexes = [
+            # Последние жалобы на объект (дайджест модерации, админка)
+            models.Index(
+                fields=["content_type", "content_id", "-created_at"],
+                name="content_report_target_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Жалоба от {self.user} на {self.get_content_type_display()} #{self.content_id}"
+
+
+class ModerationQueueItem(models.Model):
+    """
+    Очередь модерации: счётчики жалоб по объекту (content_type, content_id).
+    Обновляется при каждой жалобе, поэтому админка и дайджест не сканируют
+    ContentReport.
+    """
+
+    class Status(models.TextChoices):
+        OPEN = "open", "Открыта"
+        RESOLVED = "resolved", "Рассмотрена"
+
+    content_type = models.CharField(
+        max_length=20,
+        choices=ContentReport.ContentType.choices,
+        verbose_name="Тип контента",
+    )
+    content_id = models.PositiveIntegerField(verbose_name="ID контента")
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.OPEN,
+        verbose_name="Статус",
+    )
+    reports_count = models.PositiveIntegerField(default=0, verbose_name="Всего жалоб")
+    # Жалобы, ещё не вошедшие в дайджест
+    pending_count = models.PositiveIntegerField(default=0, verbose_name="Новых жалоб")
+    first_reported_at = models.DateTimeField(verbose_name="Первая жалоба")
+    last_reported_at = models.DateTimeField(verbose_name="Последняя жалоба")
+    notified_at = models.DateTimeField(null=True, blank=True, verbose_name="Дайджест отправлен")
+
+    class Meta:
+        verbose_name = "Объект на модерации"
+        verbose_name_plural = "Очередь модерации"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "content_id"],
+                name="uniq_moderation_target",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["status", "-reports_count"],
+                name="moderation_status_count_idx",
+            ),
+            # Дайджест: объекты с новыми жалобами
+            models.Index(
+                fields=["pending_count"],
+                name="moderation_pending_idx",
+                condition=models.Q(pending_count__gt=0),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_content_type_display()} #{self.content_id}: {self.reports_count}"
+
+
+class OrganizationDonorImpact(models.Model):
+    """Очки влияния донора в рамках одной организации (для лидерборда)"""
+
+    organization = models.ForeignKey(
+        "accounts.Organization",
+        on_delete=models.CASCADE,
+        related_name="donor_impacts",
+    )
+    donor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="organization_impacts",
+    )
+    impact_points = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Вклад донора в организацию"
+        verbose_name_plural = "Вклады доноров в организации"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["organization", "donor"],
+                name="uniq_org_donor_impact",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["organization", "-impact_points", "id"],
+                name="org_donor_impact_rank_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.donor} -> {self.organization}: {self.impact_points}"
+
+
+class OrganizationFollower(models.Model):
+    """Подписка пользователя на новости организации (новые кампании, отчёты)"""
+
+    organization = models.ForeignKey(
+        "accounts.Organization",
+        on_delete=models.CASCADE,
+        related_name="followers",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="followed_organizations",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Подписчик организации"
+        verbose_name_plural = "Подписчики организаций"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["organization", "user"],
+                name="uniq_org_follower",
+            )
+        ]
+        indexes = [
+            # Рассылка подписчикам идёт пачками по (organization, id)
+            models.Index(fields=["organization", "id"], name="org_follower_broadcast_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} -> {self.organization}"
+
+
+class BackgroundTask(models.Model):
+    """Задача для фонового воркера (manage.py run_tasks)"""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Ожидает"
+        RUNNING = "running", "Выполняется"
+        DONE = "done", "Выполнена"
+        FAILED = "failed", "Ошибка"
+
+    name = models.CharField(max_length=255, verbose_name="Функция")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Параметры")
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Фоновая задача"
+        verbose_name_plural = "Фоновые задачи"
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="bgtask_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
+
+
+class DonationExport(models.Model):
+    """Выгрузка истории донатов организации в файл (фоновая задача)"""
+
+    class FileFormat(models.TextChoices):
+        CSV = "csv", "CSV"
+        XLSX = "xlsx", "XLSX"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Ожидает"
+        RUNNING = "running", "Формируется"
+        DONE = "done", "Готово"
+        FAILED = "failed", "Ошибка"
+
+    organization = models.ForeignKey(
+        "accounts.Organization",
+        on_delete=models.CASCADE,
+        related_name="donation_exports",
+    )
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="donation_exports",
+    )
+    file_format = models.CharField(
+        max_length=10,
+        choices=FileFormat.choices,
+        default=FileFormat.CSV,
+    )
+    filters = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    file = models.FileField(
+        upload_to="exports/",
+        storage=private_storage,
+        null=True,
+        blank=True,
+    )
+    rows_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Выгрузка донатов"
+        verbose_name_plural = "Выгрузки донатов"
+        ordering = ("-created_at",)
+
+    def __str__(self):
+        return f"Export {self.id} ({self.file_format}) — {self.organization}"
+
+
+class RequestProfile(models.Model):
+    """Профиль одного HTTP-запроса: стеки Python и SQL (ProfilingMiddleware)"""
+
+    class Trigger(models.TextChoices):
+        HEADER = "header", "По запросу сотрудника"
+        SAMPLED = "sampled", "Выборка по view"
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    trigger = models.CharField(max_length=20, choices=Trigger.choices)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    view_name = models.CharField(max_length=255, blank=True)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    duration_ms = models.FloatField(default=0)
+    cpu_ms = models.FloatField(default=0, verbose_name="CPU потока, мс")
+    samples = models.PositiveIntegerField(default=0)
+    query_count = models.PositiveIntegerField(default=0)
+    query_ms = models.FloatField(default=0)
+    # Свёрнутые стеки ("a;b;c 12" в строке) — формат flamegraph.pl / speedscope
+    cpu_stacks = models.TextField(blank=True)
+    sql_stacks = models.TextField(blank=True)
+    # [{"sql", "ms", "many"}] — SQL без параметров
+    queries = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Профиль запроса"
+        verbose_name_plural = "Профили запросов"
+        ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["created_at"], name="reqprofile_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
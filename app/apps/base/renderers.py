@@ -0,0 +1,56 @@
+import decimal
+import math
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_fallback_encoder = JSONEncoder()
+
+
+def _default(obj):
+    """
+    Типы, которые orjson не знает, кодируются так же, как в DRF JSONEncoder.
+    Decimal DRF превращает во float: отдаём его repr как готовый фрагмент,
+    чтобы формат числа совпадал с json.dumps байт в байт.
+    """
+    if isinstance(obj, decimal.Decimal):
+        value = float(obj)
+        if not math.isfinite(value):
+            raise ValueError("Out of range float values are not JSON compliant")
+        return orjson.Fragment(repr(value))
+    return _fallback_encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson. Для того, что отдают сериализаторы API (строки,
+    целые, Decimal, datetime, None), вывод совпадает с
+    rest_framework.renderers.JSONRenderer байт в байт — это проверяют тесты.
+    Отличия остаются для float: запись может быть другой (1e16 вместо 1e+16),
+    а NaN/Infinity становятся null вместо ошибки. Целые больше 64 бит и
+    запросы с отступами (Accept: application/json; indent=4) отдаются штатным
+    рендерером.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Например, int больше 64 бит — штатный json справится или даст ту же ошибку
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Как и DRF, экранируем U+2028/U+2029 для совместимости с JavaScript
+        if b"\xe2\x80" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -1,9 +1,33 @@
+from decimal import Decimal
+
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils.encoding import iri_to_uri
+from django.utils import timezone
 from rest_framework import serializers
 
 from apps.base import models as base_models
+from apps.base.services import uploads
 from apps.accounts import models as accounts_models
 
 
+class UploadKeyField(serializers.CharField):
+    """
+    Ключ файла, загруженного напрямую в хранилище (POST /api/uploads/).
+    Проверяется в services.uploads.verify_upload; значение можно присвоить
+    FileField модели вместо файла.
+    """
+
+    def __init__(self, purpose, **kwargs):
+        self.purpose = purpose
+        kwargs.setdefault("max_length", 255)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        key = super().to_internal_value(data)
+        return uploads.verify_upload(self.context["request"].user, self.purpose, key)
+
+
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = base_models.Category
@@ -65,6 +89,17 @@ class CampaignCreateSerializer(serializers.ModelSerializer):
         write_only=True,
         required=False,
     )
+    image_key = UploadKeyField(
+        purpose="campaign_image",
+        source="image",
+        write_only=True,
+        required=False,
+    )
+    image_keys = serializers.ListField(
+        child=UploadKeyField(purpose="campaign_image"),
+        write_only=True,
+        required=False,
+    )
 
     class Meta:
         model = base_models.Campaign
@@ -76,6 +111,8 @@ class CampaignCreateSerializer(serializers.ModelSerializer):
             "end_date",
             "image",
             "images",
+            "image_key",
+            "image_keys",
         )
 
     def validate_goal_amount(self, value):
@@ -106,6 +143,14 @@ class CampaignCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Максимум 10 картинок")
         return value
 
+    def validate(self, attrs):
+        # Файлы и ключи прямой загрузки — один список картинок
+        image_keys = attrs.pop("image_keys", None)
+        if image_keys is not None:
+            attrs["images"] = attrs.get("images", []) + image_keys
+            self.validate_images(attrs["images"])
+        return attrs
+
     def create(self, validated_data):
         images = validated_data.pop("images", [])
         campaign = super().create(validated_data)
@@ -225,6 +270,17 @@ class ReportCreateSerializer(serializers.ModelSerializer):
         required=False,
         write_only=True,
     )
+    file_key = UploadKeyField(
+        purpose="report_file",
+        source="file",
+        write_only=True,
+        required=False,
+    )
+    media_keys = serializers.ListField(
+        child=UploadKeyField(purpose=("report_image", "report_video")),
+        required=False,
+        write_only=True,
+    )
 
     class Meta:
         model = base_models.Report
@@ -235,6 +291,8 @@ class ReportCreateSerializer(serializers.ModelSerializer):
             "campaign",
             "file",
             "media_files",
+            "file_key",
+            "media_keys",
         )
 
     def validate_amount_spent(self, value):
@@ -250,7 +308,8 @@ class ReportCreateSerializer(serializers.ModelSerializer):
         video_count = 0
 
         for f in files:
-            name = f.name.lower()
+            # Загруженный файл или ключ прямой загрузки
+            name = getattr(f, "name", f).lower()
             if name.endswith((".mp4", ".mov", ".avi", ".mkv")):
                 video_count += 1
             else:
@@ -263,12 +322,20 @@ class ReportCreateSerializer(serializers.ModelSerializer):
 
         return files
 
+    def validate(self, attrs):
+        media_keys = attrs.pop("media_keys", None)
+        if media_keys is not None:
+            attrs["media_files"] = self.validate_media_files(
+                attrs.get("media_files", []) + media_keys
+            )
+        return attrs
+
     def create(self, validated_data):
         media_files = validated_data.pop("media_files", [])
         report = super().create(validated_data)
 
         for media_file in media_files:
-            file_name = media_file.name.lower()
+            file_name = getattr(media_file, "name", media_file).lower()
             if file_name.endswith((".mp4", ".mov", ".avi", ".mkv")):
                 media_type = base_models.ReportMedia.MediaType.VIDEO
             else:
@@ -316,6 +383,89 @@ class PaymentCompleteStubSerializer(serializers.Serializer):
     donation_id = serializers.IntegerField()
 
 
+class PaymentSettlementSerializer(serializers.Serializer):
+    payment_id = serializers.IntegerField(min_value=1)
+    status = serializers.ChoiceField(
+        choices=(
+            base_models.Payment.Status.COMPLETED,
+            base_models.Payment.Status.FAILED,
+        )
+    )
+
+
+class PaymentSettlementBatchSerializer(serializers.Serializer):
+    settlements = PaymentSettlementSerializer(many=True, allow_empty=False, max_length=10000)
+
+
+class PaymentSettlementResultSerializer(serializers.Serializer):
+    completed = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    skipped = serializers.ListField(child=serializers.IntegerField())
+
+
+class DonationExportFilterSerializer(serializers.Serializer):
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    campaign_id = serializers.IntegerField(required=False, min_value=1)
+    status = serializers.ChoiceField(
+        choices=base_models.Donation.Status.choices,
+        required=False,
+    )
+
+    def validate(self, attrs):
+        date_from = attrs.get("date_from")
+        date_to = attrs.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            raise serializers.ValidationError("date_from не может быть позже date_to.")
+        return attrs
+
+    def get_filters(self) -> dict:
+        """Фильтры в JSON-совместимом виде (для DonationExport.filters)."""
+        return {
+            key: value.isoformat() if hasattr(value, "isoformat") else value
+            for key, value in self.validated_data.items()
+        }
+
+
+class DonationExportCreateSerializer(DonationExportFilterSerializer):
+    file_format = serializers.ChoiceField(
+        choices=base_models.DonationExport.FileFormat.choices,
+        default=base_models.DonationExport.FileFormat.XLSX,
+    )
+
+    def get_filters(self) -> dict:
+        filters = super().get_filters()
+        filters.pop("file_format", None)
+        return filters
+
+
+class DonationExportSerializer(serializers.ModelSerializer):
+    # Файл закрытый: вместо адреса в storage — ссылка на скачивание с проверкой доступа
+    file = serializers.SerializerMethodField()
+
+    class Meta:
+        model = base_models.DonationExport
+        fields = (
+            "id",
+            "file_format",
+            "filters",
+            "status",
+            "file",
+            "rows_count",
+            "error",
+            "created_at",
+            "finished_at",
+        )
+        read_only_fields = fields
+
+    def get_file(self, obj) -> str | None:
+        if not obj.file or obj.status != base_models.DonationExport.Status.DONE:
+            return None
+        url = reverse("donation-export-download", args=[obj.pk])
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+
 class MonthlyAmountSerializer(serializers.Serializer):
     month = serializers.DateTimeField()
     total = serializers.DecimalField(max_digits=12, decimal_places=2)
@@ -334,6 +484,38 @@ class OrganizationStatsSerializer(serializers.Serializer):
     monthly = MonthlyAmountSerializer(many=True)
 
 
+class OrganizationFollowStatusSerializer(serializers.Serializer):
+    following = serializers.BooleanField()
+    followers_count = serializers.IntegerField()
+
+
+class UploadRequestSerializer(serializers.Serializer):
+    purpose = serializers.ChoiceField(choices=sorted(uploads.PURPOSES))
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.CharField(max_length=100)
+    size = serializers.IntegerField(min_value=1)
+
+
+class UploadTicketSerializer(serializers.Serializer):
+    key = serializers.CharField()
+    url = serializers.URLField()
+    fields = serializers.DictField(child=serializers.CharField())
+    expires_in = serializers.IntegerField()
+
+
+class LeaderboardEntrySerializer(serializers.Serializer):
+    position = serializers.IntegerField()
+    donor_id = serializers.IntegerField()
+    full_name = serializers.CharField()
+    impact_points = serializers.IntegerField()
+    rank = serializers.CharField()
+
+
+class LeaderboardSerializer(serializers.Serializer):
+    results = LeaderboardEntrySerializer(many=True)
+    me = LeaderboardEntrySerializer(allow_null=True)
+
+
 class DonorBankDetailsSerializer(serializers.ModelSerializer):
     class Meta:
         model = base_models.DonorBankDetails
@@ -370,6 +552,32 @@ class HadithSerializer(serializers.ModelSerializer):
         fields = ("id", "text", "source", "created_at")
 
 
+class HomeNotificationsSerializer(serializers.Serializer):
+    unread_count = serializers.IntegerField()
+    results = NotificationSerializer(many=True)
+
+
+class HomeStatsSerializer(serializers.Serializer):
+    total_amount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    total_donations = serializers.IntegerField()
+    completed_donations = serializers.IntegerField()
+
+
+class HomeFeedSerializer(serializers.Serializer):
+    """Только для схемы OpenAPI: ответ собирается в services/home.py."""
+
+    categories = CategorySerializer(many=True, allow_null=True)
+    campaigns = serializers.ListField(
+        child=serializers.DictField(),
+        allow_null=True,
+        help_text="Карточки активных кампаний: поля CampaignSerializer без description и images.",
+    )
+    hadith = HadithSerializer(allow_null=True)
+    notifications = HomeNotificationsSerializer(required=False, allow_null=True)
+    stats = HomeStatsSerializer(required=False, allow_null=True)
+    errors = serializers.ListField(child=serializers.CharField())
+
+
 class FCMDeviceTokenSerializer(serializers.ModelSerializer):
     class Meta:
         model = base_models.FCMDeviceToken
@@ -422,3 +630,234 @@ class ContentReportSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("Organization does not exist.")
 
         return attrs
+
+
+# --------------------------------------------------
+# Values-based read serializers
+#
+# Быстрый путь для списков: строки берутся через QuerySet.values(), без
+# создания моделей и обхода полей DRF. Вывод совпадает с соответствующими
+# ModelSerializer (проверяется командой bench_serialization).
+# --------------------------------------------------
+
+_CENTS = Decimal("0.01")
+
+
+def _money(value):
+    return "{:f}".format(Decimal(value).quantize(_CENTS))
+
+
+def _date(value):
+    return value.isoformat() if value is not None else None
+
+
+def _datetime(value):
+    if value is None:
+        return None
+    value = value.astimezone(timezone.get_current_timezone()).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+# Значение-маркер: поле не выводится (как SkipField в DRF)
+SKIP = object()
+
+
+class ValuesListSerializer:
+    """
+    Минимальный аналог ListSerializer для строк из .values().
+
+    Наследники описывают поля в `field_sources` (имя поля -> колонки values(),
+    порядок = порядок вывода) и методы `get_<поле>(row)`. Параметр `fields`
+    ограничивает вывод, а columns_for() — список читаемых колонок.
+    """
+
+    field_sources = {}
+
+    def __init__(self, rows, context=None, fields=None):
+        self.rows = rows
+        self.context = context or {}
+        self.fields = self.field_names() if fields is None else list(fields)
+        self._getters = [(name, getattr(self, f"get_{name}")) for name in self.fields]
+        self._scheme_host = None
+
+    @classmethod
+    def field_names(cls):
+        return list(cls.field_sources)
+
+    @classmethod
+    def columns_for(cls, fields=None):
+        fields = cls.field_names() if fields is None else fields
+        columns = []
+        for name in fields:
+            for column in cls.field_sources[name]:
+                if column not in columns:
+                    columns.append(column)
+        return columns
+
+    def file_url(self, name):
+        if not name:
+            return None
+        url = default_storage.url(name)
+        request = self.context.get("request")
+        if request is None:
+            return url
+
+        # Частый случай build_absolute_uri (путь от корня) без повторного urlsplit
+        if url.startswith("/") and not url.startswith("//") and "/./" not in url and "/../" not in url:
+            if self._scheme_host is None:
+                self._scheme_host = request.build_absolute_uri("/")[:-1]
+            return self._scheme_host + iri_to_uri(url)
+        return request.build_absolute_uri(url)
+
+    def to_representation(self, row):
+        data = {}
+        for name, getter in self._getters:
+            value = getter(row)
+            if value is not SKIP:
+                data[name] = value
+        return data
+
+    @property
+    def data(self):
+        return [self.to_representation(row) for row in self.rows]
+
+
+class CampaignValuesSerializer(ValuesListSerializer):
+    """Аналог CampaignSerializer(many=True)."""
+
+    field_sources = {
+        "id": ("id",),
+        "title": ("title",),
+        "description": ("description",),
+        "goal_amount": ("goal_amount",),
+        "raised_amount": ("raised_amount",),
+        "donors_count": ("donors_count",),
+        "status": ("status",),
+        "start_date": ("start_date",),
+        "end_date": ("end_date",),
+        "organization": ("organization_id",),
+        "organization_name": ("organization__name",),
+        "category": ("category__slug",),
+        "category_slug": ("category_id", "category__slug"),
+        "category_name": ("category_id", "category__name"),
+        "image": ("image",),
+        "images": ("id",),
+        "created_at": ("created_at",),
+    }
+
+    def __init__(self, rows, context=None, fields=None):
+        super().__init__(list(rows), context, fields)
+        # Картинки читаются отдельным запросом и только если поле запрошено
+        self.images = self._load_images() if "images" in self.fields else {}
+
+    def _load_images(self):
+        images = {}
+        campaign_ids = [row["id"] for row in self.rows]
+        if not campaign_ids:
+            return images
+
+        for image in (
+            base_models.CampaignImage.objects.filter(campaign_id__in=campaign_ids)
+            .order_by("id")
+            .values("id", "campaign_id", "image", "created_at")
+        ):
+            images.setdefault(image["campaign_id"], []).append({
+                "id": image["id"],
+                "image": self.file_url(image["image"]),
+                "created_at": _datetime(image["created_at"]),
+            })
+        return images
+
+    def get_id(self, row):
+        return row["id"]
+
+    def get_title(self, row):
+        return row["title"]
+
+    def get_description(self, row):
+        return row["description"]
+
+    def get_goal_amount(self, row):
+        return _money(row["goal_amount"])
+
+    def get_raised_amount(self, row):
+        return _money(row["raised_amount"])
+
+    def get_donors_count(self, row):
+        return row["donors_count"]
+
+    def get_status(self, row):
+        return row["status"]
+
+    def get_start_date(self, row):
+        return _date(row["start_date"])
+
+    def get_end_date(self, row):
+        return _date(row["end_date"])
+
+    def get_organization(self, row):
+        return row["organization_id"]
+
+    def get_organization_name(self, row):
+        return row["organization__name"]
+
+    def get_category(self, row):
+        return row["category__slug"]
+
+    # Как в CampaignSerializer: без категории поля category_* не выводятся
+    def get_category_slug(self, row):
+        return row["category__slug"] if row["category_id"] is not None else SKIP
+
+    def get_category_name(self, row):
+        return row["category__name"] if row["category_id"] is not None else SKIP
+
+    def get_image(self, row):
+        return self.file_url(row["image"])
+
+    def get_images(self, row):
+        return self.images.get(row["id"], [])
+
+    def get_created_at(self, row):
+        return _datetime(row["created_at"])
+
+
+class DonationValuesSerializer(ValuesListSerializer):
+    """Аналог DonationSerializer(many=True)."""
+
+    field_sources = {
+        "id": ("id",),
+        "amount": ("amount",),
+        "status": ("status",),
+        "organization": ("organization_id",),
+        "organization_name": ("organization__name",),
+        "campaign": ("campaign_id",),
+        "campaign_title": ("campaign_id", "campaign__title"),
+        "created_at": ("created_at",),
+    }
+
+    def get_id(self, row):
+        return row["id"]
+
+    def get_amount(self, row):
+        return _money(row["amount"])
+
+    def get_status(self, row):
+        return row["status"]
+
+    def get_organization(self, row):
+        return row["organization_id"]
+
+    def get_organization_name(self, row):
+        return row["organization__name"]
+
+    def get_campaign(self, row):
+        return row["campaign_id"]
+
+    # Как в DonationSerializer: без кампании campaign_title не выводится
+    def get_campaign_title(self, row):
+        return row["campaign__title"] if row["campaign_id"] is not None else SKIP
+
+    def get_created_at(self, row):
+        return _datetime(row["created_at"])
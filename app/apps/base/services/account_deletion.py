@@ -0,0 +1,257 @@
+import logging
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, IntegerField
+
+from apps.accounts.models import DonorProfile, Organization, User
+from apps.base.models import (
+    Campaign,
+    CampaignImage,
+    ContentReport,
+    Donation,
+    DonationExport,
+    DonorBankDetails,
+    FCMDeviceToken,
+    Notification,
+    OrganizationDonorImpact,
+    OrganizationFollower,
+    Payment,
+    RecurringDonation,
+    Report,
+    ReportMedia,
+)
+from apps.base.services import home, leaderboard
+from apps.base.services.payments import _MONEY, _increment_case
+from apps.base.services.tasks import complete_in_transaction, enqueue
+
+logger = logging.getLogger(__name__)
+
+# Сколько строк удаляет одна задача (одна короткая транзакция)
+BATCH_SIZE = 1000
+
+_TASK_NAME = "apps.base.services.account_deletion.delete_account_batch"
+
+
+def request_account_deletion(user_id):
+    """
+    Удаление аккаунта из запроса: пользователь сразу деактивируется (токены
+    отозваны, push и регулярные донаты остановлены, кампании сняты с показа),
+    а данные удаляет фоновая задача пачками по BATCH_SIZE строк.
+    """
+    with transaction.atomic():
+        # update() пользователей сам отзывает токены (UserQuerySet)
+        User.objects.filter(pk=user_id).update(is_active=False)
+        FCMDeviceToken.objects.filter(user_id=user_id).update(is_active=False)
+        RecurringDonation.objects.filter(donor_id=user_id).update(is_active=False)
+        paused = Campaign.objects.filter(
+            organization__user_id=user_id,
+            status=Campaign.Status.ACTIVE,
+        ).update(status=Campaign.Status.PAUSED)
+
+        if paused:
+            transaction.on_commit(lambda: home.invalidate("campaigns"))
+
+        enqueue(_TASK_NAME, {"user_id": user_id})
+
+
+def _delete_files(storage, names):
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception as e:
+            # Осиротевший файл не должен ронять удаление аккаунта
+            logger.warning("Failed to delete file %s: %s", name, e)
+
+
+def _delete_files_on_commit(model, field, names):
+    """Файлы удаляются через хранилище самого поля (выгрузки — в закрытом)."""
+    names = [name for name in names if name]
+    if names:
+        storage = model._meta.get_field(field).storage
+        transaction.on_commit(lambda: _delete_files(storage, names))
+
+
+def _delete_rows(queryset, file_fields=()) -> int:
+    """Одна пачка строк queryset (и их файлы после коммита)."""
+    rows = list(queryset.order_by("pk").values("pk", *file_fields)[:BATCH_SIZE])
+    if not rows:
+        return 0
+
+    queryset.model.objects.filter(pk__in=[r["pk"] for r in rows]).delete()
+
+    for field in file_fields:
+        _delete_files_on_commit(queryset.model, field, [r[field] for r in rows])
+    return len(rows)
+
+
+def _delete_donations(user_id) -> int:
+    """
+    Пачка донатов донора. Завершённые донаты вычитаются из raised_amount
+    кампаний и total_raised организаций; donors_count уменьшается, когда у
+    донора в кампании не остаётся завершённых донатов.
+    """
+    # Блокировка: дельты считаются только по строкам, которые удалит эта пачка
+    rows = list(
+        Donation.objects.filter(donor_id=user_id)
+        .select_for_update(of=("self",))
+        .order_by("pk")
+        .values("pk", "status", "amount", "campaign_id", "organization_id")[:BATCH_SIZE]
+    )
+    if not rows:
+        return 0
+
+    donation_ids = [r["pk"] for r in rows]
+    Payment.objects.filter(donation_id__in=donation_ids).delete()
+    Donation.objects.filter(pk__in=donation_ids).delete()
+
+    campaign_totals = defaultdict(Decimal)
+    organization_totals = defaultdict(Decimal)
+    for r in rows:
+        if r["status"] != Donation.Status.COMPLETED:
+            continue
+        if r["campaign_id"]:
+            campaign_totals[r["campaign_id"]] -= r["amount"]
+        organization_totals[r["organization_id"]] -= r["amount"]
+
+    if campaign_totals:
+        still_donor = set(
+            Donation.objects.filter(
+                donor_id=user_id,
+                campaign_id__in=campaign_totals,
+                status=Donation.Status.COMPLETED,
+            ).values_list("campaign_id", flat=True)
+        )
+        gone_donors = {c: -1 for c in campaign_totals if c not in still_donor}
+        Campaign.objects.filter(id__in=campaign_totals).update(
+            raised_amount=F("raised_amount") + _increment_case(campaign_totals, _MONEY),
+            donors_count=F("donors_count") + _increment_case(gone_donors, IntegerField()),
+        )
+    if organization_totals:
+        Organization.objects.filter(id__in=organization_totals).update(
+            total_raised=F("total_raised") + _increment_case(organization_totals, _MONEY),
+        )
+    return len(rows)
+
+
+def _delete_organization_donations(organization_id) -> int:
+    """
+    Пачка донатов других доноров в удаляемую организацию. Очки влияния за
+    завершённые донаты вычитаются у доноров в той же транзакции, иначе
+    лидерборд и ранги продолжали бы учитывать удалённые донаты.
+    """
+    rows = list(
+        Donation.objects.filter(organization_id=organization_id)
+        .select_for_update(of=("self",))
+        .order_by("pk")
+        .values("pk", "status", "donor_id", "amount")[:BATCH_SIZE]
+    )
+    if not rows:
+        return 0
+
+    Donation.objects.filter(pk__in=[r["pk"] for r in rows]).delete()
+    leaderboard.revoke_impact(
+        (r["donor_id"], organization_id, r["amount"])
+        for r in rows
+        if r["status"] == Donation.Status.COMPLETED
+    )
+    return len(rows)
+
+
+def _delete_donor_impacts(user_id) -> int:
+    """Пачка очков донора по организациям; из их лидербордов донор тоже убирается."""
+    rows = list(
+        OrganizationDonorImpact.objects.filter(donor_id=user_id)
+        .order_by("pk")
+        .values_list("pk", "organization_id")[:BATCH_SIZE]
+    )
+    if not rows:
+        return 0
+
+    OrganizationDonorImpact.objects.filter(pk__in=[pk for pk, _ in rows]).delete()
+    leaderboard.forget_donor(user_id, [organization_id for _, organization_id in rows])
+    return len(rows)
+
+
+def _steps(user_id, organization_id):
+    """
+    Порядок важен: сначала зависимые строки, потом то, на что они ссылаются,
+    чтобы каскад Django при удалении каждой пачки ничего не находил.
+    """
+    yield lambda: _delete_rows(Notification.objects.filter(user_id=user_id))
+    yield lambda: _delete_rows(FCMDeviceToken.objects.filter(user_id=user_id))
+    yield lambda: _delete_rows(OrganizationFollower.objects.filter(user_id=user_id))
+    yield lambda: _delete_rows(ContentReport.objects.filter(user_id=user_id))
+    yield lambda: _delete_rows(RecurringDonation.objects.filter(donor_id=user_id))
+    yield lambda: _delete_donor_impacts(user_id)
+    yield lambda: _delete_rows(DonorBankDetails.objects.filter(donor_id=user_id))
+    yield lambda: _delete_donations(user_id)
+
+    if organization_id is None:
+        return
+
+    yield lambda: _delete_rows(
+        ReportMedia.objects.filter(report__organization_id=organization_id), ("file",)
+    )
+    yield lambda: _delete_rows(Report.objects.filter(organization_id=organization_id), ("file",))
+    yield lambda: _delete_rows(
+        CampaignImage.objects.filter(campaign__organization_id=organization_id), ("image",)
+    )
+    # Донаты других доноров в организацию (как и раньше, уходят вместе с ней)
+    yield lambda: _delete_rows(
+        Payment.objects.filter(donation__organization_id=organization_id)
+    )
+    yield lambda: _delete_organization_donations(organization_id)
+    yield lambda: _delete_rows(RecurringDonation.objects.filter(organization_id=organization_id))
+    yield lambda: _delete_rows(
+        OrganizationDonorImpact.objects.filter(organization_id=organization_id)
+    )
+    yield lambda: _delete_rows(OrganizationFollower.objects.filter(organization_id=organization_id))
+    yield lambda: _delete_rows(
+        DonationExport.objects.filter(organization_id=organization_id), ("file",)
+    )
+    yield lambda: _delete_rows(Campaign.objects.filter(organization_id=organization_id), ("image",))
+
+
+def _delete_user(user_id):
+    avatars = list(DonorProfile.objects.filter(user_id=user_id).values_list("avatar", flat=True))
+    logos = list(Organization.objects.filter(user_id=user_id).values_list("logo", flat=True))
+    # Зависимых строк уже нет: каскад удаляет только профиль и организацию
+    User.objects.filter(pk=user_id).delete()
+    _delete_files_on_commit(DonorProfile, "avatar", avatars)
+    _delete_files_on_commit(Organization, "logo", logos)
+
+
+def delete_account_batch(user_id, step=0):
+    """
+    Фоновая задача: одна пачка одного вида данных за запуск, затем задача
+    ставит себя заново с номером текущего шага. Когда зависимых строк не
+    осталось — удаляется сам пользователь с профилем, организацией и файлами.
+
+    Пачка, следующий шаг и отметка о выполнении коммитятся вместе
+    (complete_in_transaction): повторно забранная после падения воркера
+    задача не запустит вторую цепочку шагов.
+    """
+    organization_id = (
+        Organization.objects.filter(user_id=user_id).values_list("id", flat=True).first()
+    )
+    steps = list(_steps(user_id, organization_id))
+
+    with transaction.atomic():
+        if not complete_in_transaction():
+            logger.info("Account %s deletion step %s already done", user_id, step)
+            return
+
+        for index in range(step, len(steps)):
+            if steps[index]():
+                enqueue(_TASK_NAME, {"user_id": user_id, "step": index})
+                return
+
+        _delete_user(user_id)
+        leaderboard.forget_donor(user_id)
+        if organization_id is not None:
+            leaderboard.forget_organization(organization_id)
+            transaction.on_commit(lambda: home.invalidate("campaigns"))
+
+    logger.info("Account %s deleted", user_id)
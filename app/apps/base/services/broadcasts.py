@@ -0,0 +1,107 @@
+import logging
+
+from django.db import transaction
+
+from apps.base.models import FCMDeviceToken, Notification, OrganizationFollower
+from apps.base.services import realtime
+from apps.base.services.tasks import complete_in_transaction, enqueue, enqueue_many
+
+logger = logging.getLogger(__name__)
+
+# Сколько подписчиков обрабатывает одна задача (одна транзакция)
+FOLLOWERS_CHUNK_SIZE = 5000
+NOTIFICATIONS_BATCH_SIZE = 1000
+# Лимит FCM multicast — 500 токенов на запрос
+PUSH_TOKENS_CHUNK_SIZE = 500
+
+
+def broadcast_to_followers(organization_id, title, message, data=None):
+    """
+    Рассылка всем подписчикам организации. В запросе только ставится задача,
+    уведомления создаёт воркер (deliver_broadcast).
+    """
+    return enqueue(
+        "apps.base.services.broadcasts.deliver_broadcast",
+        {
+            "organization_id": organization_id,
+            "title": title,
+            "message": message,
+            "data": {k: str(v) for k, v in (data or {}).items()},
+        },
+    )
+
+
+def deliver_broadcast(organization_id, title, message, data=None, after_id=0):
+    """
+    Фоновая задача: одна пачка подписчиков (id > after_id) за запуск.
+
+    В одной транзакции создаются уведомления пачки, задачи на push, задача
+    на следующую пачку и отметка о выполнении этой задачи
+    (complete_in_transaction): если воркер упал после коммита, задачу
+    заберут заново, но пачка не задвоится. 100k подписчиков при этом не
+    превращаются в одну длинную транзакцию.
+    """
+    followers = list(
+        OrganizationFollower.objects.filter(organization_id=organization_id, id__gt=after_id)
+        .order_by("id")
+        .values_list("id", "user_id")[:FOLLOWERS_CHUNK_SIZE]
+    )
+    if not followers:
+        return
+
+    user_ids = [user_id for _, user_id in followers]
+    tokens = list(
+        FCMDeviceToken.objects.filter(user_id__in=user_ids, is_active=True)
+        .order_by("id")
+        .values_list("token", flat=True)
+    )
+
+    with transaction.atomic():
+        if not complete_in_transaction():
+            logger.info("Broadcast chunk after %s already delivered", after_id)
+            return
+
+        notifications = Notification.objects.bulk_create(
+            [Notification(user_id=user_id, title=title, message=message) for user_id in user_ids],
+            batch_size=NOTIFICATIONS_BATCH_SIZE,
+        )
+        transaction.on_commit(lambda: realtime.publish_notifications(notifications))
+
+        enqueue_many(
+            "apps.base.services.broadcasts.send_broadcast_push",
+            [
+                {
+                    "tokens": tokens[i:i + PUSH_TOKENS_CHUNK_SIZE],
+                    "title": title,
+                    "message": message,
+                    "data": data,
+                }
+                for i in range(0, len(tokens), PUSH_TOKENS_CHUNK_SIZE)
+            ],
+        )
+
+        if len(followers) == FOLLOWERS_CHUNK_SIZE:
+            enqueue(
+                "apps.base.services.broadcasts.deliver_broadcast",
+                {
+                    "organization_id": organization_id,
+                    "title": title,
+                    "message": message,
+                    "data": data,
+                    "after_id": followers[-1][0],
+                },
+            )
+
+    logger.info(
+        "Broadcast for organization %s: %s notifications, %s push tokens",
+        organization_id,
+        len(user_ids),
+        len(tokens),
+    )
+
+
+def send_broadcast_push(tokens, title, message, data=None):
+    """Фоновая задача: один multicast-запрос FCM (до 500 токенов)."""
+    from apps.base.utils.fcm import send_push_notification
+
+    send_push_notification(tokens, title, message, data)
@@ -0,0 +1,98 @@
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.base.models import Campaign
+from apps.base.services import home
+from apps.base.utils.notifications import bulk_create_notifications
+
+logger = logging.getLogger(__name__)
+
+# Сколько кампаний закрывается в одной транзакции
+SWEEP_CHUNK_SIZE = 500
+# Сколько названий кампаний перечислять в уведомлении
+TITLES_IN_MESSAGE = 5
+
+
+def _finished_filter(today):
+    return Q(end_date__lt=today) | Q(raised_amount__gte=F("goal_amount"))
+
+
+def _notification_messages(rows):
+    by_organization = defaultdict(list)
+    for r in rows:
+        by_organization[r["organization__user_id"]].append(r)
+
+    messages = []
+    for user_id, campaigns in by_organization.items():
+        titles = ", ".join(f"«{c['title']}»" for c in campaigns[:TITLES_IN_MESSAGE])
+        if len(campaigns) > TITLES_IN_MESSAGE:
+            titles += f" и ещё {len(campaigns) - TITLES_IN_MESSAGE}"
+
+        if len(campaigns) == 1:
+            title = "Кампания завершена"
+            message = f"Кампания {titles} завершена: достигнута цель или истёк срок сбора."
+        else:
+            title = "Кампании завершены"
+            message = f"Завершено кампаний: {len(campaigns)} — {titles}."
+
+        messages.append({
+            "user_id": user_id,
+            "title": title,
+            "message": message,
+            "data": {
+                "type": "campaigns_completed",
+                "campaign_ids": ",".join(str(c["id"]) for c in campaigns),
+            },
+        })
+    return messages
+
+
+@transaction.atomic
+def _sweep_chunk(today, chunk_size, after_id):
+    # SKIP LOCKED: кампании, которые сейчас обновляет платёж или организация,
+    # заберёт следующий проход
+    rows = list(
+        Campaign.objects.select_for_update(skip_locked=True, of=("self",))
+        .filter(_finished_filter(today), status=Campaign.Status.ACTIVE, id__gt=after_id)
+        .order_by("id")
+        .values("id", "title", "organization__user_id")[:chunk_size]
+    )
+    if not rows:
+        return []
+
+    Campaign.objects.filter(id__in=[r["id"] for r in rows], status=Campaign.Status.ACTIVE).update(
+        status=Campaign.Status.COMPLETED,
+    )
+
+    messages = _notification_messages(rows)
+    transaction.on_commit(lambda: bulk_create_notifications(messages))
+    return rows
+
+
+def sweep_campaigns(chunk_size=SWEEP_CHUNK_SIZE, today=None) -> int:
+    """
+    Переводит в COMPLETED активные кампании, у которых истёк end_date или
+    собрана вся сумма. Работает пачками по chunk_size в отдельных коротких
+    транзакциях; организации получают одно уведомление на пачку.
+
+    Возвращает число закрытых кампаний.
+    """
+    today = today or timezone.localdate()
+    completed = 0
+    after_id = 0
+
+    while True:
+        rows = _sweep_chunk(today, chunk_size, after_id)
+        if not rows:
+            break
+        completed += len(rows)
+        after_id = rows[-1]["id"]
+
+    if completed:
+        home.invalidate("campaigns")
+        logger.info("Campaign sweep: %s campaigns completed", completed)
+    return completed
@@ -0,0 +1,235 @@
+import contextvars
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import Count, Q, Sum
+
+from apps.base import models as base_models
+from apps.base import serializers as base_serializers
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_SECTIONS = ("categories", "campaigns", "hadith")
+PRIVATE_SECTIONS = ("notifications", "stats")
+SECTIONS = PUBLIC_SECTIONS + PRIVATE_SECTIONS
+
+# Поля карточки кампании в ленте (без description и images)
+CAMPAIGN_CARD_FIELDS = (
+    "id",
+    "title",
+    "image",
+    "goal_amount",
+    "raised_amount",
+    "donors_count",
+    "end_date",
+    "organization",
+    "organization_name",
+    "category_slug",
+)
+CAMPAIGNS_LIMIT = 10
+NOTIFICATIONS_LIMIT = 10
+
+_executor = None
+# Свободные потоки пула: секция, не уложившаяся в таймаут, держит поток до
+# конца, и новые секции не должны вставать за ней в очередь
+_slots = None
+
+
+def _get_executor():
+    global _executor, _slots
+    if _executor is None:
+        _slots = threading.BoundedSemaphore(settings.HOME_FEED_WORKERS)
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.HOME_FEED_WORKERS,
+            thread_name_prefix="home-feed",
+        )
+    return _executor
+
+
+def _ttl(section):
+    return settings.HOME_FEED_CACHE_TTLS.get(section, 60)
+
+
+def _version_key(section):
+    return f"home:{section}:version"
+
+
+def section_version(section) -> int:
+    version = cache.get(_version_key(section))
+    if version is None:
+        cache.add(_version_key(section), 1, timeout=None)
+        version = cache.get(_version_key(section), 1)
+    return version
+
+
+def invalidate(*sections):
+    """Сбрасывает кэш публичных секций (старые ключи просто истекут по TTL)."""
+    for section in sections or PUBLIC_SECTIONS:
+        try:
+            cache.incr(_version_key(section))
+        except ValueError:
+            cache.add(_version_key(section), 1, timeout=None)
+
+
+def _cached(section, suffix, builder):
+    key = f"home:{section}:v{section_version(section)}:{suffix}"
+    data = cache.get(key)
+    if data is None:
+        data = builder()
+        cache.set(key, data, _ttl(section))
+    return data
+
+
+def _categories(context):
+    def build():
+        categories = base_models.Category.objects.order_by("name")
+        return base_serializers.CategorySerializer(categories, many=True).data
+
+    return _cached("categories", "all", build)
+
+
+def _campaigns(context):
+    request = context["request"]
+
+    def build():
+        fields = list(CAMPAIGN_CARD_FIELDS)
+        serializer_class = base_serializers.CampaignValuesSerializer
+        rows = (
+            base_models.Campaign.objects.filter(status=base_models.Campaign.Status.ACTIVE)
+            .order_by("-created_at")
+            .values(*serializer_class.columns_for(fields))[:CAMPAIGNS_LIMIT]
+        )
+        return serializer_class(rows, context=context, fields=fields).data
+
+    # Ссылки на картинки абсолютные, поэтому хост входит в ключ
+    return _cached("campaigns", request.build_absolute_uri("/"), build)
+
+
+def _hadith(context):
+    # Кэшируется только список id, сам хадис выбирается случайно на каждый запрос
+    ids = _cached(
+        "hadith",
+        "ids",
+        lambda: list(base_models.Hadith.objects.values_list("id", flat=True)),
+    )
+    if not ids:
+        return None
+
+    hadith_id = random.choice(ids)
+    return _cached(
+        "hadith",
+        f"item:{hadith_id}",
+        lambda: base_serializers.HadithSerializer(
+            base_models.Hadith.objects.filter(id=hadith_id).first()
+        ).data,
+    )
+
+
+def _notifications(context):
+    qs = base_models.Notification.objects.filter(user_id=context["user_id"])
+    return {
+        "unread_count": qs.filter(is_read=False).count(),
+        "results": base_serializers.NotificationSerializer(
+            qs.order_by("-created_at")[:NOTIFICATIONS_LIMIT], many=True
+        ).data,
+    }
+
+
+def _stats(context):
+    totals = base_models.Donation.objects.filter(
+        donor_id=context["user_id"]
+    ).aggregate(
+        total_amount=Sum("amount"),
+        total_donations=Count("id"),
+        completed_donations=Count("id", filter=Q(status=base_models.Donation.Status.COMPLETED)),
+    )
+    totals["total_amount"] = totals["total_amount"] or 0
+    return totals
+
+
+_BUILDERS = {
+    "categories": _categories,
+    "campaigns": _campaigns,
+    "hadith": _hadith,
+    "notifications": _notifications,
+    "stats": _stats,
+}
+
+
+def _run_section(name, context):
+    # У потока пула своё соединение с БД; оно переиспользуется между запросами
+    # и закрывается по CONN_MAX_AGE / при обрыве, как в обычном воркере
+    close_old_connections()
+    return _BUILDERS[name](context)
+
+
+def _submit(name, context):
+    """
+    Секция в пул, если в нём есть свободный поток, иначе None. Секция
+    выполняется в копии contextvars запроса (чтение с реплики и т.п.).
+    """
+    executor = _get_executor()
+    if not _slots.acquire(blocking=False):
+        return None
+    try:
+        future = executor.submit(contextvars.copy_context().run, _run_section, name, context)
+    except BaseException:
+        _slots.release()
+        raise
+    # Поток освобождается по завершении секции или по её отмене
+    future.add_done_callback(lambda future: _slots.release())
+    return future
+
+
+def available_sections(user):
+    sections = list(PUBLIC_SECTIONS)
+    if user.is_authenticated:
+        sections.append("notifications")
+        if user.role == "donor":
+            sections.append("stats")
+    return sections
+
+
+def build_home(context, sections) -> dict:
+    """
+    context: контекст сериализаторов + "user_id" (пользователь берётся
+    заранее, в потоках request.user не трогаем).
+
+    Собирает ленту главного экрана. Секции выполняются параллельно в пуле
+    потоков с общим сроком HOME_FEED_SECTION_TIMEOUT; упавшая или не
+    успевшая секция возвращается как null и попадает в "errors", остальные
+    отдаются как обычно.
+    """
+    futures = {}
+    if settings.HOME_FEED_WORKERS > 1:
+        deadline = time.monotonic() + settings.HOME_FEED_SECTION_TIMEOUT
+        futures = {name: _submit(name, context) for name in sections}
+
+    data, errors = {}, []
+    for name in sections:
+        future = futures.get(name)
+        try:
+            if future is None:
+                # Без пула (HOME_FEED_WORKERS <= 1) или когда все его потоки
+                # заняты — секция считается в текущем потоке
+                data[name] = _BUILDERS[name](context)
+            else:
+                data[name] = future.result(timeout=max(deadline - time.monotonic(), 0))
+        except Exception:
+            logger.exception("Home feed section %s failed", name)
+            data[name] = None
+            errors.append(name)
+
+    # Не начатые к сроку секции не выполняем
+    for future in futures.values():
+        if future is not None:
+            future.cancel()
+
+    data["errors"] = errors
+    return data
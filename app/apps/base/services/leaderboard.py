@@ -0,0 +1,325 @@
+from bisect import bisect_right
+from collections import defaultdict
+from decimal import Decimal
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+
+from apps.accounts.models import DonorProfile
+from apps.base.cache import RedisCache
+from apps.base.models import OrganizationDonorImpact
+
+
+# 1 очко за каждые 100 сом, но не меньше 1 очка за завершённый донат
+POINTS_UNIT = Decimal("100")
+
+# (порог очков, название ранга) — по возрастанию порога
+RANK_TIERS = (
+    (1, "Новичок"),
+    (50, "Участник"),
+    (200, "Благотворитель"),
+    (1000, "Меценат"),
+    (5000, "Легенда"),
+)
+_TIER_THRESHOLDS = [threshold for threshold, _ in RANK_TIERS]
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+
+# Индекс позиций в Redis: sorted set «донор -> очки» на общий лидерборд и на
+# каждую организацию. Читается, только когда полностью построен (rebuild_index)
+_INDEX_READY_KEY = "leaderboard:index:ready"
+INDEX_CHUNK_SIZE = 1000
+
+
+def points_for_amount(amount) -> int:
+    return max(1, int(Decimal(amount) // POINTS_UNIT))
+
+
+def rank_for_points(points: int) -> str:
+    idx = bisect_right(_TIER_THRESHOLDS, points)
+    return RANK_TIERS[idx - 1][1] if idx else ""
+
+
+def _rank_after_increment(points: int) -> Case:
+    """
+    Ранг после прибавки `points` очков, вычисленный в том же UPDATE:
+    в SET-выражениях impact_points ещё содержит старое значение.
+    """
+    whens = [
+        When(impact_points__gte=threshold - points, then=Value(name))
+        for threshold, name in reversed(RANK_TIERS)
+    ]
+    return Case(*whens, default=Value(""))
+
+
+def _points_by_donor(entries, sign=1):
+    per_donor = defaultdict(int)
+    per_pair = defaultdict(int)
+    for donor_id, organization_id, amount in entries:
+        points = sign * points_for_amount(amount)
+        per_donor[donor_id] += points
+        per_pair[(organization_id, donor_id)] += points
+    return per_donor, per_pair
+
+
+def _increment_points(per_donor, per_pair):
+    """UPDATE ... SET points = points + N, сгруппированные по величине прибавки."""
+    donors_by_points = defaultdict(list)
+    for donor_id, points in per_donor.items():
+        donors_by_points[points].append(donor_id)
+
+    for points, donor_ids in donors_by_points.items():
+        DonorProfile.objects.filter(user_id__in=donor_ids).update(
+            rank=_rank_after_increment(points),
+            impact_points=F("impact_points") + points,
+        )
+
+    pairs_by_points = defaultdict(lambda: defaultdict(list))
+    for (org_id, donor_id), points in per_pair.items():
+        pairs_by_points[points][org_id].append(donor_id)
+
+    for points, by_org in pairs_by_points.items():
+        for org_id, donor_ids in by_org.items():
+            OrganizationDonorImpact.objects.filter(
+                organization_id=org_id,
+                donor_id__in=donor_ids,
+            ).update(impact_points=F("impact_points") + points)
+
+    if _index() is not None:
+        donor_ids, pairs = list(per_donor), list(per_pair)
+        transaction.on_commit(lambda: _sync_index(donor_ids, pairs), robust=True)
+
+
+def _index():
+    """Кэш с индексом позиций или None: без Redis позиции считаются в БД."""
+    backend = caches["default"]
+    return backend if isinstance(backend, RedisCache) else None
+
+
+def _index_key(organization_id=None):
+    if organization_id is None:
+        return "leaderboard:index:all"
+    return f"leaderboard:index:org:{organization_id}"
+
+
+def _sync_index(donor_ids, pairs):
+    """
+    Записывает в индекс текущие (после коммита) очки доноров — абсолютные
+    значения, поэтому повтор или порядок вызовов ничего не портит.
+    """
+    index = _index()
+    index.sorted_set_add(
+        _index_key(),
+        dict(
+            DonorProfile.objects.filter(user_id__in=donor_ids)
+            .values_list("user_id", "impact_points")
+        ),
+    )
+
+    pairs = set(pairs)
+    by_org = defaultdict(dict)
+    for org_id, donor_id, points in OrganizationDonorImpact.objects.filter(
+        organization_id__in={org_id for org_id, _ in pairs},
+        donor_id__in={donor_id for _, donor_id in pairs},
+    ).values_list("organization_id", "donor_id", "impact_points"):
+        if (org_id, donor_id) in pairs:
+            by_org[org_id][donor_id] = points
+    for org_id, points_by_donor in by_org.items():
+        index.sorted_set_add(_index_key(org_id), points_by_donor)
+
+
+def _fill_index(index, key, rows):
+    index.delete(key)
+    chunk = {}
+    for donor_id, points in rows:
+        chunk[donor_id] = points
+        if len(chunk) >= INDEX_CHUNK_SIZE:
+            index.sorted_set_add(key, chunk)
+            chunk = {}
+    index.sorted_set_add(key, chunk)
+
+
+def rebuild_index():
+    """
+    Строит индекс позиций заново из БД (первое заполнение, после потери
+    данных Redis или правки очков в админке). Пока идёт сборка, позиции
+    считаются в БД. Возвращает число организаций с очками, без Redis — None.
+    """
+    index = _index()
+    if index is None:
+        return None
+
+    index.delete(_INDEX_READY_KEY)
+    _fill_index(
+        index,
+        _index_key(),
+        DonorProfile.objects.filter(impact_points__gt=0)
+        .values_list("user_id", "impact_points")
+        .iterator(chunk_size=INDEX_CHUNK_SIZE),
+    )
+
+    organization_ids = list(
+        OrganizationDonorImpact.objects.filter(impact_points__gt=0)
+        .values_list("organization_id", flat=True)
+        .distinct()
+    )
+    for org_id in organization_ids:
+        _fill_index(
+            index,
+            _index_key(org_id),
+            OrganizationDonorImpact.objects.filter(organization_id=org_id, impact_points__gt=0)
+            .values_list("donor_id", "impact_points")
+            .iterator(chunk_size=INDEX_CHUNK_SIZE),
+        )
+
+    index.set(_INDEX_READY_KEY, True, timeout=None)
+    return len(organization_ids)
+
+
+def forget_donor(donor_id, organization_ids=None):
+    """
+    Убирает донора из индекса после коммита: из лидербордов organization_ids,
+    а без них — из общего (удаление аккаунта).
+    """
+    if _index() is None:
+        return
+
+    keys = (
+        [_index_key()]
+        if organization_ids is None
+        else [_index_key(org_id) for org_id in set(organization_ids)]
+    )
+
+    def forget():
+        for key in keys:
+            _index().sorted_set_remove(key, [donor_id])
+
+    transaction.on_commit(forget, robust=True)
+
+
+def forget_organization(organization_id):
+    if _index() is not None:
+        transaction.on_commit(lambda: _index().delete(_index_key(organization_id)), robust=True)
+
+
+def apply_impact(entries):
+    """
+    Инкрементально начисляет очки за завершённые донаты.
+
+    entries: iterable of (donor_id, organization_id, amount).
+    Пересуммирования донатов нет — только UPDATE ... SET points = points + N,
+    сгруппированные по величине прибавки.
+    """
+    per_donor, per_pair = _points_by_donor(entries)
+    if not per_donor:
+        return
+
+    DonorProfile.objects.bulk_create(
+        [DonorProfile(user_id=donor_id) for donor_id in per_donor],
+        ignore_conflicts=True,
+    )
+    OrganizationDonorImpact.objects.bulk_create(
+        [
+            OrganizationDonorImpact(organization_id=org_id, donor_id=donor_id)
+            for org_id, donor_id in per_pair
+        ],
+        ignore_conflicts=True,
+    )
+    _increment_points(per_donor, per_pair)
+
+
+def revoke_impact(entries):
+    """
+    Обратное apply_impact: вычитает очки (и пересчитывает ранг) за удалённые
+    завершённые донаты. entries — как у apply_impact.
+    """
+    per_donor, per_pair = _points_by_donor(entries, sign=-1)
+    if per_donor:
+        _increment_points(per_donor, per_pair)
+
+
+def apply_donation_impact(donation):
+    apply_impact([(donation.donor_id, donation.organization_id, donation.amount)])
+
+
+def _name_field(organization_id):
+    return "donor__full_name" if organization_id is not None else "user__full_name"
+
+
+def _leaderboard_qs(organization_id=None):
+    if organization_id is not None:
+        return OrganizationDonorImpact.objects.filter(
+            organization_id=organization_id,
+            impact_points__gt=0,
+        )
+    return DonorProfile.objects.filter(impact_points__gt=0)
+
+
+def _donor_field(organization_id):
+    return "donor_id" if organization_id is not None else "user_id"
+
+
+def top_donors(limit=DEFAULT_LIMIT, organization_id=None):
+    """
+    Top-N по индексу (impact_points DESC, id).
+    Позиция — «спортивная»: при равных очках позиция одна.
+    """
+    rows = (
+        _leaderboard_qs(organization_id)
+        .order_by("-impact_points", "id")
+        .values_list(
+            _donor_field(organization_id),
+            _name_field(organization_id),
+            "impact_points",
+        )[:limit]
+    )
+
+    results = []
+    position = 0
+    previous_points = None
+    for idx, (donor_id, full_name, points) in enumerate(rows, start=1):
+        if points != previous_points:
+            position = idx
+            previous_points = points
+        results.append({
+            "position": position,
+            "donor_id": donor_id,
+            "full_name": full_name,
+            "impact_points": points,
+            "rank": rank_for_points(points),
+        })
+    return results
+
+
+def _count_above(qs, points, organization_id):
+    index = _index()
+    if index is not None and index.get(_INDEX_READY_KEY):
+        return index.sorted_set_count_above(_index_key(organization_id), points)
+    return qs.filter(impact_points__gt=points).count()
+
+
+def donor_position(donor_id, organization_id=None):
+    """
+    Позиция донора: 1 + количество доноров с большим числом очков. С Redis —
+    ZCOUNT по индексу позиций (O(log N)), без него — подсчёт по диапазону
+    индекса БД (растёт с позицией).
+    """
+    qs = _leaderboard_qs(organization_id)
+    row = (
+        qs.filter(**{_donor_field(organization_id): donor_id})
+        .values_list("impact_points", _name_field(organization_id))
+        .first()
+    )
+    if not row:
+        return None
+
+    points, full_name = row
+    return {
+        "position": _count_above(qs, points, organization_id) + 1,
+        "donor_id": donor_id,
+        "full_name": full_name,
+        "impact_points": points,
+        "rank": rank_for_points(points),
+    }
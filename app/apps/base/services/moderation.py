@@ -0,0 +1,175 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Min
+from django.utils import timezone
+
+from apps.base.models import ContentReport, ModerationQueueItem
+from apps.base.services.tasks import enqueue
+
+logger = logging.getLogger(__name__)
+
+_DIGEST_SCHEDULED_KEY = "moderation:digest_scheduled"
+_TASK_NAME = "apps.base.services.moderation.send_moderation_digest"
+_EMAIL_TASK_NAME = "apps.base.services.moderation.send_digest_email"
+
+# Сколько объектов и причин жалоб перечислять в одном письме
+DIGEST_MAX_ITEMS = 100
+REASONS_PER_ITEM = 3
+
+
+def _increment(report):
+    return ModerationQueueItem.objects.filter(
+        content_type=report.content_type,
+        content_id=report.content_id,
+    ).update(
+        reports_count=F("reports_count") + 1,
+        pending_count=F("pending_count") + 1,
+        last_reported_at=report.created_at,
+        # Новая жалоба возвращает рассмотренный объект в очередь
+        status=ModerationQueueItem.Status.OPEN,
+    )
+
+
+def record_report(report):
+    """
+    Учитывает жалобу в очереди модерации и планирует дайджест. Письмо
+    в запросе не отправляется: жалобы за окно MODERATION_DIGEST_WINDOW
+    уходят одним сообщением.
+    """
+    if not _increment(report):
+        try:
+            with transaction.atomic():
+                ModerationQueueItem.objects.create(
+                    content_type=report.content_type,
+                    content_id=report.content_id,
+                    reports_count=1,
+                    pending_count=1,
+                    first_reported_at=report.created_at,
+                    last_reported_at=report.created_at,
+                )
+        except IntegrityError:
+            # Первую жалобу на объект одновременно создал другой запрос
+            _increment(report)
+
+    transaction.on_commit(schedule_digest)
+
+
+def schedule_digest():
+    """Одна задача дайджеста на окно, сколько бы жалоб ни пришло."""
+    window = settings.MODERATION_DIGEST_WINDOW
+    if cache.add(_DIGEST_SCHEDULED_KEY, 1, timeout=window):
+        enqueue(_TASK_NAME, run_after=timezone.now() + timedelta(seconds=window))
+
+
+def _recent_reasons(item):
+    return list(
+        ContentReport.objects.filter(
+            content_type=item.content_type,
+            content_id=item.content_id,
+        )
+        .order_by("-created_at")
+        .values_list("reason", flat=True)[:REASONS_PER_ITEM]
+    )
+
+
+def _digest_message(items, more):
+    lines = ["Новые жалобы на контент:", ""]
+    for item in items:
+        lines.append(
+            f"{item.get_content_type_display()} #{item.content_id}: "
+            f"новых {item.pending_count}, всего {item.reports_count}"
+        )
+        for reason in _recent_reasons(item):
+            lines.append(f"  — {reason[:200]}")
+        lines.append("")
+    if more:
+        lines.append(f"И ещё объектов: {more}.")
+    lines.append("Очередь модерации: /admin/base/moderationqueueitem/")
+    return "\n".join(lines)
+
+
+def send_moderation_digest():
+    """
+    Фоновая задача: одно письмо по всем объектам с новыми жалобами.
+    Сброс счётчиков и постановка письма в очередь — одна транзакция;
+    само письмо отправляет отдельная задача уже после коммита, и при
+    недоступном SMTP её повторяет очередь задач.
+    """
+    if not settings.MODERATION_EMAILS:
+        logger.warning("MODERATION_EMAILS is empty, moderation digest skipped")
+        return
+
+    with transaction.atomic():
+        pending = ModerationQueueItem.objects.select_for_update(skip_locked=True).filter(
+            pending_count__gt=0,
+        )
+        items = list(pending.order_by("-pending_count", "id")[:DIGEST_MAX_ITEMS])
+        if not items:
+            return
+        more = pending.count() - len(items)
+
+        new_reports = sum(item.pending_count for item in items)
+        enqueue(
+            _EMAIL_TASK_NAME,
+            {
+                "subject": f"Жалобы на контент: {new_reports} новых, объектов: {len(items) + more}",
+                "message": _digest_message(items, more),
+            },
+        )
+
+        ModerationQueueItem.objects.filter(id__in=[item.id for item in items]).update(
+            pending_count=0,
+            notified_at=timezone.now(),
+        )
+
+        if more:
+            # Остаток уйдёт следующим письмом через окно
+            transaction.on_commit(schedule_digest)
+
+    logger.info("Moderation digest queued: %s reports, %s items", new_reports, len(items))
+
+
+def send_digest_email(subject, message):
+    """Фоновая задача: отправка собранного дайджеста модераторам."""
+    recipients = settings.MODERATION_EMAILS
+    if not recipients:
+        logger.warning("MODERATION_EMAILS is empty, moderation digest dropped")
+        return
+    send_mail(
+        subject=subject,
+        message=message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=recipients,
+    )
+
+
+def rebuild_queue() -> int:
+    """Пересчитывает reports_count и даты по ContentReport (первичное заполнение)."""
+    rows = (
+        ContentReport.objects.values("content_type", "content_id")
+        .annotate(count=Count("id"), first=Min("created_at"), last=Max("created_at"))
+        .order_by()
+    )
+    items = [
+        ModerationQueueItem(
+            content_type=r["content_type"],
+            content_id=r["content_id"],
+            reports_count=r["count"],
+            first_reported_at=r["first"],
+            last_reported_at=r["last"],
+        )
+        for r in rows
+    ]
+    ModerationQueueItem.objects.bulk_create(
+        items,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["content_type", "content_id"],
+        update_fields=["reports_count", "first_reported_at", "last_reported_at"],
+    )
+    return len(items)
@@ -0,0 +1,106 @@
+import gzip
+import hashlib
+import logging
+import threading
+from importlib.metadata import version
+from pathlib import Path
+
+from django.conf import settings
+
+from apps.base.utils.compression import brotli
+
+logger = logging.getLogger(__name__)
+
+# Схема зависит от кода проекта и версий пакетов, которые её строят
+SOURCE_DIRS = ("apps", "core")
+SCHEMA_PACKAGES = ("django", "djangorestframework", "djangorestframework-simplejwt", "drf-spectacular")
+
+_artifact = None
+_artifact_lock = threading.Lock()
+
+
+class SchemaArtifact:
+    """Готовая схема: JSON, его gzip/br-версии и ETag."""
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self.etag = '"{}"'.format(hashlib.sha256(content).hexdigest()[:32])
+        self.encoded = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            # Сжимается один раз на процесс — можно максимальное качество
+            self.encoded["br"] = brotli.compress(content, quality=11)
+
+
+def generate_schema() -> bytes:
+    """Схема OpenAPI в JSON — то же, что отдавал SpectacularAPIView."""
+    from drf_spectacular.renderers import OpenApiJsonRenderer
+    from drf_spectacular.settings import spectacular_settings
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    return OpenApiJsonRenderer().render(schema, renderer_context={})
+
+
+def source_fingerprint() -> str:
+    """Хеш исходников и версий пакетов: меняется — схему надо пересобрать."""
+    digest = hashlib.sha256()
+    for name in SCHEMA_PACKAGES:
+        digest.update(f"{name}=={version(name)}\n".encode())
+
+    base_dir = Path(settings.BASE_DIR)
+    for directory in SOURCE_DIRS:
+        for path in sorted((base_dir / directory).rglob("*.py")):
+            digest.update(str(path.relative_to(base_dir)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _fingerprint_path(schema_path: Path) -> Path:
+    return schema_path.with_name(schema_path.name + ".sha256")
+
+
+def write_artifact(path, content: bytes):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    _fingerprint_path(path).write_text(source_fingerprint())
+
+
+def read_artifact(path):
+    """
+    Схема из файла, если он собран из текущего кода, иначе None.
+    Код в контейнере может быть новее образа (volume с ../app) — тогда
+    собранный при build файл устарел и отдавать его нельзя.
+    """
+    path = Path(path)
+    try:
+        content = path.read_bytes()
+        fingerprint = _fingerprint_path(path).read_text().strip()
+    except FileNotFoundError:
+        return None
+
+    if fingerprint != source_fingerprint():
+        logger.warning("OpenAPI schema artifact %s is stale, regenerating in process", path)
+        return None
+    return content
+
+
+def get_artifact() -> SchemaArtifact:
+    """
+    Схема для /api/schema/: файл из OPENAPI_SCHEMA_PATH (собирается при
+    сборке образа командой build_openapi_schema) или, если его нет или он
+    устарел, генерация один раз на процесс.
+    """
+    global _artifact
+    if _artifact is not None:
+        return _artifact
+
+    with _artifact_lock:
+        if _artifact is None:
+            content = None
+            if settings.OPENAPI_SCHEMA_PATH:
+                content = read_artifact(settings.OPENAPI_SCHEMA_PATH)
+            if content is None:
+                content = generate_schema()
+            _artifact = SchemaArtifact(content)
+    return _artifact
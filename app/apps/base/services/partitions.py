@@ -0,0 +1,287 @@
+import logging
+import re
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.base.models import Donation, Notification
+
+logger = logging.getLogger(__name__)
+
+# Таблицы, секционированные по месяцам created_at (RANGE, границы в UTC)
+PARTITIONED_MODELS = (Donation, Notification)
+
+# На сколько месяцев вперёд держать готовые секции
+DEFAULT_AHEAD_MONTHS = 3
+
+PARTITION_KEY = "created_at"
+
+_UPPER_BOUND_RE = re.compile(r"TO \('([^']+)'\)")
+
+
+class PartitionError(Exception):
+    pass
+
+
+def month_start(value) -> datetime:
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def partition_name(table, start: datetime) -> str:
+    return f"{table}_p{start.year}_{start.month:02d}"
+
+
+def _literal(value: datetime) -> str:
+    return value.strftime("'%Y-%m-%d %H:%M:%S+00'")
+
+
+def is_partitioned(table) -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [table])
+        row = cursor.fetchone()
+    return row is not None and row[0] == "p"
+
+
+def partitions(table):
+    """[(имя, верхняя граница или None для MAXVALUE)] в порядке границ."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
+            """,
+            [table],
+        )
+        rows = cursor.fetchall()
+
+    result = []
+    for name, bound in rows:
+        match = _UPPER_BOUND_RE.search(bound)
+        upper = datetime.fromisoformat(match.group(1)) if match else None
+        result.append((name, upper))
+    return sorted(result, key=lambda item: (item[1] is None, item[1] or 0))
+
+
+def ensure_partitions(model, ahead=DEFAULT_AHEAD_MONTHS) -> list:
+    """
+    Создаёт месячные секции от текущего месяца до ahead месяцев вперёд
+    (пропуская уже покрытые). Для несекционированной таблицы — ничего.
+    """
+    table = model._meta.db_table
+    if not is_partitioned(table):
+        return []
+
+    existing = partitions(table)
+    covered = max((upper for _, upper in existing if upper is not None), default=None)
+
+    created = []
+    start = month_start(timezone.now())
+    end = add_months(start, ahead + 1)
+    with connection.cursor() as cursor:
+        while start < end:
+            following = add_months(start, 1)
+            if covered is None or start >= covered:
+                name = partition_name(table, start)
+                cursor.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+                    f"FOR VALUES FROM ({_literal(start)}) TO ({_literal(following)})"
+                )
+                created.append(name)
+            start = following
+    return created
+
+
+def detach_partitions(model, before: datetime, drop=False) -> list:
+    """
+    Отсоединяет секции, целиком лежащие раньше before: старые данные уходят
+    из таблицы мгновенно, без DELETE. Отсоединённая секция остаётся обычной
+    таблицей (для архивации), с drop=True — удаляется.
+    """
+    table = model._meta.db_table
+    if not is_partitioned(table):
+        return []
+
+    detached = []
+    with connection.cursor() as cursor:
+        for name, upper in partitions(table):
+            if upper is None or upper > before:
+                continue
+            cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+            if drop:
+                cursor.execute(f'DROP TABLE "{name}"')
+            detached.append(name)
+    return detached
+
+
+def _fetch(cursor, sql, params=None):
+    cursor.execute(sql, params)
+    return cursor.fetchall()
+
+
+def _bound_check_name(table) -> str:
+    return f"{table}_{PARTITION_KEY}_bound"
+
+
+def _unique_index_name(table) -> str:
+    return f"{table}_id_{PARTITION_KEY}_uniq"
+
+
+def _first_boundary(table) -> datetime:
+    with connection.cursor() as cursor:
+        max_created = _fetch(cursor, f'SELECT MAX({PARTITION_KEY}) FROM "{table}"')[0][0]
+    boundary = add_months(month_start(timezone.now()), 1)
+    if max_created is not None and max_created >= boundary:
+        boundary = add_months(month_start(max_created), 1)
+    # Запись после границы нарушила бы CHECK до того, как появятся секции
+    if boundary - timezone.now() < timedelta(days=1):
+        boundary = add_months(boundary, 1)
+    return boundary
+
+
+def _prepare_for_attach(table, boundary):
+    """
+    Подготовка без ACCESS EXCLUSIVE: уникальный индекс (id, created_at)
+    строится CONCURRENTLY, CHECK на границу добавляется NOT VALID и
+    проверяется VALIDATE (SHARE UPDATE EXCLUSIVE — чтение и запись идут).
+    Под блокировкой индекс становится первичным ключом секции, ATTACH
+    подключает его к ключу родителя и по CHECK не сканирует строки.
+    """
+    index = _unique_index_name(table)
+    check = _bound_check_name(table)
+    with connection.cursor() as cursor:
+        valid = _fetch(
+            cursor, "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)", [index]
+        )
+        if valid and not valid[0][0]:
+            # Остаток прерванного CREATE INDEX CONCURRENTLY
+            cursor.execute(f'DROP INDEX CONCURRENTLY "{index}"')
+        cursor.execute(
+            f'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "{index}" '
+            f'ON "{table}" (id, {PARTITION_KEY})'
+        )
+        cursor.execute(f'ALTER TABLE "{table}" DROP CONSTRAINT IF EXISTS "{check}"')
+        cursor.execute(
+            f'ALTER TABLE "{table}" ADD CONSTRAINT "{check}" '
+            f"CHECK ({PARTITION_KEY} < {_literal(boundary)}) NOT VALID"
+        )
+        cursor.execute(f'ALTER TABLE "{table}" VALIDATE CONSTRAINT "{check}"')
+
+
+def convert_table(model, ahead=DEFAULT_AHEAD_MONTHS) -> str:
+    """
+    Разовое преобразование обычной таблицы в секционированную по created_at.
+    Существующая таблица целиком становится первой секцией (до начала
+    следующего месяца) — строки не копируются. Первичный ключ секционированной
+    таблицы — (id, created_at); индексы и внешние ключи переносятся на
+    родителя под прежними именами. Индекс и CHECK для ATTACH готовятся до
+    блокировки, поэтому вызывать вне транзакции.
+    """
+    table = model._meta.db_table
+    legacy = f"{table}_legacy"
+    if connection.vendor != "postgresql":
+        raise PartitionError("Partitioning requires PostgreSQL")
+    if is_partitioned(table):
+        return ""
+    if connection.in_atomic_block:
+        raise PartitionError("convert_table must run outside a transaction (CREATE INDEX CONCURRENTLY)")
+
+    boundary = _first_boundary(table)
+    _prepare_for_attach(table, boundary)
+    check = _bound_check_name(table)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE "{table}" IN ACCESS EXCLUSIVE MODE')
+
+        referencing = _fetch(
+            cursor,
+            "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+            "WHERE confrelid = to_regclass(%s) AND contype = 'f'",
+            [table],
+        )
+        if referencing:
+            # Внешний ключ на секционированную таблицу требует created_at в ключе
+            raise PartitionError(
+                f"{table} is referenced by foreign keys {referencing}; "
+                "declare them with db_constraint=False first"
+            )
+
+        pk_name = _fetch(
+            cursor,
+            "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype = 'p'",
+            [table],
+        )[0][0]
+        indexes = _fetch(
+            cursor,
+            "SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid) FROM pg_index "
+            "WHERE indrelid = to_regclass(%s) AND NOT indisprimary "
+            "AND indexrelid <> to_regclass(%s)",
+            [table, _unique_index_name(table)],
+        )
+        foreign_keys = _fetch(
+            cursor,
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+            [table],
+        )
+        sequence = _fetch(cursor, "SELECT pg_get_serial_sequence(%s, 'id')", [table])[0][0]
+        max_id = _fetch(cursor, f'SELECT COALESCE(MAX(id), 0) FROM "{table}"')[0][0]
+
+        # Старая таблица освобождает имена: её индексы получают суффикс, а PK (id)
+        # заменяется готовым индексом (id, created_at) — без построения
+        cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+        cursor.execute(f'ALTER TABLE "{legacy}" DROP CONSTRAINT "{pk_name}"')
+        cursor.execute(
+            f'ALTER TABLE "{legacy}" ADD CONSTRAINT "{legacy}_pkey" '
+            f'PRIMARY KEY USING INDEX "{_unique_index_name(table)}"'
+        )
+        for index_name, _ in indexes:
+            cursor.execute(f'ALTER INDEX {index_name} RENAME TO "{index_name[:56]}_legacy"')
+
+        # id берётся из новой последовательности родителя (identity у секции недопустим)
+        cursor.execute(f'ALTER TABLE "{legacy}" ALTER COLUMN id DROP IDENTITY IF EXISTS')
+        cursor.execute(f'ALTER TABLE "{legacy}" ALTER COLUMN id DROP DEFAULT')
+        if sequence:
+            cursor.execute(f"DROP SEQUENCE IF EXISTS {sequence}")
+
+        cursor.execute(
+            f'CREATE TABLE "{table}" (LIKE "{legacy}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+            f"PARTITION BY RANGE ({PARTITION_KEY})"
+        )
+        # LIKE скопировал и CHECK на границу — родителю он не нужен
+        cursor.execute(f'ALTER TABLE "{table}" DROP CONSTRAINT "{check}"')
+        cursor.execute(f'CREATE SEQUENCE "{table}_id_seq" OWNED BY "{table}".id')
+        cursor.execute(f"SELECT setval('\"{table}_id_seq\"', %s, false)", [max_id + 1])
+        cursor.execute(
+            f"ALTER TABLE \"{table}\" ALTER COLUMN id SET DEFAULT nextval('\"{table}_id_seq\"')"
+        )
+        cursor.execute(
+            f'ALTER TABLE "{table}" ADD CONSTRAINT "{pk_name}" PRIMARY KEY (id, {PARTITION_KEY})'
+        )
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+        for _, definition in indexes:
+            # Определение ссылается на прежнее имя таблицы — теперь это родитель
+            cursor.execute(definition)
+
+        # Совпадающие индексы и внешние ключи секции подключаются, а не строятся
+        # заново; проверенный CHECK избавляет от сканирования строк
+        cursor.execute(
+            f'ALTER TABLE "{table}" ATTACH PARTITION "{legacy}" '
+            f"FOR VALUES FROM (MINVALUE) TO ({_literal(boundary)})"
+        )
+        cursor.execute(f'ALTER TABLE "{legacy}" DROP CONSTRAINT "{check}"')
+
+        ensure_partitions(model, ahead=ahead)
+
+    logger.info("Table %s converted to monthly partitions", table)
+    return legacy
@@ -0,0 +1,212 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, IntegerField, Value, When
+
+from apps.accounts.models import Organization
+from apps.base.models import Campaign, Donation, Payment
+from apps.base.services import leaderboard, realtime, trending
+from apps.base.utils import metrics
+from apps.base.utils.notifications import bulk_create_notifications
+
+# Сколько платежей обрабатывается в одной транзакции
+CHUNK_SIZE = 500
+
+_MONEY = DecimalField(max_digits=12, decimal_places=2)
+
+
+def _increment_case(values: dict, output_field):
+    """CASE id WHEN ... THEN прибавка — одно UPDATE на все строки."""
+    return Case(
+        *[When(id=pk, then=Value(value)) for pk, value in values.items()],
+        default=Value(0),
+        output_field=output_field,
+    )
+
+
+def _new_campaign_donors(rows) -> dict:
+    """
+    Сколько доноров впервые завершают донат в кампанию (для donors_count).
+    Вызывается до смены статуса донатов пачки.
+    """
+    pairs = {(r["campaign_id"], r["donor_id"]) for r in rows if r["campaign_id"]}
+    if not pairs:
+        return {}
+
+    existing = set(
+        Donation.objects.filter(
+            campaign_id__in={c for c, _ in pairs},
+            donor_id__in={d for _, d in pairs},
+            status=Donation.Status.COMPLETED,
+        )
+        .values_list("campaign_id", "donor_id")
+        .distinct()
+    )
+
+    counts = defaultdict(int)
+    for campaign_id, donor_id in pairs - existing:
+        counts[campaign_id] += 1
+    return counts
+
+
+def _notification_messages(rows):
+    messages = []
+    for r in rows:
+        messages.append({
+            "user_id": r["donor_id"],
+            "title": "Платёж успешно завершён",
+            "message": f"Спасибо! Ваш донат на сумму {r['amount']} успешно зачислен.",
+            "data": {"type": "payment_completed", "payment_id": r["id"]},
+        })
+        messages.append({
+            "user_id": r["organization_user_id"],
+            "title": "Новый донат",
+            "message": f"Поступил донат на сумму {r['amount']}.",
+            "data": {
+                "type": "new_donation",
+                "donation_id": r["donation_id"],
+                "amount": str(r["amount"]),
+            },
+        })
+    return messages
+
+
+def _lock_pending(payment_ids, donor_id=None):
+    qs = Payment.objects.select_for_update(skip_locked=True, of=("self",)).filter(
+        id__in=payment_ids,
+        status=Payment.Status.PENDING,
+    )
+    if donor_id is not None:
+        qs = qs.filter(donor_id=donor_id)
+
+    return list(
+        qs.values(
+            "id",
+            "donation_id",
+            "donor_id",
+            "amount",
+            campaign_id=F("donation__campaign_id"),
+            organization_id=F("donation__organization_id"),
+            organization_user_id=F("donation__organization__user_id"),
+        )
+    )
+
+
+@transaction.atomic
+def _complete_chunk(payment_ids, donor_id=None):
+    rows = _lock_pending(payment_ids, donor_id)
+    if not rows:
+        return []
+
+    new_donors = _new_campaign_donors(rows)
+
+    Payment.objects.filter(id__in=[r["id"] for r in rows]).update(
+        status=Payment.Status.COMPLETED,
+    )
+    Donation.objects.filter(id__in=[r["donation_id"] for r in rows]).update(
+        status=Donation.Status.COMPLETED,
+    )
+
+    campaign_totals = defaultdict(Decimal)
+    campaign_donations = defaultdict(int)
+    organization_totals = defaultdict(Decimal)
+    for r in rows:
+        if r["campaign_id"]:
+            campaign_totals[r["campaign_id"]] += r["amount"]
+            campaign_donations[r["campaign_id"]] += 1
+        organization_totals[r["organization_id"]] += r["amount"]
+
+    if campaign_totals:
+        Campaign.objects.filter(id__in=campaign_totals).update(
+            raised_amount=F("raised_amount") + _increment_case(campaign_totals, _MONEY),
+            donors_count=F("donors_count") + _increment_case(new_donors, IntegerField()),
+            trending_score=trending.increment_expression(campaign_donations),
+        )
+    Organization.objects.filter(id__in=organization_totals).update(
+        total_raised=F("total_raised") + _increment_case(organization_totals, _MONEY),
+    )
+
+    leaderboard.apply_impact(
+        (r["donor_id"], r["organization_id"], r["amount"]) for r in rows
+    )
+
+    messages = _notification_messages(rows)
+    transaction.on_commit(lambda: bulk_create_notifications(messages))
+    transaction.on_commit(lambda: metrics.record_donations("completed", len(rows)))
+    transaction.on_commit(
+        lambda: realtime.publish_campaign_progress(campaign_totals, new_donors, campaign_donations)
+    )
+
+    return [r["id"] for r in rows]
+
+
+@transaction.atomic
+def _fail_chunk(payment_ids, donor_id=None):
+    rows = _lock_pending(payment_ids, donor_id)
+    if not rows:
+        return []
+
+    Payment.objects.filter(id__in=[r["id"] for r in rows]).update(
+        status=Payment.Status.FAILED,
+    )
+    Donation.objects.filter(id__in=[r["donation_id"] for r in rows]).update(
+        status=Donation.Status.FAILED,
+    )
+    transaction.on_commit(lambda: metrics.record_donations("failed", len(rows)))
+    return [r["id"] for r in rows]
+
+
+def _chunked(ids):
+    ids = list(dict.fromkeys(ids))
+    for i in range(0, len(ids), CHUNK_SIZE):
+        yield ids[i:i + CHUNK_SIZE]
+
+
+def complete_payments(payment_ids, donor_id=None) -> list:
+    """
+    Переводит PENDING-платежи и их донаты в COMPLETED.
+
+    Платежи блокируются SELECT ... FOR UPDATE SKIP LOCKED: строки, которые прямо
+    сейчас завершает другой запрос, пропускаются, уже завершённые — тоже.
+    Статусы, суммы (и trending_score) кампаний и организаций меняются set-based UPDATE-ами
+    (по одному на таблицу в каждой пачке), уведомления создаются bulk_create,
+    а push ставится в очередь.
+
+    Возвращает id завершённых этим вызовом платежей.
+    """
+    completed = []
+    for chunk in _chunked(payment_ids):
+        completed.extend(_complete_chunk(chunk, donor_id))
+    return completed
+
+
+def fail_payments(payment_ids, donor_id=None) -> list:
+    failed = []
+    for chunk in _chunked(payment_ids):
+        failed.extend(_fail_chunk(chunk, donor_id))
+    return failed
+
+
+def settle_payments(settlements) -> dict:
+    """
+    settlements: iterable of {"payment_id": int, "status": "completed" | "failed"}.
+    """
+    to_complete, to_fail = [], []
+    for item in settlements:
+        if item["status"] == Payment.Status.COMPLETED:
+            to_complete.append(item["payment_id"])
+        else:
+            to_fail.append(item["payment_id"])
+
+    completed = complete_payments(to_complete)
+    failed = fail_payments(to_fail)
+
+    processed = set(completed) | set(failed)
+    skipped = [pk for pk in dict.fromkeys(to_complete + to_fail) if pk not in processed]
+
+    return {
+        "completed": len(completed),
+        "failed": len(failed),
+        "skipped": skipped,
+    }
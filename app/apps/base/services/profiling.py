@@ -0,0 +1,183 @@
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from apps.base.models import RequestProfile
+
+# Цель выборочного профилирования: {"view", "rate"} (manage.py profile_requests)
+_TARGET_KEY = "profiling:target"
+
+# Цель на процесс, чтобы не читать кэш на каждый запрос: (значение, checked_at)
+_target_cache = [None, float("-inf")]
+
+# Подпись фрейма по code-объекту: "func (apps/base/views.py:203)"
+_labels = {}
+
+_MAX_DEPTH = 200
+
+# Корень проекта (каталог с manage.py): его файлы — код приложения
+_PROJECT_ROOT = f"{Path(__file__).resolve().parents[3]}/"
+
+
+def _short_path(filename):
+    marker = "site-packages/"
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    if filename.startswith(_PROJECT_ROOT):
+        return filename[len(_PROJECT_ROOT):]
+    return filename
+
+
+def _label(code):
+    label = _labels.get(code)
+    if label is None:
+        label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+        label = _labels[code] = label.replace(";", ",")
+    return label
+
+
+def _is_app_frame(code):
+    filename = code.co_filename
+    return filename.startswith(_PROJECT_ROOT) and "site-packages" not in filename
+
+
+def fold(frame, app_only=False) -> str:
+    """Стек от корня к frame в свёрнутом виде: "корень;...;лист"."""
+    labels = []
+    while frame is not None and len(labels) < _MAX_DEPTH:
+        if not app_only or _is_app_frame(frame.f_code):
+            labels.append(_label(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def _sql_label(sql):
+    return "SQL " + " ".join(str(sql).split())[:80].replace(";", ",")
+
+
+def set_target(view_name, rate, seconds):
+    cache.set(_TARGET_KEY, {"view": view_name, "rate": rate}, timeout=seconds)
+
+
+def clear_target():
+    cache.delete(_TARGET_KEY)
+
+
+def get_target():
+    return cache.get(_TARGET_KEY)
+
+
+def current_target():
+    """Цель профилирования, перечитывается из кэша раз в PROFILING_TARGET_REFRESH секунд."""
+    now = time.monotonic()
+    if now - _target_cache[1] >= settings.PROFILING_TARGET_REFRESH:
+        _target_cache[0] = get_target()
+        _target_cache[1] = now
+    return _target_cache[0]
+
+
+def is_staff(request) -> bool:
+    """Сотрудник по сессии (админка) или по токену API (аутентификация DRF)."""
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+
+    drf_request = Request(request)
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authentication_class().authenticate(drf_request)
+        except APIException:
+            return False
+        if result is not None:
+            return bool(result[0].is_staff)
+    return False
+
+
+class Profiler:
+    """
+    Профиль одного запроса в потоке, который его обслуживает: отдельный поток
+    раз в PROFILING_INTERVAL_MS снимает стек (sys._current_frames), а
+    execute_wrapper записывает каждый SQL-запрос с временем и местом вызова.
+    """
+
+    def __init__(self, trigger):
+        self.trigger = trigger
+        self.stacks = Counter()
+        self.sql_stacks = Counter()
+        self.queries = []
+        self.query_count = 0
+        self.query_ms = 0.0
+        self._thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name="request-profiler", daemon=True)
+        self._wrappers = ExitStack()
+
+    def start(self):
+        for alias in settings.DATABASES:
+            self._wrappers.enter_context(connections[alias].execute_wrapper(self._trace_sql))
+        self._started = time.perf_counter()
+        self._cpu_started = time.thread_time()
+        self._sampler.start()
+
+    def stop(self):
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+        self.cpu_ms = (time.thread_time() - self._cpu_started) * 1000
+        self._stopped.set()
+        self._sampler.join()
+        self._wrappers.close()
+
+    def _sample(self):
+        interval = settings.PROFILING_INTERVAL_MS / 1000
+        while not self._stopped.wait(interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.stacks[fold(frame)] += 1
+
+    def _trace_sql(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            ms = (time.perf_counter() - started) * 1000
+            self.query_count += 1
+            self.query_ms += ms
+            if len(self.queries) < settings.PROFILING_MAX_QUERIES:
+                # Без параметров: в профиль не попадают телефоны, суммы и т.п.
+                self.queries.append({"sql": sql, "ms": round(ms, 3), "many": many})
+            caller = fold(sys._getframe(1), app_only=True)
+            leaf = _sql_label(sql)
+            # Вес — микросекунды: flamegraph показывает, какой код сколько ждал БД
+            self.sql_stacks[f"{caller};{leaf}" if caller else leaf] += max(1, round(ms * 1000))
+
+    def save(self, request, view_name, status_code) -> RequestProfile:
+        user = getattr(request, "user", None)
+        return RequestProfile.objects.create(
+            user_id=user.pk if user is not None and user.is_authenticated else None,
+            trigger=self.trigger,
+            method=request.method,
+            path=request.get_full_path()[:500],
+            view_name=view_name[:255],
+            status_code=status_code,
+            duration_ms=round(self.duration_ms, 3),
+            cpu_ms=round(self.cpu_ms, 3),
+            samples=sum(self.stacks.values()),
+            query_count=self.query_count,
+            query_ms=round(self.query_ms, 3),
+            cpu_stacks=folded(self.stacks),
+            sql_stacks=folded(self.sql_stacks),
+            queries=self.queries,
+        )
+
+
+def folded(stacks: Counter) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
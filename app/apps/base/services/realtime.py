@@ -0,0 +1,189 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import redis
+    import redis.asyncio as redis_asyncio
+except ImportError:  # redis не обязателен: без него события раздаются внутри процесса
+    redis = redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+# События поверх Redis pub/sub для SSE (apps/base/streams.py): прогресс
+# кампаний и новые уведомления пользователя. В канал публикуется уже
+# готовый SSE-кадр — процессы-подписчики пересылают байты клиентам как есть.
+_CAMPAIGN_CHANNEL = "finic:campaign:{}"
+_USER_CHANNEL = "finic:user:{}"
+
+# Кладётся в очередь отставшего клиента вместо потерянных событий
+RESYNC = b"event: resync\ndata: {}\n\n"
+
+_client = None
+
+
+def campaign_channel(campaign_id) -> str:
+    return _CAMPAIGN_CHANNEL.format(campaign_id)
+
+
+def user_channel(user_id) -> str:
+    return _USER_CHANNEL.format(user_id)
+
+
+def _frame(event, data) -> bytes:
+    payload = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(",", ":"))
+    return f"event: {event}\ndata: {payload}\n\n".encode()
+
+
+def _redis():
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL)
+    return _client
+
+
+def publish(messages):
+    """
+    messages: [(канал, событие, данные)]. Все публикации — один round trip
+    (pipeline). Ошибки Redis логируются: realtime — дополнение к API,
+    платёж или уведомление из-за него не должны падать.
+    """
+    messages = [(channel, _frame(event, data)) for channel, event, data in messages]
+    if not messages:
+        return
+
+    if not settings.REDIS_URL or redis is None:
+        hub.publish_local(messages)
+        return
+
+    try:
+        pipeline = _redis().pipeline(transaction=False)
+        for channel, frame in messages:
+            pipeline.publish(channel, frame)
+        pipeline.execute()
+    except Exception:
+        logger.warning("Failed to publish %s realtime events", len(messages), exc_info=True)
+
+
+def publish_campaign_progress(raised, donors, donations):
+    """Дельты по кампаниям пачки платежей: {campaign_id: прибавка}."""
+    publish(
+        (
+            campaign_channel(campaign_id),
+            "campaign",
+            {
+                "campaign_id": campaign_id,
+                "raised_delta": amount,
+                "donors_delta": donors.get(campaign_id, 0),
+                "donations_delta": donations.get(campaign_id, 0),
+            },
+        )
+        for campaign_id, amount in raised.items()
+    )
+
+
+def publish_notifications(notifications):
+    publish(
+        (
+            user_channel(n.user_id),
+            "notification",
+            {
+                "id": n.id,
+                "title": n.title,
+                "message": n.message,
+                "is_read": n.is_read,
+                "created_at": n.created_at,
+            },
+        )
+        for n in notifications
+    )
+
+
+class Hub:
+    """
+    Подписки процесса: одно соединение Redis pub/sub на все каналы, события
+    раздаются очередям клиентов. Канал подписывается в Redis, пока на него
+    есть хотя бы один клиент этого процесса. Ожидающий клиент — это только
+    корутина и очередь, CPU он не тратит.
+    """
+
+    def __init__(self):
+        self._queues = defaultdict(set)
+        self._loop = None
+        self._pubsub = None
+        self._reader = None
+
+    def _redis_enabled(self):
+        return bool(settings.REDIS_URL) and redis_asyncio is not None
+
+    async def subscribe(self, channels) -> asyncio.Queue:
+        self._loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=settings.SSE_QUEUE_SIZE)
+        new = [channel for channel in channels if not self._queues.get(channel)]
+
+        if new and self._redis_enabled():
+            if self._pubsub is None:
+                self._pubsub = redis_asyncio.Redis.from_url(settings.REDIS_URL).pubsub()
+            await self._pubsub.subscribe(*new)
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read())
+
+        # Очередь регистрируется только после подписки в Redis: при ошибке
+        # клиент получит исключение и переподключится, а не «немой» канал
+        for channel in channels:
+            self._queues[channel].add(queue)
+        return queue
+
+    def unsubscribe(self, channels, queue):
+        # Синхронно: вызывается из finally отменённого (клиент ушёл) генератора
+        empty = []
+        for channel in channels:
+            queues = self._queues.get(channel)
+            if queues is None:
+                continue
+            queues.discard(queue)
+            if not queues:
+                del self._queues[channel]
+                empty.append(channel)
+
+        if empty and self._pubsub is not None:
+            asyncio.get_running_loop().create_task(self._pubsub.unsubscribe(*empty))
+
+    def dispatch(self, channel, frame):
+        for queue in self._queues.get(channel, ()):
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # Клиент не успевает читать: дельты потеряны, пусть перезапросит состояние
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+
+    async def _read(self):
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # PubSub переподключается и переподписывается при следующем чтении
+                logger.warning("Realtime pub/sub connection failed", exc_info=True)
+                await asyncio.sleep(1)
+                continue
+            if message is not None and message["type"] == "message":
+                self.dispatch(message["channel"].decode(), message["data"])
+
+    def publish_local(self, messages):
+        """Без Redis (dev): события доходят только до клиентов этого процесса."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        for channel, frame in messages:
+            loop.call_soon_threadsafe(self.dispatch, channel, frame)
+
+
+hub = Hub()
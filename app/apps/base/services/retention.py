@@ -0,0 +1,126 @@
+import gzip
+import io
+import json
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.accounts.models import OTPCode
+from apps.base.models import FCMDeviceToken, Notification, RequestProfile
+from apps.base.storage import private_storage
+
+logger = logging.getLogger(__name__)
+
+# Политики хранения: что удалять (по возрасту в днях из настройки), в каком
+# порядке обходить (индекс по этой колонке и id) и нужно ли архивировать
+POLICIES = {
+    "notifications": {
+        "model": Notification,
+        "days": "RETENTION_NOTIFICATION_DAYS",
+        "column": "created_at",
+        "filter": lambda cutoff: Q(is_read=True, created_at__lt=cutoff),
+        "archive": True,
+    },
+    "otp_codes": {
+        "model": OTPCode,
+        "days": "RETENTION_OTP_DAYS",
+        "column": "created_at",
+        "filter": lambda cutoff: Q(created_at__lt=cutoff),
+        # Истёкшие коды ничего не стоят, а хранить их копии небезопасно
+        "archive": False,
+    },
+    "fcm_tokens": {
+        "model": FCMDeviceToken,
+        "days": "RETENTION_FCM_TOKEN_DAYS",
+        # updated_at обновляется при каждой регистрации токена приложением
+        "column": "updated_at",
+        "filter": lambda cutoff: Q(updated_at__lt=cutoff),
+        # Токен — адрес для отправки push на устройство, копии не храним
+        "archive": False,
+    },
+    "request_profiles": {
+        "model": RequestProfile,
+        "days": "RETENTION_PROFILE_DAYS",
+        "column": "created_at",
+        "filter": lambda cutoff: Q(created_at__lt=cutoff),
+        # Профили нужны только для разбора конкретной проблемы
+        "archive": False,
+    },
+}
+
+
+def _policy_queryset(name):
+    policy = POLICIES[name]
+    cutoff = timezone.now() - timedelta(days=getattr(settings, policy["days"]))
+    return policy["model"].objects.filter(policy["filter"](cutoff))
+
+
+def _archive(name, rows):
+    """Пачка строк в gzip JSONL в закрытом хранилище (STORAGES["private"])."""
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as archive:
+        for row in rows:
+            line = json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False)
+            archive.write(line.encode() + b"\n")
+
+    path = (
+        f"{settings.RETENTION_ARCHIVE_PREFIX}{name}/{timezone.now():%Y/%m/%d}/"
+        f"{rows[0]['id']}-{rows[-1]['id']}.jsonl.gz"
+    )
+    return private_storage().save(path, ContentFile(buffer.getvalue()))
+
+
+def count_expired(name) -> int:
+    return _policy_queryset(name).count()
+
+
+def apply_policy(name, batch_size=None, pause=None) -> int:
+    """
+    Удаляет строки политики пачками по batch_size в порядке (column, id) —
+    по индексу, с продолжением от последней строки, а не с начала. Каждая
+    пачка — короткая транзакция: строки блокируются (занятые пропускаются),
+    архивируются и удаляются; между пачками пауза pause секунд.
+    """
+    policy = POLICIES[name]
+    model = policy["model"]
+    column = policy["column"]
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    pause = settings.RETENTION_BATCH_PAUSE if pause is None else pause
+
+    queryset = _policy_queryset(name)
+    last = None
+    deleted = 0
+    while True:
+        page = queryset
+        if last is not None:
+            page = page.filter(
+                Q(**{f"{column}__gt": last[0]}) | Q(**{column: last[0], "id__gt": last[1]})
+            )
+
+        with transaction.atomic():
+            rows = list(
+                page.select_for_update(skip_locked=True)
+                .order_by(column, "id")
+                .values()[:batch_size]
+            )
+            if not rows:
+                break
+            if policy["archive"]:
+                _archive(name, rows)
+            model.objects.filter(id__in=[row["id"] for row in rows]).delete()
+
+        deleted += len(rows)
+        last = (rows[-1][column], rows[-1]["id"])
+        if len(rows) < batch_size:
+            break
+        time.sleep(pause)
+
+    logger.info("Retention %s: deleted %s rows", name, deleted)
+    return deleted
@@ -0,0 +1,174 @@
+import logging
+import traceback
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.base.models import BackgroundTask
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = timedelta(seconds=30)
+# RUNNING без heartbeat дольше этого срока считаем брошенной (воркер упал) и забираем заново
+STALE_AFTER = timedelta(minutes=15)
+# Как часто heartbeat() продлевает выполняемую задачу (намного чаще STALE_AFTER)
+HEARTBEAT_INTERVAL = timedelta(minutes=1)
+
+# Задача, которую сейчас выполняет run_task (для complete_in_transaction)
+_current_task = ContextVar("current_background_task", default=None)
+
+
+class TaskLost(Exception):
+    """Задачу, не продлённую вовремя, уже забрал другой воркер."""
+
+
+def enqueue(name: str, payload: dict = None, run_after=None) -> BackgroundTask:
+    """
+    Ставит задачу в очередь. name — dotted path функции, payload — её kwargs
+    (должен сериализоваться в JSON).
+    """
+    return BackgroundTask.objects.create(
+        name=name,
+        payload=payload or {},
+        run_after=run_after or timezone.now(),
+    )
+
+
+def enqueue_many(name: str, payloads) -> int:
+    now = timezone.now()
+    tasks = BackgroundTask.objects.bulk_create(
+        [BackgroundTask(name=name, payload=payload, run_after=now) for payload in payloads],
+        batch_size=1000,
+    )
+    return len(tasks)
+
+
+def claim(batch_size: int = 10):
+    """
+    Забирает пачку задач. SKIP LOCKED позволяет запускать несколько воркеров
+    без двойного выполнения.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        tasks = list(
+            BackgroundTask.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=BackgroundTask.Status.PENDING, run_after__lte=now)
+                | Q(status=BackgroundTask.Status.RUNNING, updated_at__lt=now - STALE_AFTER)
+            )
+            .order_by("run_after", "id")[:batch_size]
+        )
+        if tasks:
+            BackgroundTask.objects.filter(id__in=[t.id for t in tasks]).update(
+                status=BackgroundTask.Status.RUNNING,
+                attempts=F("attempts") + 1,
+                updated_at=now,
+            )
+    for task in tasks:
+        task.attempts += 1
+        task.updated_at = now
+    return tasks
+
+
+def heartbeat():
+    """
+    Продлевает выполняемую задачу, чтобы claim не счёл её брошенной. Долгая
+    задача вызывает её хоть на каждой строке: запись в БД — не чаще раза в
+    HEARTBEAT_INTERVAL (вне transaction.atomic, иначе не будет видна до коммита).
+
+    Если задачу уже забрал другой воркер, бросает TaskLost — продолжать
+    нельзя. Вне run_task ничего не делает.
+    """
+    task = _current_task.get()
+    if task is None:
+        return
+
+    now = timezone.now()
+    if now - task.updated_at < HEARTBEAT_INTERVAL:
+        return
+    # Повторный claim увеличивает attempts — так видно, что задача уже не наша
+    updated = BackgroundTask.objects.filter(
+        id=task.id,
+        status=BackgroundTask.Status.RUNNING,
+        attempts=task.attempts,
+    ).update(updated_at=now)
+    if not updated:
+        raise TaskLost(f"Background task {task.name} #{task.id} was claimed by another worker")
+    task.updated_at = now
+
+
+def complete_in_transaction() -> bool:
+    """
+    Отмечает выполняемую задачу DONE внутри транзакции вызывающего кода.
+
+    Задача с изменениями в БД, закоммиченными вместе с этой отметкой, не
+    выполнится повторно: ни после падения воркера (брошенную RUNNING забирают
+    заново), ни параллельно — строка задачи блокируется, второй воркер дождётся
+    коммита первого. Возвращает False, если задача уже выполнена — тогда
+    изменения делать нельзя. Вне run_task всегда True.
+    """
+    task = _current_task.get()
+    if task is None:
+        return True
+
+    status = (
+        BackgroundTask.objects.select_for_update()
+        .filter(id=task.id)
+        .values_list("status", flat=True)
+        .first()
+    )
+    if status == BackgroundTask.Status.DONE:
+        return False
+    BackgroundTask.objects.filter(id=task.id).update(
+        status=BackgroundTask.Status.DONE,
+        last_error="",
+        updated_at=timezone.now(),
+    )
+    return True
+
+
+def run_task(task: BackgroundTask) -> bool:
+    token = _current_task.set(task)
+    try:
+        func = import_string(task.name)
+        func(**task.payload)
+    except TaskLost:
+        # Строка задачи теперь принадлежит другому воркеру — не трогаем её
+        logger.warning("Background task %s #%s was reclaimed, stopping", task.name, task.id)
+        return False
+    except Exception:
+        logger.exception("Background task %s #%s failed", task.name, task.id)
+        if task.attempts >= MAX_ATTEMPTS:
+            status = BackgroundTask.Status.FAILED
+            run_after = task.run_after
+        else:
+            status = BackgroundTask.Status.PENDING
+            run_after = timezone.now() + RETRY_BASE_DELAY * (2 ** (task.attempts - 1))
+        BackgroundTask.objects.filter(id=task.id).update(
+            status=status,
+            run_after=run_after,
+            last_error=traceback.format_exc(),
+            updated_at=timezone.now(),
+        )
+        return False
+    finally:
+        _current_task.reset(token)
+
+    BackgroundTask.objects.filter(id=task.id).update(
+        status=BackgroundTask.Status.DONE,
+        last_error="",
+        updated_at=timezone.now(),
+    )
+    return True
+
+
+def run_pending(batch_size: int = 10) -> int:
+    tasks = claim(batch_size)
+    for task in tasks:
+        run_task(task)
+    return len(tasks)
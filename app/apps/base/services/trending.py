@@ -0,0 +1,102 @@
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Case, Count, F, FloatField, Value, When
+from django.db.models.functions import Greatest, Least, Ln, Power, TruncHour
+from django.utils import timezone
+
+from apps.base.models import Campaign, Donation
+
+# Трендовость кампании — сумма 2^((t - EPOCH) / half_life) по завершённым
+# донатам (t — время завершения), а в Campaign.trending_score хранится log2
+# этой суммы. Вклад доната со временем не пересчитывается: новые донаты
+# просто весят вдвое больше каждые half_life, поэтому порядок кампаний по
+# trending_score — это порядок по затухающему числу донатов, и сортировка
+# идёт по индексу без фоновой «переоценки». Смена TRENDING_HALF_LIFE_HOURS
+# требует manage.py rebuild_trending.
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+_LN2 = math.log(2)
+
+# Донаты старше стольких периодов полураспада дают меньше 2^-30 веса
+_REBUILD_HALF_LIVES = 30
+
+# Меньший вклад (2^-60 от большего) уже теряется в точности double, а
+# POWER(2, -1000) в PostgreSQL падает с «value out of range: underflow»
+_MIN_EXPONENT = -60
+
+
+def _half_life_seconds():
+    return settings.TRENDING_HALF_LIFE_HOURS * 3600
+
+
+def score_for(count, moment) -> float:
+    """log2 вклада count донатов, завершённых в moment."""
+    return math.log2(count) + (moment - EPOCH).total_seconds() / _half_life_seconds()
+
+
+def combine(a, b) -> float:
+    """log2(2^a + 2^b) без переполнения; 0 — «донатов ещё не было»."""
+    if not a or not b:
+        return a or b
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** max(low - high, _MIN_EXPONENT))
+
+
+def increment_expression(counts: dict, moment=None):
+    """
+    Новое значение trending_score для UPDATE кампаний из counts
+    ({campaign_id: завершённых донатов}) — та же формула combine в SQL,
+    поэтому параллельные завершения не теряют прибавок. UPDATE должен
+    фильтроваться по id из counts. Нулевой trending_score (новая кампания)
+    заменяется вкладом целиком.
+    """
+    moment = moment or timezone.now()
+    added = Case(
+        *[When(id=pk, then=Value(score_for(count, moment))) for pk, count in counts.items()],
+        default=F("trending_score"),
+        output_field=FloatField(),
+    )
+    high = Greatest(F("trending_score"), added)
+    low = Least(F("trending_score"), added)
+    exponent = Greatest(low - high, Value(float(_MIN_EXPONENT)))
+    return Case(
+        When(trending_score=0, then=added),
+        default=high + Ln(Value(1.0) + Power(Value(2.0), exponent)) / Value(_LN2),
+        output_field=FloatField(),
+    )
+
+
+def rebuild_scores() -> int:
+    """
+    Пересчитывает trending_score всех кампаний по завершённым донатам
+    (время — created_at, с точностью до часа). Для первого заполнения и
+    после смены периода полураспада.
+    """
+    since = timezone.now() - timedelta(seconds=_half_life_seconds() * _REBUILD_HALF_LIVES)
+    buckets = (
+        Donation.objects.filter(
+            status=Donation.Status.COMPLETED,
+            campaign__isnull=False,
+            created_at__gte=since,
+        )
+        .annotate(hour=TruncHour("created_at"))
+        .values("campaign_id", "hour")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+    scores = defaultdict(lambda: 0.0)
+    for row in buckets:
+        campaign_id = row["campaign_id"]
+        scores[campaign_id] = combine(scores[campaign_id], score_for(row["count"], row["hour"]))
+
+    Campaign.objects.exclude(id__in=scores).update(trending_score=0)
+    Campaign.objects.bulk_update(
+        [Campaign(id=pk, trending_score=score) for pk, score in scores.items()],
+        ["trending_score"],
+        batch_size=500,
+    )
+    return len(scores)
@@ -0,0 +1,183 @@
+import os
+import re
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+
+from apps.accounts.models import User
+
+IMAGE_TYPES = {
+    "image/jpeg": (".jpg", ".jpeg"),
+    "image/png": (".png",),
+    "image/webp": (".webp",),
+    "image/heic": (".heic",),
+}
+VIDEO_TYPES = {
+    "video/mp4": (".mp4",),
+    "video/quicktime": (".mov",),
+    "video/x-msvideo": (".avi",),
+    "video/x-matroska": (".mkv",),
+}
+DOCUMENT_TYPES = {
+    "application/pdf": (".pdf",),
+}
+
+# Для чего загружается файл: каталог (как upload_to у поля модели), роль,
+# допустимые типы и лимит размера
+PURPOSES = {
+    "campaign_image": {
+        "prefix": "campaigns/",
+        "role": User.Roles.ORG,
+        "content_types": IMAGE_TYPES,
+        "max_size": "UPLOAD_MAX_IMAGE_SIZE",
+    },
+    "report_file": {
+        "prefix": "reports/",
+        "role": User.Roles.ORG,
+        "content_types": {**DOCUMENT_TYPES, **IMAGE_TYPES},
+        "max_size": "UPLOAD_MAX_DOCUMENT_SIZE",
+    },
+    "report_image": {
+        "prefix": "reports/media/",
+        "role": User.Roles.ORG,
+        "content_types": IMAGE_TYPES,
+        "max_size": "UPLOAD_MAX_IMAGE_SIZE",
+    },
+    "report_video": {
+        "prefix": "reports/media/",
+        "role": User.Roles.ORG,
+        "content_types": VIDEO_TYPES,
+        "max_size": "UPLOAD_MAX_VIDEO_SIZE",
+    },
+    "avatar": {
+        "prefix": "avatars/donors/",
+        "role": User.Roles.DONOR,
+        "content_types": IMAGE_TYPES,
+        "max_size": "UPLOAD_MAX_IMAGE_SIZE",
+    },
+    "logo": {
+        "prefix": "org_logos/",
+        "role": User.Roles.ORG,
+        "content_types": IMAGE_TYPES,
+        "max_size": "UPLOAD_MAX_IMAGE_SIZE",
+    },
+}
+
+_KEY_NAME_RE = re.compile(r"[0-9a-f]{32}\.[a-z0-9]{2,5}")
+
+_client = None
+
+
+def _max_size(purpose):
+    return getattr(settings, PURPOSES[purpose]["max_size"])
+
+
+def _user_prefix(purpose, user_id):
+    # id пользователя в ключе: прикрепить чужой загруженный файл нельзя
+    return f"{PURPOSES[purpose]['prefix']}{user_id}/"
+
+
+def direct_uploads_enabled():
+    return bool(settings.S3_BUCKET)
+
+
+def _s3_client():
+    """boto3-клиент для подписи форм: подписывается публичный адрес хранилища."""
+    global _client
+    if _client is None:
+        import boto3
+        from botocore.config import Config
+
+        _client = boto3.client(
+            "s3",
+            endpoint_url=settings.S3_PUBLIC_ENDPOINT_URL,
+            aws_access_key_id=settings.S3_ACCESS_KEY,
+            aws_secret_access_key=settings.S3_SECRET_KEY,
+            region_name=settings.S3_REGION,
+            config=Config(
+                signature_version="s3v4",
+                s3={"addressing_style": settings.S3_ADDRESSING_STYLE},
+            ),
+        )
+    return _client
+
+
+def create_upload(user, purpose, filename, content_type, size) -> dict:
+    """
+    Подписанная форма (S3 presigned POST) для загрузки одного файла прямо
+    в хранилище. Тип и максимальный размер зашиты в подпись — хранилище
+    не примет другой файл.
+    """
+    config = PURPOSES[purpose]
+    if user.role != config["role"]:
+        raise serializers.ValidationError({"purpose": "Недоступно для вашей роли."})
+
+    extensions = config["content_types"].get(content_type)
+    if extensions is None:
+        raise serializers.ValidationError({"content_type": "Недопустимый тип файла."})
+
+    ext = os.path.splitext(filename)[1].lower()
+    if ext not in extensions:
+        ext = extensions[0]
+
+    max_size = _max_size(purpose)
+    if size > max_size:
+        raise serializers.ValidationError({"size": f"Максимальный размер — {max_size} байт."})
+
+    key = f"{_user_prefix(purpose, user.id)}{uuid.uuid4().hex}{ext}"
+    post = _s3_client().generate_presigned_post(
+        Bucket=settings.S3_BUCKET,
+        Key=key,
+        Fields={
+            "Content-Type": content_type,
+            # Ключ уникален и не перезаписывается — объект можно кэшировать навсегда
+            "Cache-Control": settings.MEDIA_IMMUTABLE_CACHE_CONTROL,
+        },
+        Conditions=[
+            {"Content-Type": content_type},
+            {"Cache-Control": settings.MEDIA_IMMUTABLE_CACHE_CONTROL},
+            ["content-length-range", 1, max_size],
+        ],
+        ExpiresIn=settings.UPLOAD_URL_TTL,
+    )
+    return {
+        "key": key,
+        "url": post["url"],
+        "fields": post["fields"],
+        "expires_in": settings.UPLOAD_URL_TTL,
+    }
+
+
+def _purpose_for_key(purposes, user_id, key):
+    for purpose in purposes:
+        prefix = _user_prefix(purpose, user_id)
+        name = key[len(prefix):] if key.startswith(prefix) else ""
+        extensions = {ext for exts in PURPOSES[purpose]["content_types"].values() for ext in exts}
+        if _KEY_NAME_RE.fullmatch(name) and os.path.splitext(name)[1] in extensions:
+            return purpose
+    return None
+
+
+def verify_upload(user, purposes, key) -> str:
+    """
+    Проверяет ключ, присланный клиентом после загрузки: выдан этому
+    пользователю под одну из целей, объект есть в хранилище и не больше
+    лимита. Возвращает ключ — его можно присвоить FileField.
+    """
+    if isinstance(purposes, str):
+        purposes = (purposes,)
+    purpose = _purpose_for_key(purposes, user.id, key)
+    if purpose is None:
+        raise serializers.ValidationError("Недопустимый ключ файла.")
+
+    try:
+        size = default_storage.size(key)
+    except Exception:
+        # FileNotFoundError у диска, ClientError (404) у S3
+        raise serializers.ValidationError("Файл не найден в хранилище.")
+    if size > _max_size(purpose):
+        raise serializers.ValidationError("Файл больше допустимого размера.")
+
+    return key
@@ -0,0 +1,40 @@
+import hashlib
+import os
+import re
+
+from django.core.files.storage import FileSystemStorage, storages
+
+# Имена с хешем содержимого (storage.py) и ключи прямой загрузки (services/uploads.py):
+# по такому имени всегда отдаются одни и те же байты
+IMMUTABLE_NAME_RE = re.compile(r"(\.[0-9a-f]{12}|/[0-9a-f]{32})\.[^./]+$")
+
+
+class ContentHashedNameMixin:
+    """
+    Добавляет в имя файла хеш содержимого: campaigns/photo.jpg →
+    campaigns/photo.3f2a9c0b1d4e.jpg. URL меняется вместе с файлом, поэтому
+    медиа можно кэшировать «навсегда» (immutable).
+    """
+
+    hash_length = 12
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+
+        root, ext = os.path.splitext(name)
+        name = f"{root}.{digest.hexdigest()[:self.hash_length]}{ext}"
+        return super().save(name, content, max_length=max_length)
+
+
+class HashedFileSystemStorage(ContentHashedNameMixin, FileSystemStorage):
+    pass
+
+
+def private_storage():
+    """Хранилище закрытых файлов (STORAGES["private"]) — для FileField(storage=...)."""
+    return storages["private"]
@@ -0,0 +1,7 @@
+from storages.backends.s3 import S3Storage
+
+from apps.base.storage import ContentHashedNameMixin
+
+
+class HashedS3Storage(ContentHashedNameMixin, S3Storage):
+    """S3Storage с хешем содержимого в имени (отдельный модуль: boto3 тяжёлый)."""
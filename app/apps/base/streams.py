@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from apps.base.services import realtime
+
+
+def _authenticate(request):
+    """Пользователь по токену API или None (поток кампаний доступен анонимно)."""
+    drf_request = Request(request)
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        result = authentication_class().authenticate(drf_request)
+        if result is not None:
+            return result[0]
+    return None
+
+
+def _campaign_ids(value):
+    ids = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if not part.isdigit():
+            raise ValueError(part)
+        ids.append(int(part))
+    return list(dict.fromkeys(ids))
+
+
+async def _events(channels):
+    # При ошибке subscribe ничего не регистрирует — отписывать нечего
+    queue = await realtime.hub.subscribe(channels)
+    deadline = time.monotonic() + settings.SSE_MAX_SECONDS
+    try:
+        yield b"retry: 5000\n\n"
+        while True:
+            # Соединение ограничено по времени: клиент переподключится
+            # (и заново предъявит токен), а нагрузка перераспределится
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                frame = await asyncio.wait_for(
+                    queue.get(),
+                    timeout=min(settings.SSE_HEARTBEAT_SECONDS, remaining),
+                )
+            except asyncio.TimeoutError:
+                frame = b": ping\n\n"
+            yield frame
+    finally:
+        realtime.hub.unsubscribe(channels, queue)
+
+
+@require_safe
+async def event_stream(request):
+    """
+    Server-Sent Events: прогресс кампаний (?campaigns=1,2,3, без входа) и
+    новые уведомления пользователя (с токеном). Работает только под ASGI
+    (сервис stream_finic): под WSGI поток занимал бы поток воркера.
+
+    События: campaign {campaign_id, raised_delta, donors_delta,
+    donations_delta}, notification {id, title, message, is_read,
+    created_at}, resync — клиент отстал, состояние надо перезапросить.
+    """
+    try:
+        user = await sync_to_async(_authenticate)(request)
+    except APIException as e:
+        return JsonResponse({"detail": str(e.detail)}, status=e.status_code)
+
+    try:
+        campaign_ids = _campaign_ids(request.GET.get("campaigns", ""))
+    except ValueError:
+        return JsonResponse({"detail": "campaigns must be comma-separated ids"}, status=400)
+    if len(campaign_ids) > settings.SSE_MAX_CAMPAIGNS:
+        return JsonResponse(
+            {"detail": f"At most {settings.SSE_MAX_CAMPAIGNS} campaigns per stream"},
+            status=400,
+        )
+
+    channels = [realtime.campaign_channel(pk) for pk in campaign_ids]
+    if user is not None:
+        channels.append(realtime.user_channel(user.pk))
+    if not channels:
+        return JsonResponse({"detail": "Nothing to stream: pass campaigns or a token"}, status=400)
+
+    response = StreamingHttpResponse(_events(channels), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # nginx не должен буферизовать поток
+    response["X-Accel-Buffering"] = "no"
+    return response
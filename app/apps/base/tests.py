@@ -1,3 +1,1370 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from collections import defaultdict
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.db.models import Prefetch
+from django.http import Http404
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.models import DonorProfile, Organization, User
+from apps.base import db_router, streams
+from apps.base import serializers as base_serializers
+from apps.base.cache import LocMemCache
+from apps.base.media import serve_media
+from apps.base.models import (
+    BackgroundTask,
+    Campaign,
+    CampaignImage,
+    Category,
+    Donation,
+    DonationExport,
+    FCMDeviceToken,
+    Hadith,
+    ModerationQueueItem,
+    Notification,
+    OrganizationDonorImpact,
+    OrganizationFollower,
+    Payment,
+    RequestProfile,
+)
+from apps.base.renderers import FastJSONRenderer
+from apps.base.services import (
+    account_deletion,
+    broadcasts,
+    campaigns,
+    exports,
+    home,
+    leaderboard,
+    moderation,
+    partitions,
+    payments,
+    profiling,
+    realtime,
+    retention,
+    tasks,
+    trending,
+)
+from apps.base.utils import fcm, metrics
+from apps.base.utils.compression import choose_encoding
+
+# Каталог с manage.py: подпроцесс должен видеть пакеты apps и core
+APP_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Запас на медленные CI-машины; переопределяется через IMPORT_TIME_BUDGET_MS
+IMPORT_TIME_BUDGET_MS = int(os.environ.get("IMPORT_TIME_BUDGET_MS", 1500))
+
+# SDK, которые должны загружаться только при первом использовании
+LAZY_MODULES = ("firebase_admin", "google.cloud", "googleapiclient", "openpyxl")
+
+def make_organization(username="org", **kwargs):
+    user = User.objects.create(username=username, role="org", phone=f"+996{username}")
+    return Organization.objects.create(user=user, name=kwargs.pop("name", username), **kwargs)
+
+
+def make_donor(username="donor", **kwargs):
+    return User.objects.create(username=username, role="donor", phone=f"+996{username}", **kwargs)
+
+
+def make_campaign(organization, **kwargs):
+    kwargs.setdefault("title", "Campaign")
+    kwargs.setdefault("description", "-")
+    kwargs.setdefault("goal_amount", 10000)
+    return Campaign.objects.create(organization=organization, **kwargs)
+
+
+def make_pending_payment(donor, organization, campaign=None, amount=100):
+    donation = Donation.objects.create(
+        donor=donor,
+        organization=organization,
+        campaign=campaign,
+        amount=amount,
+        status=Donation.Status.PENDING,
+    )
+    return Payment.objects.create(donor=donor, donation=donation, amount=amount)
+
+
+def api_client(user=None):
+    client = APIClient()
+    if user is not None:
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+    return client
+
+
+STARTUP_SCRIPT = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+
+class StartupImportTimeTests(SimpleTestCase):
+    """Регрессии холодного старта: django.setup() + загрузка всех urls."""
+
+    def _import_profile(self):
+        env = os.environ.copy()
+        env.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+        env.setdefault("SECRET_KEY", "import-time")
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+            cwd=APP_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+
+        # Строки вида «import time: self | cumulative | package»
+        profile = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                profile[name.strip()] = (int(cumulative), len(name) - len(name.lstrip()))
+        return profile
+
+    def test_heavy_sdks_are_lazy(self):
+        profile = self._import_profile()
+        loaded = sorted(
+            name for name in profile
+            if any(name == m or name.startswith(m + ".") for m in LAZY_MODULES)
+        )
+        self.assertEqual(loaded, [], "Эти модули должны импортироваться при первом использовании")
+
+    def test_startup_within_budget(self):
+        profile = self._import_profile()
+        # Верхний уровень (отступ в 1 пробел) — модули, импортированные самим скриптом
+        total_ms = sum(us for us, indent in profile.values() if indent == 1) / 1000
+        self.assertLess(
+            total_ms,
+            IMPORT_TIME_BUDGET_MS,
+            f"Импорт при старте занимает {total_ms:.0f} мс (бюджет {IMPORT_TIME_BUDGET_MS} мс)",
+        )
+
+
+class MigrationsTests(TestCase):
+    """Миграции закоммичены и совпадают с моделями: при деплое их не генерируют."""
+
+    def test_no_missing_migrations(self):
+        out = StringIO()
+        try:
+            call_command("makemigrations", check=True, dry_run=True, stdout=out)
+        except SystemExit:
+            self.fail(f"Модели расходятся с миграциями:\n{out.getvalue()}")
+
+    def test_check_waits_for_migrations(self):
+        out = StringIO()
+        call_command("migrate_locked", check=True, stdout=out)
+        self.assertIn("No unapplied migrations", out.getvalue())
+
+        pending = [(SimpleNamespace(app_label="base", name="9999_next"), False)]
+        with mock.patch(
+            "apps.base.management.commands.migrate_locked.pending_migrations",
+            return_value=pending,
+        ):
+            with self.assertRaises(CommandError):
+                call_command("migrate_locked", check=True, timeout=0)
+
+    def test_readiness_probe(self):
+        self.assertEqual(self.client.get("/healthz").status_code, 200)
+        response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            response.json()["checks"],
+            {"database": "ok", "cache": "ok", "migrations": "ok"},
+        )
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        self.org = make_organization()
+        self.donors = [make_donor(f"d{i}", full_name=f"Donor {i}") for i in range(3)]
+
+    def test_points_and_rank_are_incremented(self):
+        leaderboard.apply_impact([
+            (self.donors[0].id, self.org.id, Decimal("150")),
+            (self.donors[0].id, self.org.id, Decimal("20")),
+        ])
+        leaderboard.apply_impact([(self.donors[0].id, self.org.id, Decimal("4900"))])
+
+        profile = DonorProfile.objects.get(user=self.donors[0])
+        self.assertEqual(profile.impact_points, 1 + 1 + 49)
+        self.assertEqual(profile.rank, leaderboard.rank_for_points(51))
+        self.assertEqual(
+            OrganizationDonorImpact.objects.get(organization=self.org, donor=self.donors[0]).impact_points,
+            51,
+        )
+
+    def test_ties_share_position(self):
+        leaderboard.apply_impact([
+            (self.donors[0].id, self.org.id, Decimal("500")),
+            (self.donors[1].id, self.org.id, Decimal("500")),
+            (self.donors[2].id, self.org.id, Decimal("100")),
+        ])
+
+        top = leaderboard.top_donors()
+        self.assertEqual([row["position"] for row in top], [1, 1, 3])
+        self.assertEqual(leaderboard.donor_position(self.donors[2].id)["position"], 3)
+
+    def test_organization_leaderboard_endpoint(self):
+        other = make_organization("other")
+        leaderboard.apply_impact([
+            (self.donors[0].id, self.org.id, Decimal("300")),
+            (self.donors[1].id, other.id, Decimal("900")),
+        ])
+
+        response = api_client(self.donors[0]).get(f"/api/organizations/{self.org.id}/leaderboard/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["donor_id"] for row in response.json()["results"]], [self.donors[0].id])
+        self.assertEqual(response.json()["me"]["impact_points"], 3)
+        self.assertEqual(api_client().get("/api/organizations/0/leaderboard/").status_code, 404)
+
+
+class FakeSortedSetCache(LocMemCache):
+    """Sorted set в памяти вместо Redis — те же методы, что у apps.base.cache.RedisCache."""
+
+    def __init__(self):
+        super().__init__("leaderboard-index", {})
+        self.sets = defaultdict(dict)
+
+    def sorted_set_add(self, key, mapping, version=None):
+        self.sets[key].update(mapping)
+
+    def sorted_set_remove(self, key, members, version=None):
+        for member in members:
+            self.sets[key].pop(member, None)
+
+    def sorted_set_count_above(self, key, score, version=None):
+        return sum(1 for value in self.sets[key].values() if value > score)
+
+    def delete(self, key, version=None):
+        self.sets.pop(key, None)
+        return super().delete(key, version=version)
+
+
+class LeaderboardIndexTests(TestCase):
+    def setUp(self):
+        self.index = FakeSortedSetCache()
+        patcher = mock.patch.object(leaderboard, "_index", return_value=self.index)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.org = make_organization()
+        self.donors = [make_donor(f"d{i}") for i in range(3)]
+        self._apply((0, "500"), (1, "500"), (2, "100"))
+
+    def _apply(self, *entries):
+        with self.captureOnCommitCallbacks(execute=True):
+            leaderboard.apply_impact(
+                [(self.donors[i].id, self.org.id, Decimal(amount)) for i, amount in entries]
+            )
+
+    def test_position_comes_from_index_once_built(self):
+        # До сборки индекса — подсчёт в БД
+        self.assertEqual(leaderboard.donor_position(self.donors[2].id)["position"], 3)
+
+        call_command("rebuild_leaderboard", stdout=StringIO())
+        with self.assertNumQueries(1):
+            self.assertEqual(leaderboard.donor_position(self.donors[2].id)["position"], 3)
+
+        self._apply((2, "900"))
+        self.assertEqual(leaderboard.donor_position(self.donors[2].id)["position"], 1)
+        self.assertEqual(leaderboard.donor_position(self.donors[0].id)["position"], 2)
+        self.assertEqual(
+            leaderboard.donor_position(self.donors[0].id, organization_id=self.org.id)["position"],
+            2,
+        )
+
+    def test_deleted_donors_leave_the_index(self):
+        call_command("rebuild_leaderboard", stdout=StringIO())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            leaderboard.forget_donor(self.donors[0].id)
+            leaderboard.forget_donor(self.donors[0].id, [self.org.id])
+        self.assertEqual(leaderboard.donor_position(self.donors[2].id)["position"], 2)
+        self.assertEqual(
+            leaderboard.donor_position(self.donors[2].id, organization_id=self.org.id)["position"],
+            2,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            leaderboard.forget_organization(self.org.id)
+        self.assertNotIn(leaderboard._index_key(self.org.id), self.index.sets)
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.org = make_organization()
+        self.client = api_client(make_donor())
+
+    def _donate(self, amount=500, key="key-1"):
+        return self.client.post(
+            "/api/donations/",
+            {"amount": amount, "organization_id": self.org.id},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_replay_and_mismatch(self):
+        first = self._donate()
+        second = self._donate()
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(self._donate(amount=600).status_code, 422)
+        self.assertEqual(Donation.objects.count(), 1)
+
+    @override_settings(IDEMPOTENCY_WAIT_TIMEOUT=0.1)
+    def test_concurrent_duplicate_gets_409(self):
+        with mock.patch.object(cache, "add", return_value=False):
+            response = self._donate()
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(Donation.objects.count(), 0)
+
+    def test_lock_is_released_only_by_owner(self):
+        cache.set("lock", "other-request")
+        self.assertFalse(cache.delete_if_equal("lock", "my-request"))
+        self.assertEqual(cache.get("lock"), "other-request")
+        self.assertTrue(cache.delete_if_equal("lock", "other-request"))
+        self.assertIsNone(cache.get("lock"))
+
+
+@override_settings(PAYMENT_WEBHOOK_SECRET="webhook-secret")
+class PaymentSettlementTests(TestCase):
+    url = "/api/payments/webhook/settlements/"
+
+    def setUp(self):
+        self.org = make_organization()
+        self.campaign = make_campaign(self.org)
+        self.donors = [make_donor(f"d{i}") for i in range(2)]
+        self.payments = [
+            make_pending_payment(self.donors[i % 2], self.org, self.campaign) for i in range(4)
+        ]
+
+    def _settle(self, settlements, secret="webhook-secret"):
+        return api_client().post(
+            self.url,
+            {"settlements": settlements},
+            format="json",
+            HTTP_X_WEBHOOK_SECRET=secret,
+        )
+
+    def test_requires_secret(self):
+        response = self._settle([], secret="wrong")
+        self.assertEqual(response.status_code, 403)
+
+    def test_batch_updates_totals_once(self):
+        settlements = [{"payment_id": p.id, "status": "completed"} for p in self.payments[:3]]
+        settlements += [
+            {"payment_id": self.payments[3].id, "status": "failed"},
+            {"payment_id": 999999, "status": "completed"},
+        ]
+
+        response = self._settle(settlements)
+        self.assertEqual(response.json(), {"completed": 3, "failed": 1, "skipped": [999999]})
+
+        self.campaign.refresh_from_db()
+        self.org.refresh_from_db()
+        self.assertEqual(self.campaign.raised_amount, 300)
+        self.assertEqual(self.campaign.donors_count, 2)
+        self.assertEqual(self.org.total_raised, 300)
+        self.assertEqual(
+            Donation.objects.filter(status=Donation.Status.FAILED).get().payment, self.payments[3]
+        )
+
+        # Повтор вебхука ничего не меняет: платежи уже не PENDING
+        response = self._settle(settlements)
+        self.assertEqual(response.json()["completed"], 0)
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.raised_amount, 300)
+
+
+class TrendingTests(TestCase):
+    def setUp(self):
+        self.org = make_organization()
+        self.donor = make_donor()
+
+    def test_first_donation_sets_score(self):
+        # Регрессия: 2^(0 - ~1300) в POWER давал underflow в PostgreSQL
+        # и откатывал завершение платежа
+        campaign = make_campaign(self.org)
+        payments.complete_payments([make_pending_payment(self.donor, self.org, campaign).id])
+
+        campaign.refresh_from_db()
+        expected = trending.score_for(1, timezone.now())
+        self.assertAlmostEqual(campaign.trending_score, expected, delta=0.01)
+
+    def test_increment_far_below_current_score(self):
+        campaign = make_campaign(self.org, trending_score=100_000.0)
+        payments.complete_payments([make_pending_payment(self.donor, self.org, campaign).id])
+
+        campaign.refresh_from_db()
+        self.assertEqual(campaign.trending_score, 100_000.0)
+
+    def test_combine_matches_sql_and_ordering(self):
+        now = timezone.now()
+        hot, cold = make_campaign(self.org), make_campaign(self.org)
+        payments.complete_payments([
+            make_pending_payment(self.donor, self.org, hot).id,
+            make_pending_payment(self.donor, self.org, hot).id,
+            make_pending_payment(self.donor, self.org, cold).id,
+        ])
+        payments.complete_payments([make_pending_payment(self.donor, self.org, hot).id])
+
+        hot.refresh_from_db()
+        expected = trending.combine(trending.score_for(2, now), trending.score_for(1, now))
+        self.assertAlmostEqual(hot.trending_score, expected, delta=0.01)
+        self.assertEqual(trending.combine(0, expected), expected)
+
+        response = api_client().get("/api/campaigns/?ordering=trending")
+        ids = [row["id"] for row in response.json()["results"]]
+        self.assertEqual(ids[:2], [hot.id, cold.id])
+
+
+class DonationExportTests(TestCase):
+    def setUp(self):
+        self.private_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.private_root, ignore_errors=True)
+        # storage поля вычисляется при импорте модели — подменяем на временный каталог
+        storage_patch = mock.patch.object(
+            DonationExport._meta.get_field("file"),
+            "storage",
+            FileSystemStorage(location=self.private_root),
+        )
+        storage_patch.start()
+        self.addCleanup(storage_patch.stop)
+
+        self.org = make_organization()
+        campaign = make_campaign(self.org, title='=HYPERLINK("http://evil","x")')
+        Donation.objects.create(
+            donor=make_donor(full_name="+7 Donor"),
+            organization=self.org,
+            campaign=campaign,
+            amount=100,
+        )
+        self.client = api_client(self.org.user)
+
+    def test_stream_escapes_formulas(self):
+        response = self.client.get("/api/stats/organization/export/")
+        content = b"".join(response.streaming_content).decode("utf-8-sig")
+
+        self.assertIn("\"'=HYPERLINK(\"\"http://evil\"\",\"\"x\"\")\"", content)
+        self.assertIn("'+7 Donor", content)
+
+    def test_background_export_is_private(self):
+        export_id = self.client.post(
+            "/api/stats/organization/exports/", {"file_format": "csv"}, format="json"
+        ).json()["id"]
+        exports.build_export(export_id)
+
+        export = DonationExport.objects.get(id=export_id)
+        self.assertTrue(export.file.path.startswith(self.private_root))
+
+        detail = self.client.get(f"/api/stats/organization/exports/{export_id}/").json()
+        self.assertTrue(detail["file"].endswith(f"/exports/{export_id}/download/"))
+
+        response = self.client.get(f"/api/stats/organization/exports/{export_id}/download/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("'+7 Donor", b"".join(response.streaming_content).decode("utf-8-sig"))
+
+        other = api_client(make_organization("other").user)
+        self.assertEqual(other.get(f"/api/stats/organization/exports/{export_id}/download/").status_code, 404)
+
+    def _run_export_task(self, reclaim_before_rows):
+        export = DonationExport.objects.create(organization=self.org, file_format="csv")
+        tasks.enqueue("apps.base.services.exports.build_export", {"export_id": export.id})
+        [task] = tasks.claim()
+        write_csv = exports._WRITERS[DonationExport.FileFormat.CSV]
+        reclaimed = []
+
+        def slow_writer(fileobj, organization_id, filters):
+            # Выгрузка идёт дольше STALE_AFTER; другой воркер пробует забрать
+            # задачу до очередной строки (heartbeat) или после неё
+            BackgroundTask.objects.update(updated_at=timezone.now() - tasks.STALE_AFTER * 2)
+            if reclaim_before_rows:
+                reclaimed.extend(tasks.claim())
+            count = write_csv(fileobj, organization_id, filters)
+            reclaimed.extend(tasks.claim())
+            return count
+
+        with mock.patch.dict(exports._WRITERS, {DonationExport.FileFormat.CSV: slow_writer}), \
+                mock.patch.object(tasks, "HEARTBEAT_INTERVAL", datetime.timedelta(0)):
+            finished = tasks.run_task(task)
+        export.refresh_from_db()
+        return finished, export, reclaimed
+
+    def test_long_export_is_not_reclaimed(self):
+        finished, export, reclaimed = self._run_export_task(reclaim_before_rows=False)
+
+        self.assertTrue(finished)
+        self.assertEqual(reclaimed, [])
+        self.assertEqual(export.status, DonationExport.Status.DONE)
+        self.assertEqual(export.rows_count, 1)
+
+    def test_reclaimed_export_stops_without_touching_state(self):
+        finished, export, reclaimed = self._run_export_task(reclaim_before_rows=True)
+        self.assertEqual(len(reclaimed), 1)
+
+        self.assertFalse(finished)
+        self.assertEqual(export.status, DonationExport.Status.RUNNING)
+        task = BackgroundTask.objects.get()
+        self.assertEqual((task.status, task.attempts), (BackgroundTask.Status.RUNNING, 2))
+
+
+class DonationStatsTests(TestCase):
+    def setUp(self):
+        self.org = make_organization()
+        self.donor = make_donor()
+        Donation.objects.create(donor=self.donor, organization=self.org, amount=100)
+        old = Donation.objects.create(donor=self.donor, organization=self.org, amount=40)
+        Donation.objects.filter(id=old.id).update(created_at=timezone.now() - datetime.timedelta(days=3 * 365))
+
+    def test_monthly_covers_all_time_by_default(self):
+        for client, url in (
+            (api_client(self.donor), "/api/stats/donor/"),
+            (api_client(self.org.user), "/api/stats/organization/"),
+        ):
+            monthly = client.get(url).json()["monthly"]
+            self.assertEqual(len(monthly), 2, url)
+
+            monthly = client.get(url, {"months": 12}).json()["monthly"]
+            self.assertEqual([Decimal(str(row["total"])) for row in monthly], [Decimal("100")], url)
+
+
+class FastJSONRendererTests(TestCase):
+    """Ответы API на orjson совпадают с JSONRenderer DRF байт в байт."""
+
+    def setUp(self):
+        self.org = make_organization(name="Фонд «Мээрим»")
+        self.donor = make_donor(full_name="Айбек\u2028Test")
+        campaign = make_campaign(self.org, goal_amount=Decimal("12345.67"))
+        payment = make_pending_payment(self.donor, self.org, campaign, amount=Decimal("100.50"))
+        payments.complete_payments([payment.id])
+        leaderboard.apply_impact([(self.donor.id, self.org.id, Decimal("100.50"))])
+
+    def assertSameAsDRF(self, client, url):
+        response = client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        self.assertEqual(response.content, JSONRenderer().render(response.data), url)
+
+    def test_public_endpoints(self):
+        client = api_client()
+        for url in (
+            "/api/campaigns/",
+            "/api/organizations/",
+            f"/api/organizations/{self.org.id}/",
+            "/api/categories/",
+            "/api/leaderboard/",
+        ):
+            self.assertSameAsDRF(client, url)
+
+    def test_donor_and_organization_endpoints(self):
+        donor = api_client(self.donor)
+        for url in ("/api/donations/my/", "/api/stats/donor/", "/api/notifications/"):
+            self.assertSameAsDRF(donor, url)
+        self.assertSameAsDRF(api_client(self.org.user), "/api/stats/organization/")
+
+    def test_values_serializers_match_model_serializers(self):
+        # Кампания без категории и без обложки, донат без кампании
+        bare = make_campaign(self.org, title="Без категории")
+        covered = make_campaign(
+            self.org,
+            category=Category.objects.create(name="Еда", slug="food"),
+            image="campaigns/cover.jpg",
+        )
+        CampaignImage.objects.create(campaign=covered, image="campaigns/photo.jpg")
+        Donation.objects.create(donor=self.donor, organization=self.org, amount=Decimal("7.00"))
+        self.assertIsNone(bare.category_id)
+
+        context = {"request": RequestFactory().get("/api/campaigns/")}
+        render = JSONRenderer().render
+
+        campaigns = Campaign.objects.order_by("-created_at", "-id")
+        expected = base_serializers.CampaignSerializer(
+            campaigns.select_related("organization", "category").prefetch_related(
+                Prefetch("images", queryset=CampaignImage.objects.order_by("id"))
+            ),
+            many=True,
+            context=context,
+        ).data
+        rows = campaigns.values(*base_serializers.CampaignValuesSerializer.columns_for())
+        actual = base_serializers.CampaignValuesSerializer(rows, context=context).data
+        self.assertEqual(render(actual), render(expected))
+        self.assertIn(b"http://testserver/", render(actual))
+
+        donations = Donation.objects.filter(donor=self.donor).order_by("-created_at", "-id")
+        expected = base_serializers.DonationSerializer(
+            donations.select_related("organization", "campaign"), many=True, context=context
+        ).data
+        rows = donations.values(*base_serializers.DonationValuesSerializer.columns_for())
+        actual = base_serializers.DonationValuesSerializer(rows, context=context).data
+        self.assertEqual(render(actual), render(expected))
+        self.assertEqual({"campaign_title" in row for row in actual}, {True, False})
+
+    def test_values_outside_orjson_fall_back(self):
+        data = {"big": 2 ** 70, "amount": Decimal("0.10"), "line": "a\u2029b"}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+class SparseFieldsetsTests(TestCase):
+    def setUp(self):
+        self.org = make_organization()
+        category = Category.objects.create(name="Category", slug="category")
+        for i in range(3):
+            campaign = make_campaign(self.org, category=category, description="d" * 500)
+            CampaignImage.objects.create(campaign=campaign, image="campaigns/photo.jpg")
+
+    def test_fields_limit_columns_and_prefetch(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client().get("/api/campaigns/?fields=id,title,category_slug")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()["results"][0]), {"id", "title", "category_slug"})
+        sql = " ".join(q["sql"] for q in queries.captured_queries)
+        self.assertNotIn("campaignimage", sql)
+        self.assertNotIn('"description"', sql)
+
+    def test_omit_and_unknown_field(self):
+        row = api_client().get("/api/campaigns/?omit=description,images").json()["results"][0]
+        self.assertNotIn("description", row)
+        self.assertIn("title", row)
+        self.assertEqual(api_client().get("/api/campaigns/?fields=nope").status_code, 400)
+
+    def test_gzip_compression(self):
+        client = api_client()
+        plain = client.get("/api/campaigns/")
+        compressed = client.get("/api/campaigns/", HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", compressed["Vary"])
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        identity = client.get("/api/campaigns/", HTTP_ACCEPT_ENCODING="identity")
+        self.assertFalse(identity.has_header("Content-Encoding"))
+
+
+# Секции в текущем потоке: в TestCase другие потоки не видят данных теста
+@override_settings(HOME_FEED_WORKERS=0)
+class HomeFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.org = make_organization()
+        Category.objects.create(name="Category", slug="category")
+        make_campaign(self.org)
+        Hadith.objects.create(text="text", source="source")
+        self.donor = make_donor()
+
+    def test_anonymous_sections(self):
+        data = api_client().get("/api/home/").json()
+
+        self.assertEqual(set(data), {"categories", "campaigns", "hadith", "errors"})
+        self.assertEqual(data["errors"], [])
+        self.assertNotIn("description", data["campaigns"][0])
+        self.assertEqual(set(api_client().get("/api/home/?sections=hadith").json()), {"hadith", "errors"})
+        self.assertEqual(api_client().get("/api/home/?sections=unknown").status_code, 400)
+
+    def test_donor_sections(self):
+        Notification.objects.create(user=self.donor, title="t", message="m")
+        Donation.objects.create(donor=self.donor, organization=self.org, amount=50)
+
+        data = api_client(self.donor).get("/api/home/").json()
+        self.assertEqual(data["notifications"]["unread_count"], 1)
+        self.assertEqual(data["stats"]["total_donations"], 1)
+
+    def test_public_sections_cached_until_invalidated(self):
+        api_client().get("/api/home/?sections=campaigns")
+        make_campaign(self.org, title="Fresh")
+
+        cached = api_client().get("/api/home/?sections=campaigns").json()["campaigns"]
+        self.assertEqual(len(cached), 1)
+        home.invalidate("campaigns")
+        fresh = api_client().get("/api/home/?sections=campaigns").json()["campaigns"]
+        self.assertEqual(len(fresh), 2)
+
+
+@override_settings(HOME_FEED_WORKERS=2, HOME_FEED_SECTION_TIMEOUT=0.2)
+class HomeFeedPoolTests(SimpleTestCase):
+    def setUp(self):
+        # Свой пул на тест: размер берётся из настроек при создании
+        for name in ("_executor", "_slots"):
+            patcher = mock.patch.object(home, name, None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(lambda: home._executor and home._executor.shutdown(wait=True))
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+        builders = {
+            "slow": lambda context: self.release.wait(5),
+            "replica": lambda context: (db_router._replica_reads.get(), threading.current_thread().name),
+        }
+        patcher = mock.patch.dict(home._BUILDERS, builders)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_sections_see_request_context(self):
+        token = db_router.enable_replica_reads()
+        try:
+            replica_reads, thread = home.build_home({}, ["replica"])["replica"]
+        finally:
+            db_router.disable_replica_reads(token)
+
+        self.assertTrue(replica_reads)
+        self.assertTrue(thread.startswith("home-feed"))
+
+    def test_timed_out_sections_do_not_block_the_pool(self):
+        data = home.build_home({}, ["slow", "slow"])
+        self.assertEqual(data["errors"], ["slow", "slow"])
+
+        # Оба потока ещё заняты — секция считается в текущем потоке
+        replica_reads, thread = home.build_home({}, ["replica"])["replica"]
+        self.assertEqual(thread, threading.current_thread().name)
+
+        self.release.set()
+        home._executor.shutdown(wait=True)
+        self.assertTrue(home._slots.acquire(blocking=False))
+
+
+class CampaignSweepTests(TestCase):
+    def test_finishes_expired_and_funded_campaigns(self):
+        org = make_organization()
+        today = timezone.localdate()
+        expired = make_campaign(org, end_date=today - datetime.timedelta(days=1))
+        funded = make_campaign(org, goal_amount=1000, raised_amount=1000)
+        ends_today = make_campaign(org, end_date=today)
+        paused = make_campaign(org, end_date=today - datetime.timedelta(days=3), status="paused")
+        version = home.section_version("campaigns")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            swept = campaigns.sweep_campaigns(chunk_size=1)
+
+        self.assertEqual(swept, 2)
+        statuses = dict(Campaign.objects.values_list("id", "status"))
+        self.assertEqual(statuses[expired.id], "completed")
+        self.assertEqual(statuses[funded.id], "completed")
+        self.assertEqual(statuses[ends_today.id], "active")
+        self.assertEqual(statuses[paused.id], "paused")
+        self.assertEqual(Notification.objects.filter(user=org.user).count(), 2)
+        self.assertEqual(home.section_version("campaigns"), version + 1)
+        self.assertEqual(campaigns.sweep_campaigns(), 0)
+
+
+class BroadcastTests(TestCase):
+    def setUp(self):
+        self.org = make_organization()
+        self.donors = [make_donor(f"d{i}") for i in range(23)]
+        FCMDeviceToken.objects.bulk_create(
+            [FCMDeviceToken(user=donor, token=f"token-{donor.id}") for donor in self.donors[:12]]
+        )
+
+    def test_follow_and_unfollow(self):
+        client = api_client(self.donors[0])
+        url = f"/api/organizations/{self.org.id}/follow/"
+
+        self.assertEqual(client.post(url).json()["followers_count"], 1)
+        self.assertEqual(client.post(url).json()["followers_count"], 1)
+        self.assertEqual(client.delete(url).json(), {"following": False, "followers_count": 0})
+
+    @mock.patch.object(broadcasts, "PUSH_TOKENS_CHUNK_SIZE", 5)
+    @mock.patch.object(broadcasts, "FOLLOWERS_CHUNK_SIZE", 10)
+    def test_delivered_in_chunks(self):
+        OrganizationFollower.objects.bulk_create(
+            [OrganizationFollower(organization=self.org, user=donor) for donor in self.donors]
+        )
+        broadcasts.broadcast_to_followers(self.org.id, "Title", "Message")
+
+        with mock.patch("apps.base.utils.fcm.send_push_notification") as send_push:
+            while tasks.run_pending(50):
+                pass
+
+        self.assertEqual(Notification.objects.count(), 23)
+        self.assertEqual(sum(len(call.args[0]) for call in send_push.call_args_list), 12)
+        self.assertFalse(BackgroundTask.objects.exclude(status=BackgroundTask.Status.DONE).exists())
+
+    def test_reclaimed_chunk_is_not_delivered_twice(self):
+        # Второй воркер забрал «брошенную» задачу, хотя первый уже закоммитил пачку
+        OrganizationFollower.objects.bulk_create(
+            [OrganizationFollower(organization=self.org, user=donor) for donor in self.donors[:3]]
+        )
+        task = broadcasts.broadcast_to_followers(self.org.id, "Title", "Message")
+        [claimed] = tasks.claim()
+
+        self.assertTrue(tasks.run_task(claimed))
+        self.assertTrue(tasks.run_task(claimed))
+        self.assertEqual(Notification.objects.count(), 3)
+        task.refresh_from_db()
+        self.assertEqual(task.status, BackgroundTask.Status.DONE)
+
+
+class CompressionNegotiationTests(SimpleTestCase):
+    def test_choose_encoding(self):
+        self.assertEqual(choose_encoding("gzip, deflate, br"), "br")
+        self.assertEqual(choose_encoding("gzip, br;q=0.5"), "gzip")
+        self.assertEqual(choose_encoding("*;q=0.1, gzip;q=0"), "br")
+        self.assertIsNone(choose_encoding("identity"))
+        self.assertIsNone(choose_encoding("br;q=0, gzip;q=0"))
+
+
+class OpenAPISchemaTests(TestCase):
+    def test_prebuilt_schema_with_etag(self):
+        plain = self.client.get("/api/schema/")
+        self.assertEqual(plain.status_code, 200)
+        schema = plain.content
+
+        compressed = self.client.get("/api/schema/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(compressed.content), schema)
+        self.assertNotEqual(compressed["ETag"], plain["ETag"])
+
+        cached = self.client.get("/api/schema/", HTTP_IF_NONE_MATCH=plain["ETag"])
+        self.assertEqual(cached.status_code, 304)
+
+
+class DirectUploadKeysTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media_setting = override_settings(MEDIA_ROOT=self.media_root)
+        media_setting.enable()
+        self.addCleanup(media_setting.disable)
+
+        self.org = make_organization()
+        self.client = api_client(self.org.user)
+
+    def _uploaded(self, key, size=10):
+        # Объект, загруженный клиентом напрямую (по ключу из /api/uploads/)
+        path = Path(self.media_root, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * size)
+        return key
+
+    def _create_campaign(self, **data):
+        return self.client.post(
+            "/api/campaigns/create/",
+            {"title": "Campaign", "description": "-", "goal_amount": "100", **data},
+            format="json",
+        )
+
+    def test_uploads_disabled_without_s3(self):
+        response = self.client.post(
+            "/api/uploads/",
+            {"purpose": "campaign_image", "filename": "a.jpg", "content_type": "image/jpeg", "size": 10},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_campaign_attaches_uploaded_keys(self):
+        cover = self._uploaded(f"campaigns/{self.org.user_id}/{'a' * 32}.jpg")
+        extra = self._uploaded(f"campaigns/{self.org.user_id}/{'b' * 32}.png")
+
+        response = self._create_campaign(image_key=cover, image_keys=[extra])
+        self.assertEqual(response.status_code, 201, response.content)
+        campaign = Campaign.objects.get()
+        self.assertEqual(campaign.image.name, cover)
+        self.assertEqual([image.image.name for image in campaign.images.all()], [extra])
+
+    def test_rejects_foreign_and_missing_keys(self):
+        other = make_organization("other")
+        foreign = self._uploaded(f"campaigns/{other.user_id}/{'c' * 32}.jpg")
+        missing = f"campaigns/{self.org.user_id}/{'d' * 32}.jpg"
+
+        self.assertEqual(self._create_campaign(image_key=foreign).status_code, 400)
+        self.assertEqual(self._create_campaign(image_key=missing).status_code, 400)
+        self.assertFalse(Campaign.objects.exists())
+
+
+class MediaServingTests(SimpleTestCase):
+    content = bytes(range(256)) * 100
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media_setting = override_settings(MEDIA_ROOT=self.media_root, MEDIA_SERVE_MODE="django")
+        media_setting.enable()
+        self.addCleanup(media_setting.disable)
+
+        self.name = default_storage.save("reports/media/v.mp4", ContentFile(self.content, name="v.mp4"))
+
+    def _get(self, path, **headers):
+        return serve_media(RequestFactory().get(f"/media/{path}", **headers), path)
+
+    def test_hashed_name_is_immutable(self):
+        self.assertRegex(self.name, r"^reports/media/v\.[0-9a-f]{12}\.mp4$")
+        response = self._get(self.name)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+
+        Path(self.media_root, "old.jpg").write_bytes(b"1")
+        self.assertNotIn("immutable", self._get("old.jpg")["Cache-Control"])
+
+    def test_ranges(self):
+        response = self._get(self.name, HTTP_RANGE="bytes=10-19")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(self.content)}")
+        self.assertEqual(b"".join(response.streaming_content), self.content[10:20])
+
+        suffix = self._get(self.name, HTTP_RANGE="bytes=-5")
+        self.assertEqual(b"".join(suffix.streaming_content), self.content[-5:])
+        self.assertEqual(self._get(self.name, HTTP_RANGE="bytes=30000-").status_code, 416)
+        stale = self._get(self.name, HTTP_RANGE="bytes=0-1", HTTP_IF_RANGE='"old"')
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(self._get(self.name, HTTP_IF_NONE_MATCH=stale["ETag"]).status_code, 304)
+
+    def test_path_traversal_and_proxy_offload(self):
+        with self.assertRaises(Http404):
+            self._get("../../etc/passwd")
+
+        with self.settings(MEDIA_SERVE_MODE="accel"):
+            response = self._get(self.name)
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-media/" + self.name)
+        self.assertEqual(response.content, b"")
+
+
+class AccountDeletionTests(TestCase):
+    def _run_tasks(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            while tasks.run_pending(10):
+                pass
+
+    def _completed_donation(self, donor, organization, amount):
+        Donation.objects.create(
+            donor=donor,
+            organization=organization,
+            amount=amount,
+            status=Donation.Status.COMPLETED,
+        )
+        leaderboard.apply_impact([(donor.id, organization.id, Decimal(amount))])
+
+    def test_organization_deletion_revokes_donor_impact(self):
+        org = make_organization()
+        other = make_organization("other")
+        donor = make_donor()
+        self._completed_donation(donor, org, 5000)
+        self._completed_donation(donor, org, 100)
+        self._completed_donation(donor, other, 300)
+        make_pending_payment(donor, org, amount=900)
+        self.assertEqual(DonorProfile.objects.get(user=donor).rank, leaderboard.rank_for_points(54))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            account_deletion.request_account_deletion(org.user_id)
+        with mock.patch.object(account_deletion, "BATCH_SIZE", 2):
+            self._run_tasks()
+
+        self.assertFalse(Organization.objects.filter(pk=org.pk).exists())
+        profile = DonorProfile.objects.get(user=donor)
+        self.assertEqual(profile.impact_points, 3)
+        self.assertEqual(profile.rank, leaderboard.rank_for_points(3))
+        self.assertEqual(
+            list(OrganizationDonorImpact.objects.values_list("organization_id", "impact_points")),
+            [(other.id, 3)],
+        )
+        self.assertEqual(Donation.objects.filter(donor=donor).count(), 1)
+
+    def test_reclaimed_step_does_not_fork_the_chain(self):
+        org = make_organization()
+        campaign = make_campaign(org, raised_amount=300, donors_count=1)
+        donor = make_donor()
+        for amount in (100, 200):
+            Donation.objects.create(
+                donor=donor,
+                organization=org,
+                campaign=campaign,
+                amount=amount,
+                status=Donation.Status.COMPLETED,
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            account_deletion.request_account_deletion(donor.id)
+
+        with mock.patch.object(account_deletion, "BATCH_SIZE", 1):
+            task = tasks.claim(1)[0]
+            self.assertTrue(tasks.run_task(task))
+            # Воркер упал после коммита: ту же задачу забрали и выполнили снова
+            self.assertTrue(tasks.run_task(task))
+            self.assertEqual(BackgroundTask.objects.filter(status=BackgroundTask.Status.PENDING).count(), 1)
+            self._run_tasks()
+
+        campaign.refresh_from_db()
+        self.assertEqual((campaign.raised_amount, campaign.donors_count), (0, 0))
+        self.assertFalse(User.objects.filter(pk=donor.pk).exists())
+
+    def test_files_are_deleted_from_their_own_storage(self):
+        private_root, media_root = tempfile.mkdtemp(), tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, private_root, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        private = FileSystemStorage(location=private_root)
+        public = FileSystemStorage(location=media_root)
+        org = make_organization()
+
+        with (
+            mock.patch.object(DonationExport._meta.get_field("file"), "storage", private),
+            mock.patch.object(Organization._meta.get_field("logo"), "storage", public),
+        ):
+            export_name = private.save("exports/donations.csv", ContentFile(b"1"))
+            public.save(export_name, ContentFile(b"public"))
+            logo_name = public.save("logos/org.png", ContentFile(b"1"))
+            DonationExport.objects.create(organization=org, file=export_name)
+            Organization.objects.filter(pk=org.pk).update(logo=logo_name)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                account_deletion.request_account_deletion(org.user_id)
+            self._run_tasks()
+
+        self.assertFalse(private.exists(export_name))
+        self.assertTrue(public.exists(export_name))
+        self.assertFalse(public.exists(logo_name))
+
+
+@override_settings(MODERATION_EMAILS=["moderator@example.com"])
+class ModerationDigestTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.org = make_organization()
+        self.campaign = make_campaign(self.org)
+        for i in range(3):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = api_client(make_donor(f"d{i}")).post(
+                    "/api/reports/",
+                    {"content_type": "campaign", "content_id": self.campaign.id, "reason": f"spam {i}"},
+                    format="json",
+                )
+            self.assertEqual(response.status_code, 201, response.content)
+        BackgroundTask.objects.update(run_after=timezone.now())
+
+    def _run_tasks(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            while tasks.run_pending(10):
+                pass
+
+    def test_reports_are_grouped_into_one_email(self):
+        self.assertEqual(BackgroundTask.objects.count(), 1)
+        self.assertEqual(len(mail.outbox), 0)
+
+        self._run_tasks()
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("3 новых", mail.outbox[0].subject)
+        self.assertEqual(mail.outbox[0].to, ["moderator@example.com"])
+        item = ModerationQueueItem.objects.get()
+        self.assertEqual((item.reports_count, item.pending_count), (3, 0))
+
+    def test_smtp_failure_is_retried_after_reset(self):
+        with (
+            mock.patch("apps.base.services.moderation.send_mail", side_effect=OSError("smtp down")),
+            self.assertLogs("apps.base.services.tasks", "ERROR"),
+        ):
+            self._run_tasks()
+
+        self.assertEqual(ModerationQueueItem.objects.get().pending_count, 0)
+        email_task = BackgroundTask.objects.get(name=moderation._EMAIL_TASK_NAME)
+        self.assertEqual(email_task.status, BackgroundTask.Status.PENDING)
+        self.assertEqual(len(mail.outbox), 0)
+
+        BackgroundTask.objects.update(run_after=timezone.now())
+        self._run_tasks()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("spam 2", mail.outbox[0].body)
+
+
+class ReplicaPinTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _request(self, user=None, **meta):
+        request = RequestFactory().get("/", REMOTE_ADDR="10.0.0.2", **meta)
+        request.user = user or AnonymousUser()
+        return request
+
+    def test_anonymous_clients_are_not_pinned_by_proxy_address(self):
+        db_router.pin_to_primary(self._request(HTTP_X_REAL_IP="1.1.1.1"))
+        self.assertFalse(db_router.is_pinned(self._request(HTTP_X_REAL_IP="1.1.1.1")))
+
+        user = SimpleNamespace(is_authenticated=True, pk=7)
+        db_router.pin_to_primary(self._request(user))
+        self.assertTrue(db_router.is_pinned(self._request(user)))
+
+    @override_settings(REPLICA_PIN_IP_HEADER="HTTP_X_FORWARDED_FOR")
+    def test_ip_comes_from_trusted_proxy_header(self):
+        db_router.pin_to_primary(self._request(HTTP_X_FORWARDED_FOR="6.6.6.6, 1.1.1.1"))
+
+        self.assertTrue(db_router.is_pinned(self._request(HTTP_X_FORWARDED_FOR="1.1.1.1")))
+        self.assertFalse(db_router.is_pinned(self._request(HTTP_X_FORWARDED_FOR="2.2.2.2")))
+        self.assertFalse(db_router.is_pinned(self._request()))
+
+
+@skipUnless(connection.vendor == "postgresql", "Partitioning requires PostgreSQL")
+class PartitionConversionTests(TransactionTestCase):
+    table = "partition_probe"
+
+    def setUp(self):
+        self.model = SimpleNamespace(_meta=SimpleNamespace(db_table=self.table))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TABLE "{self.table}" (id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY, '
+                "created_at timestamptz NOT NULL, note text NOT NULL)"
+            )
+            cursor.execute(f'CREATE INDEX "{self.table}_note_idx" ON "{self.table}" (note)')
+            cursor.execute(
+                f"INSERT INTO \"{self.table}\" (created_at, note) "
+                "SELECT now() - make_interval(days => n), 'old' FROM generate_series(1, 50) n"
+            )
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS "{self.table}" CASCADE')
+
+    def _fetch(self, sql, params=None):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def test_convert_attaches_prebuilt_index_without_leftover_check(self):
+        prebuilt = []
+        prepare = partitions._prepare_for_attach
+
+        def prepare_and_remember(table, boundary):
+            prepare(table, boundary)
+            prebuilt.extend(self._fetch("SELECT to_regclass(%s)::oid", [f"{table}_id_created_at_uniq"]))
+
+        with mock.patch.object(partitions, "_prepare_for_attach", prepare_and_remember):
+            legacy = partitions.convert_table(self.model, ahead=1)
+
+        self.assertTrue(partitions.is_partitioned(self.table))
+        self.assertEqual(partitions.partitions(self.table)[0][0], legacy)
+        # Первичный ключ секции — индекс, построенный CONCURRENTLY до блокировки
+        self.assertIn(
+            prebuilt[0],
+            self._fetch(
+                "SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(%s)",
+                [f"{self.table}_pkey"],
+            ),
+        )
+        self.assertEqual(
+            self._fetch(
+                "SELECT conname FROM pg_constraint WHERE contype = 'c' "
+                "AND conrelid IN (to_regclass(%s), to_regclass(%s))",
+                [self.table, legacy],
+            ),
+            [],
+        )
+
+        self._fetch(f"INSERT INTO \"{self.table}\" (created_at, note) VALUES (now(), 'new') RETURNING id")
+        self.assertEqual(self._fetch(f'SELECT MAX(id), COUNT(*) FROM "{self.table}"'), [(51, 51)])
+        self.assertEqual(partitions.convert_table(self.model), "")
+
+    def test_convert_requires_autocommit(self):
+        with transaction.atomic(), self.assertRaises(partitions.PartitionError):
+            partitions.convert_table(self.model)
+        self.assertFalse(partitions.is_partitioned(self.table))
+
+
+class RetentionTests(TestCase):
+    def setUp(self):
+        self.private_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.private_root, ignore_errors=True)
+        storages = {
+            **settings.STORAGES,
+            "private": {
+                "BACKEND": "django.core.files.storage.FileSystemStorage",
+                "OPTIONS": {"location": self.private_root},
+            },
+        }
+        self.enterContext(override_settings(STORAGES=storages, RETENTION_BATCH_PAUSE=0))
+
+        self.donor = make_donor()
+        old = timezone.now() - datetime.timedelta(days=365)
+        Notification.objects.bulk_create([
+            Notification(user=self.donor, title=f"n{i}", message="-", is_read=i < 3) for i in range(4)
+        ])
+        Notification.objects.update(created_at=old)
+        FCMDeviceToken.objects.create(user=self.donor, token="device-secret")
+        FCMDeviceToken.objects.update(updated_at=old)
+
+    def _archived(self):
+        return sorted(str(path.relative_to(self.private_root)) for path in Path(self.private_root).rglob("*.gz"))
+
+    def test_notifications_are_archived_to_private_storage(self):
+        self.assertEqual(retention.apply_policy("notifications"), 3)
+
+        archives = self._archived()
+        self.assertEqual(len(archives), 1)
+        self.assertTrue(archives[0].startswith(f"{settings.RETENTION_ARCHIVE_PREFIX}notifications/"))
+        self.assertFalse(default_storage.exists(archives[0]))
+        with gzip.open(Path(self.private_root, archives[0])) as archive:
+            self.assertEqual([json.loads(line)["title"] for line in archive], ["n0", "n1", "n2"])
+        self.assertEqual(Notification.objects.get().title, "n3")
+
+    def test_push_tokens_are_deleted_without_archive(self):
+        self.assertEqual(retention.apply_policy("fcm_tokens"), 1)
+        self.assertFalse(FCMDeviceToken.objects.exists())
+        self.assertEqual(self._archived(), [])
+
+
+@skipUnless(metrics.enabled(), "prometheus_client is not installed")
+class MetricsTests(TestCase):
+    def _sample(self, name, **labels):
+        return metrics.prometheus_client.REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_request_latency_and_db_queries_per_view(self):
+        view = resolve("/api/categories/").view_name
+        labels = {"method": "GET", "view": view, "status": "200"}
+        requests_before = self._sample("finic_http_request_duration_seconds_count", **labels)
+        queries_before = self._sample("finic_http_request_db_queries_sum", view=view)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get("/api/categories/").status_code, 200)
+
+        self.assertEqual(self._sample("finic_http_request_duration_seconds_count", **labels), requests_before + 1)
+        self.assertEqual(
+            self._sample("finic_http_request_db_queries_sum", view=view),
+            queries_before + len(queries),
+        )
+
+    def test_business_counters(self):
+        hits = self._sample("finic_cache_requests_total", result="hit")
+        misses = self._sample("finic_cache_requests_total", result="miss")
+        cache.set("metrics-test", 1)
+        cache.get("metrics-test")
+        cache.get("metrics-test-missing")
+        self.assertEqual(self._sample("finic_cache_requests_total", result="hit"), hits + 1)
+        self.assertEqual(self._sample("finic_cache_requests_total", result="miss"), misses + 1)
+
+        failures = self._sample("finic_push_messages_total", result="failure")
+        with mock.patch.object(fcm, "_send_multicast", return_value={"success": 2, "failure": 1}):
+            fcm.send_push_notification(["a", "b", "c"], "t", "b")
+        self.assertEqual(self._sample("finic_push_messages_total", result="failure"), failures + 1)
+
+    @override_settings(METRICS_TOKEN="scrape-token")
+    def test_metrics_endpoint_requires_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-token")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"finic_http_request_duration_seconds", response.content)
+
+
+class RequestProfilingTests(TestCase):
+    url = "/api/categories/"
+
+    def setUp(self):
+        cache.clear()
+        Category.objects.create(name="Food")
+        profiling._target_cache[:] = [None, float("-inf")]
+        self.addCleanup(profiling._target_cache.__setitem__, slice(None), [None, float("-inf")])
+
+    def test_staff_header_profiles_request(self):
+        staff = make_donor("staff", is_staff=True)
+
+        response = api_client(staff).get(self.url, HTTP_X_PROFILE="1")
+
+        profile = RequestProfile.objects.get(pk=response["X-Profile-Id"])
+        self.assertEqual(profile.trigger, RequestProfile.Trigger.HEADER)
+        self.assertEqual(profile.user, staff)
+        self.assertEqual(profile.view_name, resolve(self.url).view_name)
+        self.assertEqual(profile.query_count, len(profile.queries))
+        self.assertGreater(profile.query_count, 0)
+        # SQL хранится без параметров
+        self.assertEqual({key for query in profile.queries for key in query}, {"sql", "ms", "many"})
+        # Свёрнутые стеки: "кадр;кадр;SQL ... вес" — вход flamegraph.pl и speedscope
+        for line in profile.sql_stacks.splitlines():
+            stack, weight = line.rsplit(" ", 1)
+            self.assertIn("SQL ", stack)
+            self.assertGreater(int(weight), 0)
+
+    def test_header_from_non_staff_is_ignored(self):
+        response = api_client(make_donor()).get(self.url, HTTP_X_PROFILE="1")
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(self.client.get(self.url, {"_profile": "1"}).status_code, 200)
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_sampled_view(self):
+        call_command("profile_requests", resolve(self.url).view_name, rate=1, stdout=StringIO())
+
+        response = self.client.get(self.url)
+        self.assertEqual(RequestProfile.objects.get(pk=response["X-Profile-Id"]).trigger, RequestProfile.Trigger.SAMPLED)
+        self.assertNotIn("X-Profile-Id", self.client.get("/api/hadith/"))
+
+        call_command("profile_requests", stop=True, stdout=StringIO())
+        profiling._target_cache[1] = float("-inf")
+        self.assertNotIn("X-Profile-Id", self.client.get(self.url))
+
+
+class RealtimeHubTests(SimpleTestCase):
+    channel = realtime.campaign_channel(1)
+
+    def setUp(self):
+        self.hub = realtime.Hub()
+
+    async def _idle_read(self, **kwargs):
+        await asyncio.Event().wait()
+
+    @override_settings(REDIS_URL="redis://realtime-test")
+    async def test_failed_redis_subscribe_registers_nothing(self):
+        self.hub._pubsub = mock.Mock(
+            subscribe=mock.AsyncMock(side_effect=[ConnectionError("redis down"), None]),
+            get_message=self._idle_read,
+        )
+
+        with self.assertRaises(ConnectionError):
+            await self.hub.subscribe([self.channel])
+        self.assertEqual(dict(self.hub._queues), {})
+
+        # Следующий клиент снова подписывает канал в Redis
+        queue = await self.hub.subscribe([self.channel])
+        self.assertEqual(self.hub._pubsub.subscribe.await_count, 2)
+        self.hub.dispatch(self.channel, b"frame")
+        self.assertEqual(queue.get_nowait(), b"frame")
+        self.hub._reader.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await self.hub._reader
+
+    @override_settings(REDIS_URL="")
+    async def test_stream_delivers_events_and_unsubscribes(self):
+        with mock.patch.object(realtime, "hub", self.hub):
+            events = streams._events([self.channel])
+            self.assertEqual(await anext(events), b"retry: 5000\n\n")
+
+            realtime.publish([(self.channel, "campaign", {"campaign_id": 1, "raised_delta": 5})])
+            self.assertEqual(
+                await asyncio.wait_for(anext(events), timeout=1),
+                b'event: campaign\ndata: {"campaign_id":1,"raised_delta":5}\n\n',
+            )
+
+            await events.aclose()
+        self.assertEqual(dict(self.hub._queues), {})
@@ -4,8 +4,14 @@ from apps.base import views as base_views
 
 
 urlpatterns = [
+    path("home/", base_views.HomeFeedView.as_view()),
+
     path("organizations/", base_views.OrganizationListView.as_view()),
     path("organizations/<int:pk>/", base_views.OrganizationDetailView.as_view()),
+    path(
+        "organizations/<int:org_id>/follow/",
+        base_views.OrganizationFollowView.as_view(),
+    ),
 
     path("categories/", base_views.CategoryListView.as_view()),
 
@@ -17,10 +23,13 @@ urlpatterns = [
     path("donor/bank-details/", base_views.DonorBankDetailsView.as_view()),
     path("donor/recurring/", base_views.RecurringDonationListCreateView.as_view()),
     path("donor/recurring/<int:pk>/", base_views.RecurringDonationUpdateView.as_view()),
+    path("donor/following/", base_views.FollowedOrganizationsView.as_view()),
 
     path("campaigns/create/", base_views.CampaignCreateView.as_view()),
     path("campaigns/my/", base_views.MyCampaignsView.as_view()),
 
+    path("uploads/", base_views.UploadCreateView.as_view()),
+
     path("reports/create/", base_views.ReportCreateView.as_view()),
     path("reports/my/", base_views.MyReportsView.as_view()),
     path("reports/my/<int:pk>/", base_views.MyReportDetailView.as_view()),
@@ -29,13 +38,40 @@ urlpatterns = [
         base_views.OrganizationReportsView.as_view(),
     ),
 
+    path("leaderboard/", base_views.LeaderboardView.as_view()),
+    path(
+        "organizations/<int:org_id>/leaderboard/",
+        base_views.OrganizationLeaderboardView.as_view(),
+    ),
+
     path("stats/donor/", base_views.DonorStatsView.as_view()),
     path("stats/organization/", base_views.OrganizationStatsView.as_view()),
+    path(
+        "stats/organization/export/",
+        base_views.OrganizationDonationExportView.as_view(),
+    ),
+    path(
+        "stats/organization/exports/",
+        base_views.DonationExportListCreateView.as_view(),
+    ),
+    path(
+        "stats/organization/exports/<int:pk>/",
+        base_views.DonationExportDetailView.as_view(),
+    ),
+    path(
+        "stats/organization/exports/<int:pk>/download/",
+        base_views.DonationExportDownloadView.as_view(),
+        name="donation-export-download",
+    ),
 
     path(
         "payments/<int:payment_id>/complete/",
         base_views.PaymentCompleteStubView.as_view(),
     ),
+    path(
+        "payments/webhook/settlements/",
+        base_views.PaymentSettlementWebhookView.as_view(),
+    ),
 
     path("notifications/", base_views.MyNotificationsView.as_view()),
     path(
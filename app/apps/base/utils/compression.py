@@ -0,0 +1,37 @@
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # brotli не обязателен: тогда только gzip
+    brotli = None
+
+_ACCEPT_ENCODING_RE = _lazy_re_compile(r"\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*")
+
+
+def accepted_encodings(header) -> dict:
+    """Accept-Encoding → {кодировка: q}; некорректные части пропускаются."""
+    encodings = {}
+    for part in header.split(","):
+        match = _ACCEPT_ENCODING_RE.fullmatch(part)
+        if not match:
+            continue
+        name, q = match.group(1).lower(), match.group(2)
+        try:
+            encodings[name] = float(q) if q is not None else 1.0
+        except ValueError:
+            continue
+    return encodings
+
+
+def choose_encoding(header):
+    """"br", "gzip" или None — лучшая из поддерживаемых кодировок для Accept-Encoding."""
+    encodings = accepted_encodings(header)
+    wildcard = encodings.get("*", 0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+    best, best_q = None, 0
+    for name in candidates:
+        q = encodings.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
@@ -3,7 +3,11 @@ import logging
 from typing import List, Optional
 
 from django.conf import settings
-from firebase_admin import credentials, messaging, initialize_app, get_app
+
+from apps.base.utils import metrics
+
+# firebase_admin (вместе с google-auth, httplib2, requests) импортируется при
+# первой отправке, а не при старте каждого воркера
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +20,8 @@ def get_fcm_app():
     if _fcm_app is not None:
         return _fcm_app
 
+    from firebase_admin import credentials, get_app, initialize_app
+
     try:
         _fcm_app = get_app()
     except ValueError:
@@ -55,6 +61,22 @@ def send_push_notification(
 ) -> dict:
     """
     Send FCM push notification to multiple device tokens.
+    Success/failure counts are exported as the finic_push_messages metric.
+    """
+    result = _send_multicast(tokens, title, body, data, image_url)
+    metrics.record_push(result)
+    return result
+
+
+def _send_multicast(
+    tokens: List[str],
+    title: str,
+    body: str,
+    data: Optional[dict] = None,
+    image_url: Optional[str] = None,
+) -> dict:
+    """
+    Send FCM push notification to multiple device tokens.
 
     Args:
         tokens: List of FCM device tokens
@@ -74,6 +96,8 @@ def send_push_notification(
     if not tokens:
         return {"success": 0, "failure": 0}
 
+    from firebase_admin import messaging
+
     # Build notification
     notification = messaging.Notification(
         title=title,
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from apps.base.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "HTTP_IDEMPOTENCY_KEY"
+MAX_KEY_LENGTH = 255
+
+_WAIT_INTERVAL = 0.05
+
+
+def _fingerprint(request) -> str:
+    data = request.data
+    if hasattr(data, "dict"):
+        data = data.dict()
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _replay(stored: dict, fingerprint: str, scope: str) -> Response:
+    if stored["fingerprint"] != fingerprint:
+        metrics.increment(f"idempotency.{scope}.mismatch")
+        return Response(
+            {"detail": "Idempotency-Key уже использован с другими параметрами запроса."},
+            status=422,
+        )
+
+    metrics.increment(f"idempotency.{scope}.replay")
+    response = Response(stored["data"], status=stored["status"])
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _wait_for_result(cache_key: str, timeout: int):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(_WAIT_INTERVAL)
+        stored = cache.get(cache_key)
+        if stored is not None:
+            return stored
+    return None
+
+
+def run_idempotent(request, scope: str, handler):
+    """
+    Выполняет handler() не более одного раза на (scope, пользователь, Idempotency-Key).
+
+    - Повтор с тем же ключом отдаёт сохранённый ответ из кэша, не трогая БД.
+    - Параллельные дубликаты сериализуются блокировкой (cache.add — атомарный SET NX
+      в Redis): второй запрос недолго (IDEMPOTENCY_WAIT_TIMEOUT) ждёт результата
+      первого, иначе получает 409. Блокировку снимает только её владелец — по токену.
+    - Ответы 5xx не сохраняются, чтобы клиент мог повторить запрос.
+    Без заголовка запрос обрабатывается как обычно.
+    """
+    key = request.META.get(IDEMPOTENCY_HEADER, "").strip()
+    if not key:
+        return handler()
+
+    if len(key) > MAX_KEY_LENGTH:
+        return Response(
+            {"detail": f"Idempotency-Key не длиннее {MAX_KEY_LENGTH} символов."},
+            status=400,
+        )
+
+    metrics.increment(f"idempotency.{scope}.requests")
+
+    key_hash = hashlib.sha256(key.encode()).hexdigest()
+    cache_key = f"idempotency:{scope}:{request.user.pk}:{key_hash}"
+    lock_key = f"{cache_key}:lock"
+    fingerprint = _fingerprint(request)
+
+    stored = cache.get(cache_key)
+    if stored is not None:
+        return _replay(stored, fingerprint, scope)
+
+    lock_timeout = settings.IDEMPOTENCY_LOCK_TIMEOUT
+    lock_token = uuid.uuid4().hex
+    if not cache.add(lock_key, lock_token, timeout=lock_timeout):
+        metrics.increment(f"idempotency.{scope}.concurrent")
+        # Ожидание занимает воркер, поэтому оно короче блокировки
+        wait = min(settings.IDEMPOTENCY_WAIT_TIMEOUT, lock_timeout)
+        stored = _wait_for_result(cache_key, wait)
+        if stored is not None:
+            return _replay(stored, fingerprint, scope)
+        response = Response(
+            {"detail": "Запрос с этим Idempotency-Key ещё обрабатывается."},
+            status=409,
+        )
+        response["Retry-After"] = "1"
+        return response
+
+    try:
+        # Первый запрос мог завершиться между get и add
+        stored = cache.get(cache_key)
+        if stored is not None:
+            return _replay(stored, fingerprint, scope)
+
+        response = handler()
+        if response.status_code < 500:
+            cache.set(
+                cache_key,
+                {
+                    "status": response.status_code,
+                    "data": response.data,
+                    "fingerprint": fingerprint,
+                },
+                timeout=settings.IDEMPOTENCY_KEY_TTL,
+            )
+        return response
+    finally:
+        # После истечения lock_timeout ключ мог занять другой запрос — его не трогаем
+        cache.delete_if_equal(lock_key, lock_token)
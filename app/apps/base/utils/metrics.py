@@ -0,0 +1,157 @@
+import logging
+import os
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+try:
+    import prometheus_client
+except ImportError:  # prometheus_client не обязателен: тогда метрики Prometheus не собираются
+    prometheus_client = None
+
+_PREFIX = "metrics"
+
+_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+
+class _NullMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def observe(self, value):
+        pass
+
+
+if prometheus_client is not None:
+    # В multiprocess-режиме (PROMETHEUS_MULTIPROC_DIR, см. gunicorn.conf.py)
+    # каждый воркер пишет значения в mmap-файлы, /metrics суммирует их
+    REQUEST_LATENCY = prometheus_client.Histogram(
+        "finic_http_request_duration_seconds",
+        "HTTP request latency",
+        ["method", "view", "status"],
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    )
+    REQUEST_DB_QUERIES = prometheus_client.Histogram(
+        "finic_http_request_db_queries",
+        "Database queries per HTTP request",
+        ["view"],
+        buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+    )
+    THROTTLED = prometheus_client.Counter(
+        "finic_http_throttled",
+        "Requests rejected by throttling (429)",
+        ["view"],
+    )
+    CACHE_REQUESTS = prometheus_client.Counter(
+        "finic_cache_requests",
+        "Cache reads by result",
+        ["result"],
+    )
+    DONATIONS = prometheus_client.Counter(
+        "finic_donations",
+        "Donation lifecycle events",
+        ["event"],
+    )
+    OTP_SENT = prometheus_client.Counter(
+        "finic_otp_sent",
+        "OTP messages by purpose and delivery result",
+        ["purpose", "result"],
+    )
+    PUSH_MESSAGES = prometheus_client.Counter(
+        "finic_push_messages",
+        "FCM push messages by result",
+        ["result"],
+    )
+    EVENTS = prometheus_client.Counter(
+        "finic_events",
+        "Application counters (metrics.increment)",
+        ["name"],
+    )
+else:
+    REQUEST_LATENCY = REQUEST_DB_QUERIES = THROTTLED = CACHE_REQUESTS = _NullMetric()
+    DONATIONS = OTP_SENT = PUSH_MESSAGES = EVENTS = _NullMetric()
+
+
+def _key(name: str) -> str:
+    return f"{_PREFIX}:{name}"
+
+
+def increment(name: str, value: int = 1) -> None:
+    """
+    Увеличивает счётчик в общем кэше (в Redis — общий для всех воркеров)
+    и в Prometheus. Ошибки кэша не должны ронять запрос.
+    """
+    EVENTS.labels(name).inc(value)
+    key = _key(name)
+    try:
+        try:
+            cache.incr(key, value)
+        except ValueError:
+            # Ключа ещё нет: add атомарен, поэтому гонка двух воркеров безопасна
+            cache.add(key, 0, timeout=None)
+            cache.incr(key, value)
+    except Exception:
+        logger.warning("Failed to increment metric %s", name, exc_info=True)
+
+
+def get_counters(*names: str) -> dict:
+    values = cache.get_many([_key(name) for name in names])
+    return {name: values.get(_key(name), 0) for name in names}
+
+
+def observe_request(method, view, status, duration, queries):
+    method = method if method in _METHODS else "other"
+    REQUEST_LATENCY.labels(method, view, str(status)).observe(duration)
+    REQUEST_DB_QUERIES.labels(view).observe(queries)
+    if status == 429:
+        THROTTLED.labels(view).inc()
+
+
+def record_cache(hits, misses):
+    if hits:
+        CACHE_REQUESTS.labels("hit").inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels("miss").inc(misses)
+
+
+def record_donations(event, count=1):
+    """event: created / completed / failed."""
+    if count:
+        DONATIONS.labels(event).inc(count)
+
+
+def record_otp(purpose, sent):
+    OTP_SENT.labels(purpose, "sent" if sent else "failed").inc()
+
+
+def record_push(result: dict):
+    """Результат send_push_notification: {"success": n, "failure": m, ...}."""
+    if result.get("success"):
+        PUSH_MESSAGES.labels("success").inc(result["success"])
+    if result.get("failure"):
+        PUSH_MESSAGES.labels("failure").inc(result["failure"])
+
+
+def enabled() -> bool:
+    return prometheus_client is not None
+
+
+def render():
+    """(тело, Content-Type) для /metrics: сумма по всем воркерам в multiprocess-режиме."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def start_http_server(port):
+    """Отдельный HTTP-сервер метрик для процессов без Django-вьюх (run_tasks)."""
+    prometheus_client.start_http_server(port)
@@ -0,0 +1,8 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+
+def pending_migrations(database=DEFAULT_DB_ALIAS):
+    """Неприменённые миграции (план migrate без выполнения)."""
+    executor = MigrationExecutor(connections[database])
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
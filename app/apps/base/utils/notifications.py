@@ -1,7 +1,6 @@
 from django.conf import settings
 from django.core.mail import send_mail
-
-from apps.base.utils.fcm import send_notification_to_user
+from django.db import transaction
 
 
 def send_notification_email(subject, message, recipient):
@@ -24,6 +23,8 @@ def send_push_notification_to_user(user, title, message, data=None, image_url=No
     """
     Send FCM push notification to user.
     """
+    from apps.base.utils.fcm import send_notification_to_user
+
     return send_notification_to_user(
         user=user,
         title=title,
@@ -49,12 +50,15 @@ def create_and_send_notification(user, title, message, data=None, send_push=True
     """
     from apps.base.models import Notification
 
+    from apps.base.services import realtime
+
     # Create database notification
     notification = Notification.objects.create(
         user=user,
         title=title,
         message=message,
     )
+    transaction.on_commit(lambda: realtime.publish_notifications([notification]))
 
     push_result = None
     if send_push:
@@ -66,3 +70,68 @@ def create_and_send_notification(user, title, message, data=None, send_push=True
         )
 
     return notification, push_result
+
+
+PUSH_TASK_CHUNK_SIZE = 500
+
+
+def send_pushes(messages):
+    """
+    Фоновая задача: отправляет push по списку сообщений
+    [{"user_id", "title", "message", "data"}, ...].
+    Токены всех получателей читаются одним запросом.
+    """
+    from apps.base.models import FCMDeviceToken
+    from apps.base.utils.fcm import send_push_notification
+
+    user_ids = {m["user_id"] for m in messages}
+    tokens_by_user = {}
+    for user_id, token in FCMDeviceToken.objects.filter(
+        user_id__in=user_ids,
+        is_active=True,
+    ).values_list("user_id", "token"):
+        tokens_by_user.setdefault(user_id, []).append(token)
+
+    for m in messages:
+        tokens = tokens_by_user.get(m["user_id"])
+        if tokens:
+            send_push_notification(tokens, m["title"], m["message"], m.get("data"))
+
+
+def bulk_create_notifications(messages, send_push=True):
+    """
+    Создаёт уведомления одним bulk_create и ставит push в очередь пачками.
+
+    messages: list of dicts {"user_id", "title", "message", "data"}.
+    """
+    from apps.base.models import Notification
+    from apps.base.services import realtime
+    from apps.base.services.tasks import enqueue_many
+
+    messages = list(messages)
+    if not messages:
+        return []
+
+    notifications = Notification.objects.bulk_create(
+        [
+            Notification(user_id=m["user_id"], title=m["title"], message=m["message"])
+            for m in messages
+        ],
+        batch_size=1000,
+    )
+    transaction.on_commit(lambda: realtime.publish_notifications(notifications))
+
+    if send_push:
+        push_messages = [
+            {**m, "data": {k: str(v) for k, v in (m.get("data") or {}).items()}}
+            for m in messages
+        ]
+        enqueue_many(
+            "apps.base.utils.notifications.send_pushes",
+            [
+                {"messages": push_messages[i:i + PUSH_TASK_CHUNK_SIZE]}
+                for i in range(0, len(push_messages), PUSH_TASK_CHUNK_SIZE)
+            ],
+        )
+
+    return notifications
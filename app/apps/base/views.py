@@ -7,11 +7,20 @@ from rest_framework.mixins import (
     UpdateModelMixin,
 )
 
+import hmac
+
+from django.conf import settings
+from django.db import transaction
 from django.db.models import Sum, Count
 from django.db.models.functions import TruncMonth
 from django.core.exceptions import ObjectDoesNotExist
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework.parsers import FormParser, MultiPartParser
+from django.utils.cache import patch_vary_headers
+from django.utils import timezone
+from django.utils.http import parse_etags
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.throttling import ScopedRateThrottle
@@ -20,13 +29,28 @@ from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schem
 
 from apps.base import models as base_models
 from apps.base import serializers as base_serializers
-from apps.base.utils.notifications import create_and_send_notification
+from apps.base.mixins import SPARSE_FIELDS_PARAMETERS, ReplicaReadMixin, SparseValuesListMixin
+from apps.base.services import (
+    broadcasts,
+    exports,
+    home,
+    leaderboard,
+    moderation,
+    openapi,
+    payments,
+    uploads,
+)
+from apps.base.services.partitions import add_months
+from apps.base.services.tasks import enqueue
+from apps.base.utils import metrics
+from apps.base.utils.compression import choose_encoding
+from apps.base.utils.idempotency import run_idempotent
 from apps.accounts import models as accounts_models
 from apps.accounts import serializers as accounts_serializers
 from apps.accounts.permissions import IsDonor, IsOrganization
 
 
-class OrganizationListView(ListModelMixin, GenericAPIView):
+class OrganizationListView(ReplicaReadMixin, ListModelMixin, GenericAPIView):
     queryset = accounts_models.Organization.objects.all()
     serializer_class = accounts_serializers.OrganizationSerializer
     permission_classes = [permissions.AllowAny]
@@ -40,7 +64,7 @@ class OrganizationListView(ListModelMixin, GenericAPIView):
         return self.list(request, *args, **kwargs)
 
 
-class CategoryListView(ListModelMixin, GenericAPIView):
+class CategoryListView(ReplicaReadMixin, ListModelMixin, GenericAPIView):
     queryset = base_models.Category.objects.all().order_by("name")
     serializer_class = base_serializers.CategorySerializer
     permission_classes = [permissions.AllowAny]
@@ -111,10 +135,55 @@ class MyReportDetailView(RetrieveModelMixin, GenericAPIView):
         return self.retrieve(request, *args, **kwargs)
 
 
-class DonorStatsView(GenericAPIView):
+STATS_MONTHS_MAX = 120
+
+STATS_MONTHS_PARAMETER = OpenApiParameter(
+    name="months",
+    required=False,
+    type=int,
+    description=(
+        f"За сколько последних месяцев отдать monthly (максимум {STATS_MONTHS_MAX}). "
+        f"Без параметра — за всё время."
+    ),
+)
+
+
+def _stats_since(request):
+    """
+    Начало окна помесячной статистики или None (за всё время). Условие по
+    created_at позволяет PostgreSQL читать только секции этих месяцев.
+    """
+    try:
+        months = int(request.query_params["months"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    months = min(max(months, 1), STATS_MONTHS_MAX)
+
+    month_start = timezone.localtime().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return add_months(month_start, 1 - months)
+
+
+def _monthly_totals(qs, since):
+    if since is not None:
+        qs = qs.filter(created_at__gte=since)
+    return (
+        qs.annotate(month=TruncMonth("created_at"))
+        .values("month")
+        .annotate(total=Sum("amount"))
+        .order_by("month")
+    )
+
+
+class DonorStatsView(ReplicaReadMixin, GenericAPIView):
     permission_classes = [IsDonor]
     serializer_class = base_serializers.DonorStatsSerializer
 
+    @extend_schema(
+        tags=["Donor"],
+        summary="Donor stats",
+        description="Итоги донатов текущего донора и суммы по месяцам.",
+        parameters=[STATS_MONTHS_PARAMETER],
+    )
     def get(self, request, *args, **kwargs):
         qs = base_models.Donation.objects.filter(
             donor=request.user
@@ -126,12 +195,7 @@ class DonorStatsView(GenericAPIView):
 
         total_donations = qs.count()
 
-        monthly = (
-            qs.annotate(month=TruncMonth("created_at"))
-            .values("month")
-            .annotate(total=Sum("amount"))
-            .order_by("month")
-        )
+        monthly = _monthly_totals(qs, _stats_since(request))
 
         return Response({
             "total_amount": total_amount,
@@ -140,10 +204,16 @@ class DonorStatsView(GenericAPIView):
         })
 
 
-class OrganizationStatsView(GenericAPIView):
+class OrganizationStatsView(ReplicaReadMixin, GenericAPIView):
     permission_classes = [IsOrganization]
     serializer_class = base_serializers.OrganizationStatsSerializer
 
+    @extend_schema(
+        tags=["Organization"],
+        summary="Organization stats",
+        description="Итоги донатов организации и суммы по месяцам.",
+        parameters=[STATS_MONTHS_PARAMETER],
+    )
     def get(self, request, *args, **kwargs):
         organization = request.user.organization
 
@@ -160,12 +230,7 @@ class OrganizationStatsView(GenericAPIView):
             organization=organization
         ).count()
 
-        monthly = (
-            donations_qs.annotate(month=TruncMonth("created_at"))
-            .values("month")
-            .annotate(total=Sum("amount"))
-            .order_by("month")
-        )
+        monthly = _monthly_totals(donations_qs, _stats_since(request))
 
         return Response({
             "total_raised": total_raised,
@@ -175,14 +240,150 @@ class OrganizationStatsView(GenericAPIView):
         })
 
 
+class OrganizationDonationExportView(ReplicaReadMixin, GenericAPIView):
+    permission_classes = [IsOrganization]
+    serializer_class = base_serializers.DonationExportFilterSerializer
+
+    @extend_schema(
+        tags=["Organization"],
+        summary="Export donations (CSV stream)",
+        description=(
+            "Потоковая CSV-выгрузка всех донатов текущей организации. "
+            "Строки читаются серверным курсором, память не зависит от объёма. "
+            "Для XLSX и очень больших выгрузок используйте /api/stats/organization/exports/."
+        ),
+        parameters=[
+            OpenApiParameter(name="date_from", required=False, type=str, description="Дата с (YYYY-MM-DD)."),
+            OpenApiParameter(name="date_to", required=False, type=str, description="Дата по (YYYY-MM-DD), включительно."),
+            OpenApiParameter(name="campaign_id", required=False, type=int, description="Фильтр по кампании."),
+            OpenApiParameter(name="status", required=False, type=str, description="Статус доната."),
+        ],
+        responses={(200, "text/csv"): str},
+    )
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        organization = request.user.organization
+        response = StreamingHttpResponse(
+            exports.stream_csv(organization.id, serializer.get_filters()),
+            content_type="text/csv; charset=utf-8",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="donations_{organization.id}.csv"'
+        )
+        return response
+
+
+class DonationExportListCreateView(ListModelMixin, GenericAPIView):
+    permission_classes = [IsOrganization]
+
+    def get_serializer_class(self):
+        if self.request.method == "POST":
+            return base_serializers.DonationExportCreateSerializer
+        return base_serializers.DonationExportSerializer
+
+    def get_queryset(self):
+        return base_models.DonationExport.objects.filter(
+            organization=self.request.user.organization
+        )
+
+    @extend_schema(
+        tags=["Organization"],
+        summary="List donation exports",
+        description="Фоновые выгрузки донатов текущей организации.",
+    )
+    def get(self, request, *args, **kwargs):
+        return self.list(request, *args, **kwargs)
+
+    @extend_schema(
+        tags=["Organization"],
+        summary="Create donation export (background)",
+        description=(
+            "Запускает фоновую выгрузку донатов в CSV или XLSX. "
+            "Статус и ссылку на файл смотрите в /api/stats/organization/exports/{id}/."
+        ),
+        responses={202: base_serializers.DonationExportSerializer},
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        export = base_models.DonationExport.objects.create(
+            organization=request.user.organization,
+            requested_by=request.user,
+            file_format=serializer.validated_data["file_format"],
+            filters=serializer.get_filters(),
+        )
+        enqueue("apps.base.services.exports.build_export", {"export_id": export.id})
+
+        data = base_serializers.DonationExportSerializer(
+            export, context=self.get_serializer_context()
+        ).data
+        return Response(data, status=202)
+
+
+class DonationExportDetailView(RetrieveModelMixin, GenericAPIView):
+    serializer_class = base_serializers.DonationExportSerializer
+    permission_classes = [IsOrganization]
+
+    def get_queryset(self):
+        return base_models.DonationExport.objects.filter(
+            organization=self.request.user.organization
+        )
+
+    @extend_schema(
+        tags=["Organization"],
+        summary="Get donation export",
+        description="Статус фоновой выгрузки и ссылка на файл (когда status=done).",
+    )
+    def get(self, request, *args, **kwargs):
+        return self.retrieve(request, *args, **kwargs)
+
+
+class DonationExportDownloadView(GenericAPIView):
+    permission_classes = [IsOrganization]
+
+    def get_queryset(self):
+        return base_models.DonationExport.objects.filter(
+            organization=self.request.user.organization,
+            status=base_models.DonationExport.Status.DONE,
+        )
+
+    @extend_schema(
+        tags=["Organization"],
+        summary="Download donation export",
+        description=(
+            "Файл готовой выгрузки. Файлы лежат в закрытом хранилище и "
+            "отдаются только организации-владельцу."
+        ),
+        responses={(200, "application/octet-stream"): bytes},
+    )
+    def get(self, request, *args, **kwargs):
+        export = self.get_object()
+        if not export.file:
+            raise Http404
+        return FileResponse(
+            export.file.open("rb"),
+            as_attachment=True,
+            filename=f"donations_{export.organization_id}_{export.id}.{export.file_format}",
+        )
+
+
 class ReportCreateView(CreateModelMixin, GenericAPIView):
     serializer_class = base_serializers.ReportCreateSerializer
     permission_classes = [IsOrganization]
-    parser_classes = [MultiPartParser, FormParser]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def perform_create(self, serializer):
-        serializer.save(
-            organization=self.request.user.organization
+        organization = self.request.user.organization
+        report = serializer.save(organization=organization)
+
+        broadcasts.broadcast_to_followers(
+            organization.id,
+            title="Новый отчёт",
+            message=f"{organization.name}: {report.title}",
+            data={"type": "new_report", "report_id": report.id},
         )
 
     @extend_schema(
@@ -194,7 +395,7 @@ class ReportCreateView(CreateModelMixin, GenericAPIView):
         return self.create(request, *args, **kwargs)
 
 
-class OrganizationReportsView(ListModelMixin, GenericAPIView):
+class OrganizationReportsView(ReplicaReadMixin, ListModelMixin, GenericAPIView):
     serializer_class = base_serializers.ReportSerializer
     permission_classes = []  # публичный доступ
 
@@ -208,7 +409,61 @@ class OrganizationReportsView(ListModelMixin, GenericAPIView):
         return self.list(request, *args, **kwargs)
 
 
-class OrganizationDetailView(RetrieveModelMixin, GenericAPIView):
+class OrganizationFollowView(GenericAPIView):
+    serializer_class = base_serializers.OrganizationFollowStatusSerializer
+    permission_classes = [IsDonor]
+
+    def _response(self, organization_id, following):
+        followers_count = base_models.OrganizationFollower.objects.filter(
+            organization_id=organization_id
+        ).count()
+        return Response({"following": following, "followers_count": followers_count})
+
+    @extend_schema(
+        tags=["Donor"],
+        summary="Follow organization",
+        description="Подписаться на новости организации (новые кампании и отчёты).",
+    )
+    def post(self, request, org_id, *args, **kwargs):
+        organization = get_object_or_404(accounts_models.Organization, id=org_id)
+        base_models.OrganizationFollower.objects.get_or_create(
+            organization=organization,
+            user=request.user,
+        )
+        return self._response(organization.id, True)
+
+    @extend_schema(
+        tags=["Donor"],
+        summary="Unfollow organization",
+        description="Отписаться от новостей организации.",
+    )
+    def delete(self, request, org_id, *args, **kwargs):
+        base_models.OrganizationFollower.objects.filter(
+            organization_id=org_id,
+            user=request.user,
+        ).delete()
+        return self._response(org_id, False)
+
+
+class FollowedOrganizationsView(ListModelMixin, GenericAPIView):
+    serializer_class = accounts_serializers.OrganizationSerializer
+    permission_classes = [IsDonor]
+
+    def get_queryset(self):
+        return accounts_models.Organization.objects.filter(
+            followers__user=self.request.user
+        ).order_by("-followers__created_at")
+
+    @extend_schema(
+        tags=["Donor"],
+        summary="List followed organizations",
+        description="Организации, на которые подписан текущий донор.",
+    )
+    def get(self, request, *args, **kwargs):
+        return self.list(request, *args, **kwargs)
+
+
+class OrganizationDetailView(ReplicaReadMixin, RetrieveModelMixin, GenericAPIView):
     queryset = accounts_models.Organization.objects.all()
     serializer_class = accounts_serializers.OrganizationSerializer
     permission_classes = [permissions.AllowAny]
@@ -222,8 +477,21 @@ class OrganizationDetailView(RetrieveModelMixin, GenericAPIView):
         return self.retrieve(request, *args, **kwargs)
 
 
-class CampaignListView(ListModelMixin, GenericAPIView):
+# ?ordering= списка кампаний; trending идёт по индексу campaign_trending_idx
+CAMPAIGN_ORDERINGS = {
+    "new": ("-created_at",),
+    "trending": ("-trending_score", "-id"),
+}
+
+
+class CampaignListView(ReplicaReadMixin, SparseValuesListMixin, ListModelMixin, GenericAPIView):
+    """
+    Быстрый путь: строки через values() + CampaignValuesSerializer
+    (формат ответа тот же, что у CampaignSerializer), плюс ?fields= / ?omit=.
+    """
+
     serializer_class = base_serializers.CampaignSerializer
+    values_serializer_class = base_serializers.CampaignValuesSerializer
     permission_classes = [permissions.AllowAny]
 
     def get_queryset(self):
@@ -241,7 +509,8 @@ class CampaignListView(ListModelMixin, GenericAPIView):
         if category_slug:
             qs = qs.filter(category__slug=category_slug)
 
-        return qs.order_by("-created_at")
+        ordering = self.request.query_params.get("ordering")
+        return qs.order_by(*CAMPAIGN_ORDERINGS.get(ordering, CAMPAIGN_ORDERINGS["new"]))
 
     @extend_schema(
         tags=["Public"],
@@ -266,6 +535,14 @@ class CampaignListView(ListModelMixin, GenericAPIView):
                 type=str,
                 description="Фильтр по категории (slug).",
             ),
+            OpenApiParameter(
+                name="ordering",
+                required=False,
+                type=str,
+                enum=list(CAMPAIGN_ORDERINGS),
+                description="new — сначала новые (по умолчанию); trending — по числу недавних донатов.",
+            ),
+            *SPARSE_FIELDS_PARAMETERS,
         ],
     )
     def get(self, request, *args, **kwargs):
@@ -291,13 +568,25 @@ class DonationCreateView(CreateModelMixin, GenericAPIView):
             provider="stub",
             status=base_models.Payment.Status.PENDING,
         )
+        metrics.record_donations("created")
 
     @extend_schema(
         tags=["Donor"],
         summary="Create donation",
         description=(
-            "Создать донат (только донор). После создания автоматически создаётся Payment (stub)."
+            "Создать донат (только донор). После создания автоматически создаётся Payment (stub). "
+            "С заголовком Idempotency-Key повторный запрос возвращает исходный ответ "
+            "(с заголовком Idempotent-Replayed: true) и не создаёт дубликат."
         ),
+        parameters=[
+            OpenApiParameter(
+                name="Idempotency-Key",
+                required=False,
+                type=str,
+                location=OpenApiParameter.HEADER,
+                description="Уникальный ключ попытки (например UUID), одинаковый для ретраев.",
+            ),
+        ],
         examples=[
             OpenApiExample(
                 "Request",
@@ -312,7 +601,11 @@ class DonationCreateView(CreateModelMixin, GenericAPIView):
         ],
     )
     def post(self, request, *args, **kwargs):
-        return self.create(request, *args, **kwargs)
+        return run_idempotent(
+            request,
+            scope="donation",
+            handler=lambda: self.create(request, *args, **kwargs),
+        )
 
 
 class PaymentCompleteStubView(GenericAPIView):
@@ -336,7 +629,7 @@ class PaymentCompleteStubView(GenericAPIView):
     )
     def post(self, request, payment_id, *args, **kwargs):
         payment = get_object_or_404(
-            base_models.Payment,
+            base_models.Payment.objects.only("id", "donation_id", "status"),
             id=payment_id,
             donor=request.user,
         )
@@ -345,47 +638,163 @@ class PaymentCompleteStubView(GenericAPIView):
             return Response({
                 "status": "already_completed",
                 "payment_id": payment.id,
-                "donation_id": payment.donation.id,
+                "donation_id": payment.donation_id,
             })
 
-        payment.status = base_models.Payment.Status.COMPLETED
-        payment.save()
+        completed = payments.complete_payments([payment.id], donor_id=request.user.id)
+        if not completed:
+            # Платёж параллельно завершает другой запрос (строка заблокирована) или уже завершил
+            payment.refresh_from_db(fields=["status"])
+            if payment.status != base_models.Payment.Status.COMPLETED:
+                return Response(
+                    {"detail": "Платёж обрабатывается, повторите запрос позже."},
+                    status=409,
+                )
+            return Response({
+                "status": "already_completed",
+                "payment_id": payment.id,
+                "donation_id": payment.donation_id,
+            })
 
-        donation = payment.donation
-        donation.status = base_models.Donation.Status.COMPLETED
-        donation.save()
+        return Response({
+            "status": "ok",
+            "payment_id": payment.id,
+            "donation_id": payment.donation_id,
+        })
 
-        # Send notification to donor with FCM
-        create_and_send_notification(
-            user=request.user,
-            title="Платёж успешно завершён",
-            message=f"Спасибо! Ваш донат на сумму {payment.amount} успешно зачислен.",
-            data={"type": "payment_completed", "payment_id": payment.id},
-        )
 
-        # Send notification to organization with FCM
-        create_and_send_notification(
-            user=donation.organization.user,
-            title="Новый донат",
-            message=f"Поступил донат на сумму {payment.amount}.",
-            data={"type": "new_donation", "donation_id": donation.id, "amount": str(payment.amount)},
-        )
+class PaymentSettlementWebhookView(GenericAPIView):
+    """Пакетное подтверждение платежей от платёжного провайдера"""
+
+    serializer_class = base_serializers.PaymentSettlementBatchSerializer
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    throttle_classes = []
+
+    def _is_authorized(self, request):
+        secret = getattr(settings, "PAYMENT_WEBHOOK_SECRET", "")
+        provided = request.META.get("HTTP_X_WEBHOOK_SECRET", "")
+        return bool(secret) and hmac.compare_digest(provided, secret)
+
+    @extend_schema(
+        tags=["Payments"],
+        summary="Batch payment settlement webhook",
+        description=(
+            "Пакетное завершение платежей (до 10000 за вызов). Требует заголовок X-Webhook-Secret. "
+            "Уже обработанные и заблокированные параллельным запросом платежи пропускаются "
+            "и возвращаются в skipped."
+        ),
+        responses=base_serializers.PaymentSettlementResultSerializer,
+        examples=[
+            OpenApiExample(
+                "Request",
+                value={
+                    "settlements": [
+                        {"payment_id": 10, "status": "completed"},
+                        {"payment_id": 11, "status": "failed"},
+                    ]
+                },
+                request_only=True,
+            ),
+            OpenApiExample(
+                "Response",
+                value={"completed": 1, "failed": 1, "skipped": []},
+                response_only=True,
+            ),
+        ],
+    )
+    def post(self, request, *args, **kwargs):
+        if not self._is_authorized(request):
+            return Response({"detail": "Invalid webhook secret."}, status=403)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = payments.settle_payments(serializer.validated_data["settlements"])
+        return Response(result)
+
+
+class LeaderboardView(ReplicaReadMixin, GenericAPIView):
+    serializer_class = base_serializers.LeaderboardSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def get_organization_id(self):
+        return None
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get("limit", leaderboard.DEFAULT_LIMIT))
+        except (TypeError, ValueError):
+            limit = leaderboard.DEFAULT_LIMIT
+        return min(max(limit, 1), leaderboard.MAX_LIMIT)
+
+    @extend_schema(
+        tags=["Public"],
+        summary="Donors leaderboard",
+        description=(
+            "Топ доноров по очкам влияния. Для авторизованного донора "
+            "дополнительно возвращается его позиция в поле me."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="limit",
+                required=False,
+                type=int,
+                description=f"Размер топа (по умолчанию {leaderboard.DEFAULT_LIMIT}, максимум {leaderboard.MAX_LIMIT}).",
+            ),
+        ],
+    )
+    def get(self, request, *args, **kwargs):
+        organization_id = self.get_organization_id()
+
+        me = None
+        if request.user and request.user.is_authenticated and request.user.role == "donor":
+            me = leaderboard.donor_position(request.user.id, organization_id=organization_id)
 
         return Response({
-            "status": "ok",
-            "payment_id": payment.id,
-            "donation_id": donation.id,
+            "results": leaderboard.top_donors(
+                limit=self.get_limit(),
+                organization_id=organization_id,
+            ),
+            "me": me,
         })
 
 
+class OrganizationLeaderboardView(LeaderboardView):
+    def get_organization_id(self):
+        organization = get_object_or_404(
+            accounts_models.Organization.objects.only("id"),
+            id=self.kwargs.get("org_id"),
+        )
+        return organization.id
+
+    @extend_schema(
+        tags=["Public"],
+        summary="Organization donors leaderboard",
+        description="Топ доноров организации по очкам влияния.",
+        parameters=[
+            OpenApiParameter(
+                name="limit",
+                required=False,
+                type=int,
+                description=f"Размер топа (по умолчанию {leaderboard.DEFAULT_LIMIT}, максимум {leaderboard.MAX_LIMIT}).",
+            ),
+        ],
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
 class MyNotificationsView(ListModelMixin, GenericAPIView):
     serializer_class = base_serializers.NotificationSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
+        # Свежие первыми: при секционировании по created_at страница читается
+        # из последних секций по индексу (user, -created_at)
         return base_models.Notification.objects.filter(
             user=self.request.user
-        )
+        ).order_by("-created_at")
 
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
@@ -426,8 +835,9 @@ class NotificationReadView(GenericAPIView):
         return Response({"status": "ok"})
 
 
-class MyDonationsView(ListModelMixin, GenericAPIView):
+class MyDonationsView(SparseValuesListMixin, ListModelMixin, GenericAPIView):
     serializer_class = base_serializers.DonationSerializer
+    values_serializer_class = base_serializers.DonationValuesSerializer
     permission_classes = [IsDonor]
 
     def get_queryset(self):
@@ -440,20 +850,22 @@ class MyDonationsView(ListModelMixin, GenericAPIView):
         total_amount = queryset.aggregate(total=Sum("amount"))["total"] or 0
         organizations_count = queryset.values("organization_id").distinct().count()
 
-        page = self.paginate_queryset(queryset)
+        # Быстрый путь: values() + DonationValuesSerializer (формат как у DonationSerializer)
+        fields = self.get_sparse_fields()
+        rows = self.values_queryset(queryset, fields)
+
+        page = self.paginate_queryset(rows)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            response = self.get_paginated_response(serializer.data)
+            response = self.get_paginated_response(self.get_values_data(page, fields))
             response.data["total_amount"] = total_amount
             response.data["organizations_count"] = organizations_count
             return response
 
-        serializer = self.get_serializer(queryset, many=True)
         return Response(
             {
                 "total_amount": total_amount,
                 "organizations_count": organizations_count,
-                "results": serializer.data,
+                "results": self.get_values_data(rows, fields),
             }
         )
 
@@ -464,13 +876,14 @@ class MyDonationsView(ListModelMixin, GenericAPIView):
         tags=["Donor"],
         summary="List my donations",
         description="Список донатов текущего донора.",
+        parameters=SPARSE_FIELDS_PARAMETERS,
     )(get)
 
 
 class CampaignCreateView(CreateModelMixin, GenericAPIView):
     serializer_class = base_serializers.CampaignCreateSerializer
     permission_classes = [IsOrganization]
-    parser_classes = [MultiPartParser, FormParser]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def get_organization(self):
         try:
@@ -480,7 +893,14 @@ class CampaignCreateView(CreateModelMixin, GenericAPIView):
 
     def perform_create(self, serializer):
         organization = self.get_organization()
-        serializer.save(organization=organization)
+        campaign = serializer.save(organization=organization)
+
+        broadcasts.broadcast_to_followers(
+            organization.id,
+            title="Новая кампания",
+            message=f"{organization.name}: {campaign.title}",
+            data={"type": "new_campaign", "campaign_id": campaign.id},
+        )
 
     def post(self, request, *args, **kwargs):
         """
@@ -490,8 +910,9 @@ class CampaignCreateView(CreateModelMixin, GenericAPIView):
         return self.create(request, *args, **kwargs)
 
 
-class MyCampaignsView(ListModelMixin, GenericAPIView):
+class MyCampaignsView(SparseValuesListMixin, ListModelMixin, GenericAPIView):
     serializer_class = base_serializers.CampaignSerializer
+    values_serializer_class = base_serializers.CampaignValuesSerializer
     permission_classes = [IsOrganization]
 
     def get_queryset(self):
@@ -507,6 +928,7 @@ class MyCampaignsView(ListModelMixin, GenericAPIView):
             organization=organization
         ).order_by("-created_at")
 
+    @extend_schema(parameters=SPARSE_FIELDS_PARAMETERS)
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
 
@@ -514,7 +936,7 @@ class MyCampaignsView(ListModelMixin, GenericAPIView):
 class CampaignUpdateView(UpdateModelMixin, GenericAPIView):
     serializer_class = base_serializers.CampaignCreateSerializer
     permission_classes = [IsOrganization]
-    parser_classes = [MultiPartParser, FormParser]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def get_queryset(self):
         try:
@@ -588,7 +1010,7 @@ class RecurringDonationUpdateView(UpdateModelMixin, GenericAPIView):
         return self.partial_update(request, *args, **kwargs)
 
 
-class HadithListView(ListModelMixin, GenericAPIView):
+class HadithListView(ReplicaReadMixin, ListModelMixin, GenericAPIView):
     queryset = base_models.Hadith.objects.all().order_by("-created_at")
     serializer_class = base_serializers.HadithSerializer
     permission_classes = [permissions.AllowAny]
@@ -603,7 +1025,7 @@ class HadithListView(ListModelMixin, GenericAPIView):
         return self.list(request, *args, **kwargs)
 
 
-class HadithDetailView(RetrieveModelMixin, GenericAPIView):
+class HadithDetailView(ReplicaReadMixin, RetrieveModelMixin, GenericAPIView):
     queryset = base_models.Hadith.objects.all()
     serializer_class = base_serializers.HadithSerializer
     permission_classes = [permissions.AllowAny]
@@ -617,7 +1039,7 @@ class HadithDetailView(RetrieveModelMixin, GenericAPIView):
         return self.retrieve(request, *args, **kwargs)
 
 
-class HadithRandomView(GenericAPIView):
+class HadithRandomView(ReplicaReadMixin, GenericAPIView):
     serializer_class = base_serializers.HadithSerializer
     permission_classes = [permissions.AllowAny]
 
@@ -637,6 +1059,117 @@ class HadithRandomView(GenericAPIView):
         return Response(serializer.data)
 
 
+class HomeFeedView(GenericAPIView):
+    """
+    Лента главного экрана одним запросом: категории, активные кампании,
+    хадис, а для вошедших — уведомления и статистика донора.
+    """
+
+    serializer_class = base_serializers.HomeFeedSerializer
+    permission_classes = [permissions.AllowAny]
+
+    @extend_schema(
+        tags=["Public"],
+        summary="Home feed",
+        description=(
+            "Все секции главного экрана одним запросом. Публичные секции кэшируются, "
+            "секции собираются параллельно; упавшая секция отдаётся как null и "
+            "перечисляется в errors."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="sections",
+                required=False,
+                type=str,
+                description="Только перечисленные секции через запятую (categories,campaigns,hadith,notifications,stats).",
+            ),
+        ],
+    )
+    def get(self, request, *args, **kwargs):
+        available = home.available_sections(request.user)
+        sections = available
+
+        sections_param = request.query_params.get("sections")
+        if sections_param:
+            requested = [name.strip() for name in sections_param.split(",") if name.strip()]
+            unknown = [name for name in requested if name not in home.SECTIONS]
+            if unknown:
+                raise ValidationError({"sections": f"Неизвестные секции: {', '.join(unknown)}"})
+            sections = [name for name in available if name in requested]
+
+        context = self.get_serializer_context()
+        context["user_id"] = request.user.id
+        return Response(home.build_home(context, sections))
+
+
+class UploadCreateView(GenericAPIView):
+    """
+    Прямая загрузка в S3/MinIO: клиент получает подписанную форму, отправляет
+    файл в хранилище сам, а в API присылает только ключ (image_key,
+    media_keys, avatar_key, logo_key, ...).
+    """
+
+    serializer_class = base_serializers.UploadRequestSerializer
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "uploads"
+
+    @extend_schema(
+        tags=["Uploads"],
+        summary="Presigned upload",
+        description=(
+            "Подписанная форма для загрузки файла прямо в хранилище: POST multipart на url "
+            "с полями fields и файлом в поле file. Затем key передаётся в image_key / "
+            "image_keys (кампании), file_key / media_keys (отчёты), avatar_key, logo_key. "
+            "Цели: campaign_image, report_file, report_image, report_video, avatar, logo."
+        ),
+        responses=base_serializers.UploadTicketSerializer,
+    )
+    def post(self, request, *args, **kwargs):
+        if not uploads.direct_uploads_enabled():
+            raise ValidationError("Прямая загрузка недоступна: отправьте файл в multipart-запросе.")
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ticket = uploads.create_upload(request.user, **serializer.validated_data)
+        return Response(base_serializers.UploadTicketSerializer(ticket).data, status=201)
+
+
+class OpenAPISchemaView(GenericAPIView):
+    """
+    OpenAPI-схема из готового артефакта (services/openapi.py): без разбора
+    view и сериализаторов на каждый запрос, сжатая заранее, с ETag.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    @extend_schema(exclude=True)
+    def get(self, request, *args, **kwargs):
+        artifact = openapi.get_artifact()
+
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding in artifact.encoded:
+            content = artifact.encoded[encoding]
+            # У каждого представления свой ETag: тела отличаются побайтно
+            etag = f'{artifact.etag[:-1]}-{encoding}"'
+        else:
+            encoding, content, etag = None, artifact.content, artifact.etag
+
+        if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, content_type="application/vnd.oai.openapi+json")
+            if encoding:
+                response["Content-Encoding"] = encoding
+
+        response["ETag"] = etag
+        # Схема меняется только с деплоем: клиент всегда сверяет ETag и получает 304
+        response["Cache-Control"] = "public, no-cache"
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
+
+
 class FCMDeviceTokenRegisterView(CreateModelMixin, GenericAPIView):
     serializer_class = base_serializers.FCMDeviceTokenCreateSerializer
     permission_classes = [IsAuthenticated]
@@ -689,36 +1222,11 @@ class ContentReportCreateView(CreateModelMixin, GenericAPIView):
     serializer_class = base_serializers.ContentReportSerializer
     permission_classes = [IsAuthenticated]
 
+    @transaction.atomic
     def perform_create(self, serializer):
         report = serializer.save(user=self.request.user)
-        
-        # Send email notification to admin
-        from django.core.mail import send_mail
-        from django.conf import settings
-        
-        try:
-            content_type_display = report.get_content_type_display()
-            subject = f"Новая жалоба на {content_type_display}"
-            message = f"""
-Получена новая жалоба:
-
-Пользователь: {report.user.email} (ID: {report.user.id})
-Тип контента: {content_type_display}
-ID контента: {report.content_id}
-Причина: {report.reason}
-Дата: {report.created_at.strftime('%Y-%m-%d %H:%M:%S')}
-            """
-            
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=["asanalievurmat10@gmail.com"],
-                fail_silently=True,
-            )
-        except Exception as e:
-            # Log error but don't fail the request
-            print(f"Failed to send email notification: {e}")
+        # Модераторы получают дайджест раз в MODERATION_DIGEST_WINDOW, а не письмо на каждую жалобу
+        moderation.record_report(report)
 
     @extend_schema(
         tags=["Reports"],
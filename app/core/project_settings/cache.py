@@ -0,0 +1,40 @@
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+
+REDIS_URL = os.getenv("REDIS_URL", "").strip()
+
+# Бэкенды из apps.base.cache — стандартные, плюс метрики попаданий в кэш
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "apps.base.cache.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "finic",
+        },
+    }
+else:
+    # Без Redis кэш живёт в памяти процесса (dev / тесты)
+    CACHES = {
+        "default": {
+            "BACKEND": "apps.base.cache.LocMemCache",
+            "LOCATION": "finic",
+        },
+    }
+
+# Idempotency-Key: сколько хранить ответ, сколько держать блокировку на время обработки
+# и сколько (сек.) параллельный дубликат ждёт результата, прежде чем получить 409
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", 60 * 60 * 24))
+IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", 10))
+IDEMPOTENCY_WAIT_TIMEOUT = float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", 1))
+
+# GET /api/home/: TTL публичных секций (сек.), размер пула потоков
+# (0 или 1 — секции по очереди, без потоков) и таймаут секции
+HOME_FEED_CACHE_TTLS = {
+    "categories": int(os.getenv("HOME_FEED_CATEGORIES_TTL", 60 * 10)),
+    "campaigns": int(os.getenv("HOME_FEED_CAMPAIGNS_TTL", 60)),
+    "hadith": int(os.getenv("HOME_FEED_HADITH_TTL", 60 * 60)),
+}
+HOME_FEED_WORKERS = int(os.getenv("HOME_FEED_WORKERS", 4))
+HOME_FEED_SECTION_TIMEOUT = float(os.getenv("HOME_FEED_SECTION_TIMEOUT", 5))
@@ -20,5 +20,38 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
         'HOST': os.getenv('POSTGRES_HOST'),
         'PORT': os.getenv('POSTGRES_PORT', 5432),
+        # Постоянные соединения: без них каждый запрос (и каждый поток ленты /api/home/)
+        # заново подключается к PostgreSQL
+        'CONN_MAX_AGE': int(os.getenv('POSTGRES_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
+
+# Реплики только для чтения: POSTGRES_REPLICA_HOSTS=host[:port],host[:port]
+# (логин и база те же, что у primary). Пусто — всё читается с primary.
+DATABASE_REPLICAS = []
+for index, address in enumerate(filter(None, os.getenv('POSTGRES_REPLICA_HOSTS', '').split(','))):
+    host, _, port = address.strip().partition(':')
+    alias = 'replica' if index == 0 else f'replica_{index + 1}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        # В тестах реплика — та же тестовая база
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ['apps.base.db_router.ReplicaRouter']
+
+# Сколько секунд после записи клиент читает с primary (видит свои изменения)
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 10))
+# Заголовок с IP клиента, который выставляет доверенный прокси (например
+# X-Real-IP -> HTTP_X_REAL_IP). За прокси REMOTE_ADDR — адрес самого прокси,
+# поэтому без заголовка анонимные клиенты за primary не закрепляются.
+REPLICA_PIN_IP_HEADER = os.getenv('REPLICA_PIN_IP_HEADER', '')
+# Реплика с большим отставанием не используется, чтения идут на primary
+REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', 5))
+# Как часто процесс перепроверяет отставание реплики
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('REPLICA_LAG_CHECK_INTERVAL', 5))
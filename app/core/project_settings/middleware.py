@@ -4,7 +4,10 @@ import os
 load_dotenv()
 
 MIDDLEWARE = [
+    'apps.base.middleware.HealthCheckMiddleware',
+    'apps.base.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'apps.base.middleware.CompressedJSONMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -13,4 +16,18 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-]
\ No newline at end of file
+    'apps.base.db_router.ReplicaPinMiddleware',
+    'apps.base.middleware.ProfilingMiddleware',
+]
+# JSON-ответы API меньше этого размера (в байтах) не сжимаются
+JSON_COMPRESSION_MIN_SIZE = int(os.getenv("JSON_COMPRESSION_MIN_SIZE", "1024"))
+
+# Prometheus: путь метрик и необязательный токен (Authorization: Bearer <token>)
+METRICS_PATH = os.getenv("METRICS_PATH", "/metrics")
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Профилирование запросов (ProfilingMiddleware): шаг снятия стеков, предел
+# сохраняемых SQL на профиль и как часто воркер перечитывает цель выборки
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+PROFILING_MAX_QUERIES = int(os.getenv("PROFILING_MAX_QUERIES", "2000"))
+PROFILING_TARGET_REFRESH = float(os.getenv("PROFILING_TARGET_REFRESH", "5"))
@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 
 
@@ -5,7 +6,7 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.accounts.authentication.StatelessJWTAuthentication",
     ),
 
     "DEFAULT_PERMISSION_CLASSES": (
@@ -13,7 +14,7 @@ REST_FRAMEWORK = {
     ),
 
     "DEFAULT_RENDERER_CLASSES": (
-        "rest_framework.renderers.JSONRenderer",
+        "apps.base.renderers.FastJSONRenderer",
     ),
 
     "DEFAULT_THROTTLE_CLASSES": (
@@ -28,6 +29,7 @@ REST_FRAMEWORK = {
         "otp_send": "5/10min",
         "otp_verify": "5/10min",
         "donation": "20/hour",
+        "uploads": "200/hour",
     },
 
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
@@ -39,10 +41,22 @@ SPECTACULAR_SETTINGS = {
     "TITLE": "Finic API",
     "DESCRIPTION": "Finic backend API",
     "VERSION": "1.0.0",
+    # Схема аутентификации для OpenAPI (см. apps/accounts/schema.py)
+    "PREPROCESSING_HOOKS": ["apps.accounts.schema.register_extensions"],
 }
 
+# Готовая схема для /api/schema/ (manage.py build_openapi_schema, в образе —
+# при сборке). Пусто или файл устарел — схема строится один раз на процесс
+OPENAPI_SCHEMA_PATH = os.getenv("OPENAPI_SCHEMA_PATH", "")
+
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
+    # access-токен получает свежие claims role/org_id/is_active из БД
+    "TOKEN_REFRESH_SERIALIZER": "apps.accounts.serializers.ClaimsTokenRefreshSerializer",
 }
+
+# Проверка токенов по claims без запроса в БД. Включается только при общем
+# кэше Redis (REDIS_URL) — иначе пользователь читается из БД на каждый запрос
+JWT_STATELESS = os.getenv("JWT_STATELESS", "1") == "1"
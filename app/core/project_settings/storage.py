@@ -0,0 +1,89 @@
+from dotenv import load_dotenv
+from pathlib import Path
+import os
+
+load_dotenv()
+
+# S3-совместимое хранилище медиа (AWS S3, MinIO). Без S3_BUCKET файлы
+# остаются в MEDIA_ROOT на диске, а прямая загрузка (/api/uploads/) выключена
+S3_BUCKET = os.getenv("S3_BUCKET", "").strip()
+# Адрес, по которому к хранилищу ходит Django (для MinIO в compose — http://minio:9000)
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL", "").strip() or None
+# Адрес для клиентов: им подписываются ссылки на загрузку (пусто — как S3_ENDPOINT_URL)
+S3_PUBLIC_ENDPOINT_URL = os.getenv("S3_PUBLIC_ENDPOINT_URL", "").strip() or S3_ENDPOINT_URL
+S3_ACCESS_KEY = os.getenv("S3_ACCESS_KEY", "")
+S3_SECRET_KEY = os.getenv("S3_SECRET_KEY", "")
+S3_REGION = os.getenv("S3_REGION", "us-east-1")
+# MinIO без wildcard-DNS понимает только path-style адреса
+S3_ADDRESSING_STYLE = os.getenv("S3_ADDRESSING_STYLE", "path")
+
+# Имена медиа содержат хеш содержимого (apps/base/storage.py) — кэш «навсегда»
+MEDIA_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Старые файлы без хеша в имени
+MEDIA_CACHE_CONTROL = "public, max-age=86400"
+
+# Кто отдаёт /media/ при хранении на диске:
+#   ""         — фронт-прокси сам (Django не регистрирует маршрут)
+#   "accel"    — Django проверяет путь и отдаёт X-Accel-Redirect (nginx)
+#   "sendfile" — то же через X-Sendfile (Apache mod_xsendfile, Caddy)
+#   "django"   — сам Django, с поддержкой Range (dev, без прокси)
+MEDIA_SERVE_MODE = os.getenv("MEDIA_SERVE_MODE", "").strip().lower()
+# internal location в nginx, который смотрит на MEDIA_ROOT
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media/")
+
+if S3_BUCKET:
+    DEFAULT_STORAGE = {
+        "BACKEND": "apps.base.storage_s3.HashedS3Storage",
+        "OPTIONS": {
+            "bucket_name": S3_BUCKET,
+            "endpoint_url": S3_ENDPOINT_URL,
+            "access_key": S3_ACCESS_KEY,
+            "secret_key": S3_SECRET_KEY,
+            "region_name": S3_REGION,
+            "addressing_style": S3_ADDRESSING_STYLE,
+            "signature_version": "s3v4",
+            # Медиа публичные (картинки кампаний, логотипы): ссылки без подписи
+            "querystring_auth": os.getenv("S3_QUERYSTRING_AUTH", "false").lower() == "true",
+            "custom_domain": os.getenv("S3_CUSTOM_DOMAIN", "").strip() or None,
+            "file_overwrite": False,
+            "object_parameters": {"CacheControl": MEDIA_IMMUTABLE_CACHE_CONTROL},
+        },
+    }
+else:
+    DEFAULT_STORAGE = {
+        "BACKEND": "apps.base.storage.HashedFileSystemStorage",
+    }
+
+# Закрытые файлы (выгрузки донатов): не раздаются по /media/,
+# отдаются только через проверяющие доступ views. В S3 — отдельный бакет без
+# анонимного доступа, на диске — каталог вне MEDIA_ROOT
+PRIVATE_MEDIA_ROOT = Path(os.getenv("PRIVATE_MEDIA_ROOT", "/app/private_media"))
+S3_PRIVATE_BUCKET = os.getenv("S3_PRIVATE_BUCKET", "").strip() or f"{S3_BUCKET}-private"
+
+if S3_BUCKET:
+    PRIVATE_STORAGE = {
+        "BACKEND": "storages.backends.s3.S3Storage",
+        "OPTIONS": {
+            "bucket_name": S3_PRIVATE_BUCKET,
+            "endpoint_url": S3_ENDPOINT_URL,
+            "access_key": S3_ACCESS_KEY,
+            "secret_key": S3_SECRET_KEY,
+            "region_name": S3_REGION,
+            "addressing_style": S3_ADDRESSING_STYLE,
+            "signature_version": "s3v4",
+            "default_acl": "private",
+            "querystring_auth": True,
+            "file_overwrite": False,
+        },
+    }
+else:
+    PRIVATE_STORAGE = {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": PRIVATE_MEDIA_ROOT},
+    }
+
+# Прямая загрузка: сколько живёт подписанная форма и лимиты размера (байт)
+UPLOAD_URL_TTL = int(os.getenv("UPLOAD_URL_TTL", 60 * 15))
+UPLOAD_MAX_IMAGE_SIZE = int(os.getenv("UPLOAD_MAX_IMAGE_SIZE", 10 * 1024 * 1024))
+UPLOAD_MAX_VIDEO_SIZE = int(os.getenv("UPLOAD_MAX_VIDEO_SIZE", 200 * 1024 * 1024))
+UPLOAD_MAX_DOCUMENT_SIZE = int(os.getenv("UPLOAD_MAX_DOCUMENT_SIZE", 20 * 1024 * 1024))
@@ -49,6 +49,8 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 from core.project_settings.database import *
 
+from core.project_settings.cache import *
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -84,18 +86,62 @@ WHATSAPP_PROVIDER = os.getenv("WHATSAPP_PROVIDER", "green_api")
 OTP_MESSAGE_TEMPLATE = os.getenv(
     "OTP_MESSAGE_TEMPLATE", "Ваш код подтверждения Finic: {code}"
 )
+ORG_CREDENTIALS_MESSAGE_TEMPLATE = os.getenv(
+    "ORG_CREDENTIALS_MESSAGE_TEMPLATE",
+    "Заявка «{org_name}» одобрена. Вход в Finic: телефон {phone}, пароль {password}",
+)
+
+# Кэш статуса заявки организации по телефону (сек.)
+ORG_REQUEST_STATUS_TTL = int(os.getenv("ORG_REQUEST_STATUS_TTL", "300"))
+
+# Общий секрет для вебхука пакетного подтверждения платежей (пусто = вебхук выключен)
+PAYMENT_WEBHOOK_SECRET = os.getenv("PAYMENT_WEBHOOK_SECRET", "")
+
+# Дайджест жалоб на контент: получатели (через запятую, пусто = дайджест
+# не отправляется) и окно группировки (сек.)
+MODERATION_EMAILS = [
+    email.strip()
+    for email in os.getenv("MODERATION_EMAILS", "").split(",")
+    if email.strip()
+]
+MODERATION_DIGEST_WINDOW = int(os.getenv("MODERATION_DIGEST_WINDOW", 60 * 15))
+
+# Трендовые кампании: за сколько часов вклад доната в trending_score падает вдвое
+# (после изменения — manage.py rebuild_trending)
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", 12))
+
+# SSE (/api/stream/): пинг простаивающего соединения, максимальная длительность
+# соединения, сколько кампаний в одном потоке и очередь событий на клиента
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", 15))
+SSE_MAX_SECONDS = float(os.getenv("SSE_MAX_SECONDS", 600))
+SSE_MAX_CAMPAIGNS = int(os.getenv("SSE_MAX_CAMPAIGNS", 50))
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", 100))
+
+# Хранение данных (manage.py apply_retention): сколько дней держать строки
+RETENTION_NOTIFICATION_DAYS = int(os.getenv("RETENTION_NOTIFICATION_DAYS", 90))
+RETENTION_OTP_DAYS = int(os.getenv("RETENTION_OTP_DAYS", 1))
+RETENTION_FCM_TOKEN_DAYS = int(os.getenv("RETENTION_FCM_TOKEN_DAYS", 60))
+RETENTION_PROFILE_DAYS = int(os.getenv("RETENTION_PROFILE_DAYS", 14))
+# Строк за транзакцию и пауза между пачками (сек.), чтобы не нагружать БД
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", 2000))
+RETENTION_BATCH_PAUSE = float(os.getenv("RETENTION_BATCH_PAUSE", 0.5))
+# Каталог архивов (gzip JSONL) в закрытом хранилище (STORAGES["private"])
+RETENTION_ARCHIVE_PREFIX = os.getenv("RETENTION_ARCHIVE_PREFIX", "archive/")
 
 STATIC_URL = '/static/'
 
 _static_dir = BASE_DIR / 'static'
 STATICFILES_DIRS = [_static_dir] if _static_dir.exists() else []
 
-STATIC_ROOT = BASE_DIR / 'staticfiles'
+# В образе статика собирается при сборке в /srv/staticfiles (см. docker/Dockerfile),
+# вне /app — чтобы её не перекрывал volume с кодом
+STATIC_ROOT = Path(os.getenv('STATIC_ROOT', BASE_DIR / 'staticfiles'))
+
+from core.project_settings.storage import *
 
 STORAGES = {
-    "default": {
-        "BACKEND": "django.core.files.storage.FileSystemStorage",
-    },
+    "default": DEFAULT_STORAGE,
+    "private": PRIVATE_STORAGE,
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     },
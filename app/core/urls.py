@@ -1,11 +1,30 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.conf import settings
+from django.urls import path, include, re_path
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt
 
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-    SpectacularRedocView,
-)
+from apps.base.media import serve_media
+from apps.base.streams import event_stream
+from apps.base.views import OpenAPISchemaView
+
+
+def lazy_view(dotted_path, **initkwargs):
+    """
+    View импортируется при первом запросе. drf_spectacular.views тянет
+    рендереры и шаблоны Swagger/Redoc — воркерам, которые не отдают
+    документацию, это не нужно.
+    """
+    view = None
+
+    @csrf_exempt
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(dotted_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return wrapper
 
 
 urlpatterns = [
@@ -13,18 +32,35 @@ urlpatterns = [
 
     path("api/", include("apps.accounts.urls")),
     path("api/", include("apps.base.urls")),
+    # SSE под ASGI (сервис stream_finic), см. apps/base/streams.py
+    path("api/stream/", event_stream, name="event-stream"),
 ]
 
 urlpatterns += [
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path(
+        "api/schema/",
+        OpenAPISchemaView.as_view(),
+        name="schema",
+    ),
     path(
         "api/docs/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
+        lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema"),
         name="swagger-ui",
     ),
     path(
         "api/redoc/",
-        SpectacularRedocView.as_view(url_name="schema"),
+        lazy_view("drf_spectacular.views.SpectacularRedocView", url_name="schema"),
         name="redoc",
     ),
 ]
+
+# Медиа с диска через Django (X-Accel-Redirect / X-Sendfile / Range), см. MEDIA_SERVE_MODE.
+# С S3 ссылки на медиа ведут прямо в хранилище
+if settings.MEDIA_SERVE_MODE and not settings.S3_BUCKET:
+    urlpatterns += [
+        re_path(
+            r"^%s(?P<path>.+)$" % settings.MEDIA_URL.lstrip("/"),
+            serve_media,
+            name="media",
+        ),
+    ]
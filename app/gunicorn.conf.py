@@ -0,0 +1,22 @@
+# Настройки gunicorn (docker/Dockerfile: --config gunicorn.conf.py)
+import os
+import shutil
+
+# Метрики Prometheus из всех воркеров: каждый процесс пишет значения в файлы
+# этой директории, /metrics суммирует их (apps/base/utils/metrics.py)
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+
+
+def on_starting(server):
+    # Файлы прошлого запуска дали бы двойной счёт
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,29 +1,21 @@
 #!/bin/sh
 set -e
 
-echo "Начало инициализации базы данных..."
-
-# Подождем некоторое время, чтобы убедиться, что сеть и база данных готовы
-echo "Подождем 10 секунд, чтобы убедиться, что сеть и база данных готовы..."
-sleep 10
-
-# Ожидание доступности базы данных
-echo "Ожидание доступности базы данных..."
-until nc -z -v -w30 $POSTGRES_HOST $POSTGRES_PORT
-do
-  echo "Waiting for PostgreSQL database connection..."
-  sleep 1
-done
-
-echo "База данных доступна. Создаём миграции..."
-python manage.py makemigrations --noinput
-
-echo "Применяем миграции..."
-python manage.py migrate --noinput
-
-echo "Собираем статические файлы..."
-python manage.py collectstatic --noinput
-
+# Статика собрана при сборке образа, миграции применяет отдельный сервис
+# (manage.py migrate_locked). Здесь только ждём, пока PostgreSQL примет соединение.
+if [ -n "$POSTGRES_HOST" ]; then
+  echo "Ожидание доступности базы данных..."
+  until nc -z "$POSTGRES_HOST" "${POSTGRES_PORT:-5432}"
+  do
+    sleep 0.5
+  done
+fi
+
+# Для сервисов, которым нужна актуальная схема до старта (воркеры):
+# WAIT_FOR_MIGRATIONS=60 — ждать до 60 секунд, пока миграции будут применены
+if [ -n "$WAIT_FOR_MIGRATIONS" ]; then
+  python manage.py migrate_locked --check --timeout "$WAIT_FOR_MIGRATIONS"
+fi
 
 # Запускаем переданную команду
-exec "$@"
\ No newline at end of file
+exec "$@"